@@ -0,0 +1,185 @@
+import json
+import os
+
+import numpy as np
+
+from mcpnews.retrieval import normalize_rows, save_array, top_k
+
+# Inverted-file (IVF) approximate nearest-neighbour index for cosine similarity,
+# in pure NumPy. Vectors are clustered around n_lists spherical k-means
+# centroids; a query scores only the vectors of its nprobe closest lists, so
+# nprobe trades recall for latency. Vectors live in segments: the one loaded
+# from disk is memory-mapped and stored list-contiguous, later add() calls
+# append in-memory segments, and delete() only flips an alive flag until the
+# next save() compacts everything back into one segment.
+
+NPROBE = 8
+TRAIN_ITERATIONS = 10
+TRAIN_SAMPLE = 50000
+ASSIGN_CHUNK = 65536
+
+def default_n_lists(n):
+    return max(1, min(4096, int(4 * np.sqrt(max(n, 1)))))
+
+class IVFIndex:
+    def __init__(self, centroids, nprobe=NPROBE):
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.nprobe = nprobe
+        self._segments = []
+        self._where = {}        # id -> (segment, row) of live vectors
+        self._members = None    # per segment: (order, offsets) or None when list-contiguous
+        self._next_id = 0
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    @property
+    def dim(self):
+        return self.centroids.shape[1]
+
+    def __len__(self):
+        return len(self._where)
+
+    @classmethod
+    def train(cls, vectors, n_lists=None, iterations=TRAIN_ITERATIONS, sample_size=TRAIN_SAMPLE,
+              nprobe=NPROBE, seed=0):
+        rng = np.random.default_rng(seed)
+        n = len(vectors)
+        n_lists = min(n_lists or default_n_lists(n), n)
+        rows = np.sort(rng.choice(n, size=min(n, sample_size), replace=False))
+        sample = normalize_rows(np.asarray(vectors[rows], dtype=np.float32))
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=n_lists)
+            # Lists that lost all their points are reseeded on random sample points
+            empty = counts == 0
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            centroids = normalize_rows(sums)
+        return cls(centroids, nprobe)
+
+    @classmethod
+    def build(cls, vectors, ids=None, **train_kwargs):
+        index = cls.train(vectors, **train_kwargs)
+        index.add(vectors, ids)
+        return index
+
+    def assign(self, vectors):
+        lists = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), ASSIGN_CHUNK):
+            chunk = np.asarray(vectors[start:start + ASSIGN_CHUNK], dtype=np.float32)
+            lists[start:start + len(chunk)] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return lists
+
+    def add(self, vectors, ids=None):
+        # Adding an id that is already present replaces its vector
+        vectors = normalize_rows(np.asarray(vectors, dtype=np.float32))
+        if ids is None:
+            ids = np.arange(self._next_id, self._next_id + len(vectors), dtype=np.int64)
+        ids = np.asarray(ids, dtype=np.int64)
+        self.delete(ids)
+        self._append_segment(vectors, ids, self.assign(vectors), contiguous=False)
+        return ids
+
+    def _append_segment(self, vectors, ids, lists, contiguous):
+        segment = len(self._segments)
+        self._segments.append({
+            "vectors": vectors,
+            "ids": ids,
+            "lists": lists,
+            "alive": np.ones(len(ids), dtype=bool),
+            "contiguous": contiguous,
+        })
+        self._where.update((int(i), (segment, row)) for row, i in enumerate(ids))
+        if len(ids):
+            self._next_id = max(self._next_id, int(ids.max()) + 1)
+        self._members = None
+
+    def delete(self, ids):
+        removed = 0
+        for i in np.atleast_1d(ids):
+            location = self._where.pop(int(i), None)
+            if location is not None:
+                segment, row = location
+                self._segments[segment]["alive"][row] = False
+                removed += 1
+        return removed
+
+    def _list_members(self):
+        if self._members is None:
+            self._members = []
+            for segment in self._segments:
+                lists = segment["lists"]
+                order = None if segment["contiguous"] else np.argsort(lists, kind="stable")
+                sorted_lists = lists if order is None else lists[order]
+                offsets = np.searchsorted(sorted_lists, np.arange(self.n_lists + 1))
+                self._members.append((order, offsets))
+        return self._members
+
+    def search(self, queries, k=10, nprobe=None):
+        # (q, dim) queries -> (ids, scores), each (q, k), best first; -1 pads missing hits
+        queries = normalize_rows(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        nprobe = min(nprobe or self.nprobe, self.n_lists)
+        probes = top_k(queries @ self.centroids.T, nprobe)
+        members = self._list_members()
+        result_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        result_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        for qi, query in enumerate(queries):
+            candidate_vectors = []
+            candidate_ids = []
+            for segment, (order, offsets) in zip(self._segments, members):
+                for list_id in probes[qi]:
+                    start, end = offsets[list_id], offsets[list_id + 1]
+                    if start == end:
+                        continue
+                    # List-contiguous segments are sliced, which keeps memory-mapped reads sequential
+                    rows = slice(start, end) if order is None else order[start:end]
+                    alive = segment["alive"][rows]
+                    vectors = segment["vectors"][rows]
+                    ids = segment["ids"][rows]
+                    if not alive.all():
+                        vectors, ids = vectors[alive], ids[alive]
+                    candidate_vectors.append(vectors)
+                    candidate_ids.append(ids)
+            if not candidate_vectors:
+                continue
+            scores = np.concatenate(candidate_vectors) @ query
+            ids = np.concatenate(candidate_ids)
+            best = top_k(scores, k)[0]
+            result_ids[qi, :len(best)] = ids[best]
+            result_scores[qi, :len(best)] = scores[best]
+        return result_ids, result_scores
+
+    def save(self, directory):
+        # Compacts live vectors of all segments into one list-contiguous segment
+        os.makedirs(directory, exist_ok=True)
+        vectors, ids, lists = [], [], []
+        for segment in self._segments:
+            alive = segment["alive"]
+            vectors.append(np.asarray(segment["vectors"][alive]))
+            ids.append(segment["ids"][alive])
+            lists.append(segment["lists"][alive])
+        vectors = np.concatenate(vectors) if vectors else np.zeros((0, self.dim), dtype=np.float32)
+        ids = np.concatenate(ids) if ids else np.zeros(0, dtype=np.int64)
+        lists = np.concatenate(lists) if lists else np.zeros(0, dtype=np.int32)
+        order = np.argsort(lists, kind="stable")
+        save_array(os.path.join(directory, "centroids.npy"), self.centroids)
+        save_array(os.path.join(directory, "vectors.npy"), vectors[order])
+        save_array(os.path.join(directory, "ids.npy"), ids[order])
+        save_array(os.path.join(directory, "lists.npy"), lists[order])
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"nprobe": self.nprobe, "next_id": self._next_id}, f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(np.load(os.path.join(directory, "centroids.npy")), nprobe=meta["nprobe"])
+        vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r" if mmap else None)
+        index._append_segment(vectors, np.load(os.path.join(directory, "ids.npy")),
+                              np.load(os.path.join(directory, "lists.npy")), contiguous=True)
+        index._next_id = max(index._next_id, meta["next_id"])
+        return index
@@ -0,0 +1,262 @@
+import argparse
+import json
+import queue
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from mcpnews.mapreduce import run_mapreduce, MAP_CONCURRENCY
+from mcpnews.mcpnews import (
+    RSS_FEEDS, refresh_feeds, find_articles, prepare_prompt, prompt_stats, call_ollama_phi,
+    match_articles, analysis_store, feed_poller, indexed_sources
+)
+from mcpnews.history import parse_duration
+from mcpnews.ollamaclient import OLLAMA_CONCURRENCY
+from mcpnews.outletparser import parse_analysis
+from mcpnews.telemetry import tracer, serve_metrics, maybe_profiled, PROFILE_ENV
+
+# Batch mode: sweep the feeds once, then fan many topics out over the shared
+# entries and write one JSON line per topic as each analysis completes.
+# Run from the parent directory: python -m mcpnews.batch topics.txt -o results.jsonl
+
+LLM_WORKERS = 4
+# Seconds without new entries before a watch pass starts, so one poll round is analysed together
+WATCH_SETTLE = 5.0
+# Seconds watch waits for the poller's first successful round; outlets it has not polled are swept
+WATCH_WARM_TIMEOUT = 30.0
+STAGES = ("fetch", "match", "prompt", "llm")
+
+def read_topics(lines):
+    topics = []
+    seen = set()
+    for line in lines:
+        topic = line.strip()
+        if not topic or topic.startswith("#") or topic.lower() in seen:
+            continue
+        seen.add(topic.lower())
+        topics.append(topic)
+    return topics
+
+def analyze_one(topic, sources, feeds, model, mode="single", profile=None, map_concurrency=MAP_CONCURRENCY):
+    # Each topic is its own "analysis" trace; profile as in get_mcp_analysis
+    with maybe_profiled("batch", profile), tracer.span("analysis", mode=mode):
+        return run_one(topic, sources, feeds, model, mode, map_concurrency)
+
+def run_one(topic, sources, feeds, model, mode, map_concurrency=MAP_CONCURRENCY):
+    timings = {}
+    start = time.perf_counter()
+    articles = find_articles(topic, sources, feeds=feeds, verbose=False)
+    timings["match"] = time.perf_counter() - start
+    if not articles:
+        return {"topic": topic, "error": f"No articles found for topic: {topic}", "timings": timings}
+
+    if mode == "mapreduce":
+        start = time.perf_counter()
+        try:
+            result = run_mapreduce(topic, articles, model=model, concurrency=map_concurrency)
+        except requests.RequestException as e:
+            return {"topic": topic, "error": f"Error communicating with Ollama: {e}", "timings": timings}
+        timings["llm"] = time.perf_counter() - start
+        timings["outlets"] = result["timings"]["outlets"]
+        # Failed records are not ingested into the history store
+        error = None if result["outlet_analysis"] else "Error communicating with Ollama: every outlet failed"
+        return dict(result, topic=topic, error=error, timings=timings)
+
+    start = time.perf_counter()
+    context, prompt = prepare_prompt(topic, articles)
+    timings["prompt"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    error = None
+    try:
+        response = call_ollama_phi(prompt, model=model)
+    except requests.RequestException as e:
+        response, error = "", f"Error communicating with Ollama: {e}"
+    timings["llm"] = time.perf_counter() - start
+    parsed = parse_analysis(response)
+    return {
+        "topic": topic,
+        "error": error,
+        "prompt": prompt,
+        "response": response,
+        "articles": articles,
+        "summary": parsed["summary"],
+        "outlet_analysis": parsed["articles"],
+        "prompt_stats": prompt_stats(context, prompt),
+        "timings": timings,
+    }
+
+def analyze_topics(topics, out, model="gemma3:latest", feeds=RSS_FEEDS, llm_workers=LLM_WORKERS, mode="single",
+                   history=analysis_store, max_age=None, sources=None, profile=None,
+                   map_concurrency=MAP_CONCURRENCY):
+    # Writes one JSON object per topic to `out` in completion order and returns
+    # the total seconds spent per stage (LLM time is summed across workers).
+    # Completed analyses are ingested into `history` in one transaction at the
+    # end; with max_age, topics analysed that recently are served from it and
+    # the feeds are only swept if some topic is left. Passing the already indexed
+    # `sources` (e.g. from a warm poller) skips the sweep.
+    totals = defaultdict(float)
+    start = time.perf_counter()
+    if history and max_age is not None:
+        pending = []
+        for topic in topics:
+            stored = history.latest(topic, max_age=max_age, model=model)
+            if stored is None:
+                pending.append(topic)
+                continue
+            out.write(json.dumps(dict(stored, topic=topic, error=None, reused=True, timings={})) + "\n")
+            totals["reused"] += 1
+        out.flush()
+        topics = pending
+        if not topics:
+            totals["wall"] = time.perf_counter() - start
+            return dict(totals)
+
+    start_fetch = time.perf_counter()
+    if sources is None:
+        sources = refresh_feeds(feeds, verbose=False)
+    totals["fetch"] = time.perf_counter() - start_fetch
+    skipped = [source for source in feeds if source not in sources]
+    if skipped:
+        print(f"Skipping {len(skipped)} feeds: {', '.join(skipped)}", file=sys.stderr)
+
+    completed = []
+    with ThreadPoolExecutor(max_workers=max(1, llm_workers)) as executor:
+        futures = [executor.submit(analyze_one, topic, sources, feeds, model, mode, profile, map_concurrency)
+                   for topic in topics]
+        for future in as_completed(futures):
+            record = future.result()
+            record["timings"]["fetch"] = totals["fetch"]
+            for stage in STAGES[1:]:
+                totals[stage] += record["timings"].get(stage, 0.0)
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            completed.append(record)
+    if history:
+        start_store = time.perf_counter()
+        history.record_many(completed, model=model, mode=mode)
+        totals["store"] = time.perf_counter() - start_store
+    totals["wall"] = time.perf_counter() - start
+    return dict(totals)
+
+def watch_topics(topics, out, poller=feed_poller, settle=WATCH_SETTLE, model="gemma3:latest", feeds=RSS_FEEDS,
+                 llm_workers=LLM_WORKERS, mode="single", history=analysis_store, stop=None,
+                 map_concurrency=MAP_CONCURRENCY):
+    # Analyzes every topic once the poller is warm, then keeps running: entries the
+    # poller publishes are matched against the topics and only topics with new
+    # matches are re-analysed, against the warm index. Runs until `stop` is set.
+    updates, unsubscribe = poller.subscribe_queue()
+    poller.start()
+    try:
+        poller.wait_warm(WATCH_WARM_TIMEOUT)
+        # The first poll round is covered by the initial pass
+        while not updates.empty():
+            updates.get_nowait()
+        analyze_topics(topics, out, model=model, feeds=feeds, llm_workers=llm_workers, mode=mode,
+                       history=history, sources=indexed_sources(feeds, poller=poller, verbose=False),
+                       map_concurrency=map_concurrency)
+        while stop is None or not stop.is_set():
+            try:
+                pending = [updates.get(timeout=1.0)]
+            except queue.Empty:
+                continue
+            while True:
+                try:
+                    pending.append(updates.get(timeout=settle))
+                except queue.Empty:
+                    break
+            new_entries = [entry for _, entries, _ in pending for entry in entries]
+            if not new_entries:
+                # Only entries dropped out of a feed; the index is already up to date
+                continue
+            changed = [topic for topic in topics if match_articles(new_entries, topic, max_articles=1)]
+            print(f"{len(new_entries)} new entries, re-analysing {len(changed)} topics", file=sys.stderr)
+            if changed:
+                analyze_topics(changed, out, model=model, feeds=feeds, llm_workers=llm_workers, mode=mode,
+                               history=history, sources=indexed_sources(feeds, poller=poller, verbose=False),
+                               map_concurrency=map_concurrency)
+    finally:
+        unsubscribe()
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze many topics with a single feed sweep")
+    parser.add_argument("topics", nargs="?", default="-", help="file with one topic per line, '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file, '-' for stdout")
+    parser.add_argument("--model", default="gemma3:latest")
+    parser.add_argument("--llm-workers", type=int, default=LLM_WORKERS)
+    parser.add_argument("--mode", choices=["single", "mapreduce"], default="single",
+                        help="one prompt for all outlets, or one parallel prompt per outlet")
+    parser.add_argument("--map-concurrency", type=int, default=MAP_CONCURRENCY,
+                        help="outlet calls in flight per topic with --mode mapreduce, capped at the "
+                             f"{OLLAMA_CONCURRENCY} Ollama calls all workers share")
+    parser.add_argument("--max-age", type=parse_duration,
+                        help="reuse stored analyses newer than this, e.g. 6h, instead of re-running them")
+    parser.add_argument("--no-history", action="store_true", help="do not record analyses in the history store")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and re-analyse topics as the background poller finds new entries")
+    parser.add_argument("--trace-log", help="append every finished stage span to this JSON-lines file")
+    parser.add_argument("--metrics-port", type=int,
+                        help="serve Prometheus metrics on this port (/metrics, /spans) while running")
+    parser.add_argument("--profile", choices=["cpu", "memory", "cpu,memory"],
+                        help=f"profile each topic's analysis (default: ${PROFILE_ENV})")
+    args = parser.parse_args()
+
+    if args.topics == "-":
+        topics = read_topics(sys.stdin)
+    else:
+        with open(args.topics, encoding="utf-8") as f:
+            topics = read_topics(f)
+    if not topics:
+        print("No topics given. Exiting.", file=sys.stderr)
+        return
+
+    history = None if args.no_history else analysis_store
+    if args.trace_log:
+        tracer.log_path = args.trace_log
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+    if args.watch:
+        out = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+        try:
+            watch_topics(topics, out, model=args.model, llm_workers=args.llm_workers, mode=args.mode,
+                         history=history, map_concurrency=args.map_concurrency)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            feed_poller.stop()
+            if out is not sys.stdout:
+                out.close()
+            tracer.close()
+        return
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        totals = analyze_topics(topics, out, model=args.model, llm_workers=args.llm_workers, mode=args.mode,
+                                history=history, max_age=args.max_age, profile=args.profile,
+                                map_concurrency=args.map_concurrency)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        tracer.close()
+    print(f"{len(topics)} topics in {totals['wall']:.2f}s", file=sys.stderr)
+    for stage in STAGES + ("store",):
+        print(f"  {stage:<7} {totals.get(stage, 0.0):8.3f}s", file=sys.stderr)
+    if totals.get("reused"):
+        print(f"  {int(totals['reused'])} topics served from history", file=sys.stderr)
+    print_stage_summary(tracer.summary())
+
+def print_stage_summary(summary, file=sys.stderr):
+    # One line per traced stage: spans, total and mean seconds, errors and counters
+    if not summary:
+        return
+    print(f"  {'span':<15} {'count':>6} {'total':>9} {'mean':>9} {'errors':>6}", file=file)
+    for name, stage in sorted(summary.items(), key=lambda item: -item[1]["seconds"]):
+        counters = ", ".join(f"{key}={amount:g}" for key, amount in sorted(stage["counters"].items()))
+        print(f"  {name:<15} {stage['count']:>6} {stage['seconds']:>8.3f}s {stage['mean']:>8.4f}s "
+              f"{stage['errors']:>6}  {counters}", file=file)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from mcpnews.annindex import IVFIndex
+from mcpnews.retrieval import normalize_rows, top_k
+
+# recall@k and queries per second of the IVF index against exact brute-force
+# cosine search, on synthetic clustered vectors. The index is saved and
+# reloaded memory-mapped before searching, as it would be in production.
+# Run from the parent directory: python -m mcpnews.bench_ann
+
+def clustered_vectors(n, dim, clusters, rng, spread=1.0):
+    centers = normalize_rows(rng.standard_normal((clusters, dim)).astype(np.float32))
+    labels = rng.integers(0, clusters, size=n)
+    noise = rng.standard_normal((n, dim)).astype(np.float32) * spread / np.sqrt(dim)
+    return normalize_rows(centers[labels] + noise)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark IVF approximate search against exact search")
+    parser.add_argument("-n", type=int, default=200000)
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--nprobe", default="1,4,8,16,32")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = clustered_vectors(args.n, args.dim, args.clusters, rng)
+    queries = normalize_rows(vectors[rng.integers(0, args.n, size=args.queries)]
+                             + rng.standard_normal((args.queries, args.dim)).astype(np.float32) * 0.02)
+
+    start = time.perf_counter()
+    exact = [top_k(q @ vectors.T, args.k)[0] for q in queries]
+    exact_qps = args.queries / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    index = IVFIndex.build(vectors)
+    build_time = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as directory:
+        index.save(directory)
+        index = IVFIndex.load(directory, mmap=True)
+
+        print(f"{args.n} vectors x {args.dim}, {index.n_lists} lists, built in {build_time:.2f}s")
+        print(f"exact:       recall@{args.k} 1.000  {exact_qps:9.0f} QPS")
+        for nprobe in (int(p) for p in args.nprobe.split(",")):
+            start = time.perf_counter()
+            found, _ = index.search(queries, args.k, nprobe=nprobe)
+            qps = args.queries / (time.perf_counter() - start)
+            recall = np.mean([len(set(f) & set(e)) / args.k for f, e in zip(found, exact)])
+            print(f"nprobe {nprobe:>3}:  recall@{args.k} {recall:.3f}  {qps:9.0f} QPS")
+
+        start = time.perf_counter()
+        added = index.add(clustered_vectors(1000, args.dim, args.clusters, rng))
+        index.delete(added[:500])
+        print(f"add 1000 + delete 500: {(time.perf_counter() - start) * 1000:.1f} ms, {len(index)} live vectors")
+
+if __name__ == "__main__":
+    main()
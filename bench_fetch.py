@@ -0,0 +1,66 @@
+import argparse
+import random
+import tempfile
+import time
+
+from mcpnews.feedcache import FeedCache
+from mcpnews.mcpnews import RSS_FEEDS, fetch_articles, fetch_all_articles
+from mcpnews.standins import start_feed_standin
+
+# Compares the old one-feed-at-a-time sweep with the concurrent fetch engine
+# against a local stand-in for the 16 RSS_FEEDS with injected per-feed delays,
+# then repeats the concurrent sweep through a FeedCache (warm hits and 304s).
+# Run from the parent directory: python -m mcpnews.bench_fetch
+
+def serial_sweep(topic, feeds, timeout):
+    all_articles = []
+    for source, info in feeds.items():
+        all_articles.extend(fetch_articles(info['url'], topic, timeout=timeout, cache=None))
+    return all_articles
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serial vs concurrent RSS fetching")
+    parser.add_argument("--topic", default="election")
+    parser.add_argument("--min-delay", type=float, default=0.05)
+    parser.add_argument("--max-delay", type=float, default=0.6)
+    parser.add_argument("--dead-feed", default="Reuters", help="feed that never answers in time")
+    parser.add_argument("--timeout", type=float, default=1.5)
+    parser.add_argument("--deadline", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    delays = {source: rng.uniform(args.min_delay, args.max_delay) for source in RSS_FEEDS}
+    if args.dead_feed in delays:
+        delays[args.dead_feed] = args.timeout * 10
+    server, feeds = start_feed_standin(RSS_FEEDS, delays)
+    try:
+        print(f"Injected delays: sum={sum(min(d, args.timeout) for d in delays.values()):.2f}s "
+              f"slowest live={max(d for s, d in delays.items() if s != args.dead_feed):.2f}s")
+
+        start = time.perf_counter()
+        serial = serial_sweep(args.topic, feeds, args.timeout)
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        concurrent = fetch_all_articles(args.topic, feeds=feeds, timeout=args.timeout,
+                                        deadline=args.deadline, cache=None)
+        concurrent_time = time.perf_counter() - start
+
+        print(f"serial:     {serial_time:6.2f}s  {len(serial)} articles")
+        print(f"concurrent: {concurrent_time:6.2f}s  {len(concurrent)} articles")
+        print(f"speedup:    {serial_time / concurrent_time:6.1f}x")
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for label, ttl in (("cache cold", 300), ("cache warm", 300), ("cache 304", 0)):
+                cache = FeedCache(ttl=ttl, cache_dir=cache_dir)
+                start = time.perf_counter()
+                cached = fetch_all_articles(args.topic, feeds=feeds, timeout=args.timeout,
+                                            deadline=args.deadline, cache=cache)
+                elapsed = time.perf_counter() - start
+                print(f"{label + ':':<11} {elapsed:6.2f}s  {len(cached)} articles  {cache.stats}")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from mcpnews.history import AnalysisStore
+from mcpnews.mcpnews import RSS_FEEDS
+from mcpnews.outletparser import BIAS_LEVELS
+from mcpnews.standins import STANDIN_TOPICS
+
+# Ingest throughput of the history store (one commit per analysis against one
+# bulk transaction) and latency of the aggregate queries on a synthetic year
+# of analyses.
+# Run from the parent directory: python -m mcpnews.bench_history
+
+def synthetic_results(count, rng, now):
+    for i in range(count):
+        outlets = [{"newsoutlet": source, "newsanalysis": f"{source} analysis {i}",
+                    "country_of_origin": info["country"], "bias_level": rng.choice(BIAS_LEVELS + ["None"])}
+                   for source, info in RSS_FEEDS.items()]
+        yield {
+            "topic": rng.choice(STANDIN_TOPICS),
+            "prompt": "prompt " * 200,
+            "response": "response " * 100,
+            "articles": [{"source": o["newsoutlet"], "country": o["country_of_origin"], "title": "t",
+                          "summary": "s", "link": "l"} for o in outlets],
+            "summary": "summary",
+            "outlet_analysis": outlets,
+            "created_at": now - rng.random() * 365 * 86400,
+        }
+
+def timed(label, func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    print(f"  {label:<38} {(time.perf_counter() - start) / repeat * 1000:9.2f} ms")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis history store")
+    parser.add_argument("--analyses", type=int, default=20000)
+    parser.add_argument("--single", type=int, default=500, help="analyses recorded one commit at a time")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    now = time.time()
+    with tempfile.TemporaryDirectory() as directory:
+        store = AnalysisStore(os.path.join(directory, "history.sqlite3"))
+        print(f"ingest ({len(RSS_FEEDS)} outlets per analysis)")
+        start = time.perf_counter()
+        for result in synthetic_results(args.single, rng, now):
+            store.record(result["topic"], result, created_at=result["created_at"])
+        single = time.perf_counter() - start
+        print(f"  record()       {args.single / single:9.0f} analyses/s")
+        results = list(synthetic_results(args.analyses, rng, now))
+        start = time.perf_counter()
+        store.record_many(results)
+        bulk = time.perf_counter() - start
+        print(f"  record_many()  {args.analyses / bulk:9.0f} analyses/s")
+
+        print("queries")
+        month = now - 30 * 86400
+        timed("counts by outlet, all time", lambda: store.bias_counts(by="outlet"), 5)
+        timed("counts by country, last 30 days", lambda: store.bias_counts(by="country", since=month), 5)
+        timed("counts by topic for one outlet", lambda: store.bias_counts(by="topic", outlet="CNN"), 5)
+        timed("weekly trend for one country", lambda: store.bias_trend(bucket=7 * 86400, country="India"), 5)
+        timed("latest analysis of a topic", lambda: store.latest(STANDIN_TOPICS[0]), 20)
+        store.close()
+
+if __name__ == "__main__":
+    main()
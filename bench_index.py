@@ -0,0 +1,76 @@
+import argparse
+import random
+import time
+
+import feedparser
+
+from mcpnews.mcpnews import RSS_FEEDS, match_articles
+from mcpnews.standins import STANDIN_TOPICS
+from mcpnews.topicindex import TopicIndex
+
+# Compares per-topic regex scans over every entry with posting-list lookups in
+# TopicIndex, on synthetic entries for the 16 RSS_FEEDS.
+# Run from the parent directory: python -m mcpnews.bench_index
+
+def vocabulary(size):
+    return STANDIN_TOPICS + [f"term{i}x" for i in range(size)]
+
+def synthetic_entries(source, num_entries, vocab, weights, rng):
+    entries = []
+    for i in range(num_entries):
+        words = rng.choices(vocab, weights=weights, k=12)
+        entries.append(feedparser.FeedParserDict(
+            id=f"{source}-{i}",
+            title=" ".join(words[:3]).capitalize(),
+            summary=f"<p>{source}: " + " ".join(words) + ".</p>",
+            link=f"http://standin.local/{i}",
+        ))
+    return entries
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark regex scans vs the inverted topic index")
+    parser.add_argument("--entries", type=int, default=500, help="entries per feed")
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--vocab", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocab = vocabulary(args.vocab)
+    # Zipf-like: a few words are common, most are rare, as in real headlines
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    feeds = {source: synthetic_entries(source, args.entries, vocab, weights, rng) for source in RSS_FEEDS}
+    topics = [rng.choice(vocab[:500]) for _ in range(args.topics)]
+
+    start = time.perf_counter()
+    scanned = [{source: match_articles(entries, topic) for source, entries in feeds.items()}
+               for topic in topics]
+    scan_time = time.perf_counter() - start
+
+    index = TopicIndex()
+    start = time.perf_counter()
+    for source, entries in feeds.items():
+        index.update_feed(source, entries)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for source, entries in feeds.items():
+        index.update_feed(source, entries)
+    refresh_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [index.search(topic) for topic in topics]
+    search_time = time.perf_counter() - start
+
+    agree = sum(
+        {s: a for s, a in scan.items() if a} == found for scan, found in zip(scanned, indexed)
+    )
+    print(f"{len(feeds)} feeds x {args.entries} entries, {args.topics} topics")
+    print(f"regex scan:     {scan_time * 1000:8.1f} ms")
+    print(f"index build:    {build_time * 1000:8.1f} ms  ({len(index)} docs)")
+    print(f"index refresh:  {refresh_time * 1000:8.1f} ms  (unchanged feeds)")
+    print(f"index search:   {search_time * 1000:8.1f} ms")
+    print(f"identical results for {agree}/{len(topics)} topics")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import time
+
+import requests
+
+from mcpnews.ollamaclient import OllamaClient
+from mcpnews.standins import start_ollama_standin, server_url
+
+# Compares the original one-connection-per-call, non-streaming request with the
+# pooled OllamaClient (parallel generations and streaming time-to-first-token)
+# against a local fake Ollama.
+# Run from the parent directory: python -m mcpnews.bench_ollama
+
+def legacy_call(base_url, prompt, model):
+    response = requests.post(f"{base_url}/api/generate", json={"model": model, "prompt": prompt, "stream": False})
+    return response.json().get("response", "")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pooled, streaming Ollama client")
+    parser.add_argument("--calls", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--prefill", type=float, default=0.2, help="seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    args = parser.parse_args()
+
+    server = start_ollama_standin(prefill_delay=args.prefill, token_delay=args.token_delay)
+    base_url = server_url(server)
+    model = "gemma3:latest"
+    prompts = [f"Here is a news article about 'topic {i}':\n\nSource: Outlet {i} (USA)\n" for i in range(args.calls)]
+    try:
+        start = time.perf_counter()
+        for prompt in prompts:
+            legacy_call(base_url, prompt, model)
+        legacy_time = time.perf_counter() - start
+
+        client = OllamaClient(base_url, max_concurrency=args.concurrency)
+        start = time.perf_counter()
+        client.generate_many(prompts, model)
+        pooled_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        first_token = None
+        for fragment in client.stream(prompts[0], model):
+            if first_token is None:
+                first_token = time.perf_counter() - start
+        stream_time = time.perf_counter() - start
+        client.close()
+
+        print(f"{args.calls} calls, prefill {args.prefill}s, {args.token_delay}s/token")
+        print(f"legacy serial:       {legacy_time:6.2f}s")
+        print(f"pooled x{args.concurrency}:           {pooled_time:6.2f}s")
+        print(f"stream first token:  {first_token:6.2f}s  (full response {stream_time:.2f}s)")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
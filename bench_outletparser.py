@@ -0,0 +1,66 @@
+import argparse
+import json
+import re
+import time
+
+from mcpnews.outletparser import OutletStream
+from mcpnews.standins import canned_analysis, split_tokens
+
+# Time to each outlet while a response streams: the incremental OutletStream
+# against re-running the old whole-response regex + json.loads extraction on
+# every token (the only way to get outlets early with it), plus how each copes
+# with a response truncated mid-array.
+# Run from the parent directory: python -m mcpnews.bench_outletparser
+
+def legacy_extract(text):
+    code_block = re.search(r"```json(.*?)```", text, re.DOTALL)
+    if code_block:
+        json_str = code_block.group(1).strip()
+    else:
+        json_str = text[text.find('{'):text.rfind('}') + 1]
+    try:
+        return json.loads(json_str).get("articles", [])
+    except ValueError:
+        return []
+
+def synthetic_response(outlets):
+    prompt = "Respond in JSON\n" + "".join(f"Source: Outlet {i} (Country {i % 9})\n" for i in range(outlets))
+    return canned_analysis(prompt)
+
+def run_stream(tokens):
+    stream = OutletStream()
+    first = None
+    start = time.perf_counter()
+    for position, token in enumerate(tokens):
+        if stream.feed(token) and first is None:
+            first = position
+    return first, time.perf_counter() - start, len(stream.close()["articles"])
+
+def run_legacy(tokens):
+    text = ""
+    first = None
+    found = 0
+    start = time.perf_counter()
+    for position, token in enumerate(tokens):
+        text += token
+        found = len(legacy_extract(text))
+        if found and first is None:
+            first = position
+    return first, time.perf_counter() - start, found
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming outlet extraction")
+    parser.add_argument("--outlets", type=int, default=50)
+    args = parser.parse_args()
+
+    tokens = split_tokens(synthetic_response(args.outlets))
+    truncated = tokens[:int(len(tokens) * 0.7)]
+    print(f"{len(tokens)} tokens, {args.outlets} outlets")
+    print(f"{'parser':<10} {'input':<10} {'first outlet at token':>22} {'total ms':>9} {'outlets':>8}")
+    for label, run in (("stream", run_stream), ("legacy", run_legacy)):
+        for name, sequence in (("full", tokens), ("truncated", truncated)):
+            first, seconds, found = run(sequence)
+            print(f"{label:<10} {name:<10} {str(first):>22} {seconds * 1000:>9.1f} {found:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from mcpnews.feedcache import FeedCache
+from mcpnews.llmcache import ResponseCache
+from mcpnews.mapreduce import run_mapreduce
+from mcpnews.mcpnews import RSS_FEEDS, iter_mcp_analysis, refresh_feeds, find_articles
+from mcpnews.ollamaclient import OllamaClient
+from mcpnews.standins import start_feed_standin, start_ollama_standin, server_url, STANDIN_TOPICS
+from mcpnews.telemetry import tracer
+from mcpnews.topicindex import TopicIndex
+
+# End-to-end latency of one analysis request broken down by traced stage, on
+# stand-in feeds and a stand-in Ollama with fixed per-feed delays, so a change
+# to any stage shows up as a shift in its row. Scenarios run in order and
+# share state the way consecutive requests would: cold caches, warm feed
+# cache, LLM cache hit, a run of further topics and the map-reduce mode.
+# Run from the parent directory: python -m mcpnews.bench_pipeline
+
+def run_streaming(topic, feeds, cache, index, client, llm_cache):
+    # (seconds to the first outlet, seconds to done, outlets)
+    start = time.perf_counter()
+    first_outlet = None
+    outlets = 0
+    for kind, payload in iter_mcp_analysis(topic, feeds=feeds, cache=cache, index=index, client=client,
+                                           llm_cache=llm_cache, history=None, poller=None):
+        if kind == "outlet":
+            outlets += 1
+            if first_outlet is None:
+                first_outlet = time.perf_counter() - start
+        elif kind == "error":
+            raise RuntimeError(payload)
+    return first_outlet, time.perf_counter() - start, outlets
+
+def scenario(name, run):
+    tracer.reset()
+    start = time.perf_counter()
+    first_outlet, outlets = run()
+    return {"scenario": name, "wall": time.perf_counter() - start, "first_outlet": first_outlet,
+            "outlets": outlets, "stages": tracer.summary()}
+
+def print_scenario(result):
+    first = "-" if result["first_outlet"] is None else f"{result['first_outlet'] * 1000:.1f} ms"
+    print(f"{result['scenario']}: {result['wall'] * 1000:.1f} ms, first outlet {first}, {result['outlets']} outlets")
+    for name, stage in sorted(result["stages"].items(), key=lambda item: -item[1]["seconds"]):
+        print(f"  {name:<15} {stage['count']:>5}x {stage['seconds'] * 1000:>9.1f} ms "
+              f"{stage['mean'] * 1000:>8.2f} ms/span")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline stage by stage")
+    parser.add_argument("--topics", type=int, default=4, help="further topics in the 'topics' scenario")
+    parser.add_argument("--min-delay", type=float, default=0.02)
+    parser.add_argument("--max-delay", type=float, default=0.2)
+    parser.add_argument("--prefill", type=float, default=0.1, help="LLM seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.001)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--prometheus", action="store_true", help="also print the last scenario's metrics")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    delays = {source: rng.uniform(args.min_delay, args.max_delay) for source in RSS_FEEDS}
+    feed_server, feeds = start_feed_standin(RSS_FEEDS, delays)
+    ollama_server = start_ollama_standin(prefill_delay=args.prefill, token_delay=args.token_delay)
+    client = OllamaClient(server_url(ollama_server))
+    topics = [STANDIN_TOPICS[i % len(STANDIN_TOPICS)] for i in range(args.topics + 2)]
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            cache = FeedCache(cache_dir=os.path.join(directory, "feeds"))
+            index = TopicIndex()
+            llm_cache = ResponseCache(os.path.join(directory, "responses.sqlite3"))
+
+            def streaming(*topics):
+                def run():
+                    first_outlets, outlets = [], 0
+                    for topic in topics:
+                        first, _, found = run_streaming(topic, feeds, cache, index, client, llm_cache)
+                        first_outlets.append(first)
+                        outlets += found
+                    return first_outlets[0], outlets
+                return run
+
+            def mapreduce():
+                sources = refresh_feeds(feeds, cache=cache, index=index, verbose=False)
+                articles = find_articles(topics[0], sources, feeds=feeds, index=index, verbose=False)
+                result = run_mapreduce(topics[0], articles, client=client, cache=None)
+                return None, len(result["articles"])
+
+            results.append(scenario("cold", streaming(topics[0])))
+            results.append(scenario("warm feeds", streaming(topics[1])))
+            results.append(scenario("llm cache hit", streaming(topics[1])))
+            results.append(scenario(f"{args.topics} topics", streaming(*topics[2:])))
+            results.append(scenario("mapreduce", mapreduce))
+            llm_cache.close()
+    finally:
+        client.close()
+        feed_server.shutdown()
+        ollama_server.shutdown()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print_scenario(result)
+    if args.prometheus:
+        print(tracer.prometheus_text(), end="")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import random
+import tempfile
+import time
+
+from mcpnews.feedcache import FeedCache
+from mcpnews.feedpoller import FeedPoller
+from mcpnews.mcpnews import RSS_FEEDS, fetch_all_articles
+from mcpnews.standins import start_feed_standin, STANDIN_TOPICS
+from mcpnews.topicindex import TopicIndex
+
+# Per-topic article lookup latency when every query sweeps the feeds (through
+# a FeedCache, revalidating each time) against queries served from the index a
+# warm background FeedPoller keeps up to date, on stand-in feeds with
+# injected per-feed delays.
+# Run from the parent directory: python -m mcpnews.bench_poller
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark on-demand sweeps vs a warm feed poller")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--min-delay", type=float, default=0.05)
+    parser.add_argument("--max-delay", type=float, default=0.4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    delays = {source: rng.uniform(args.min_delay, args.max_delay) for source in RSS_FEEDS}
+    server, feeds = start_feed_standin(RSS_FEEDS, delays)
+    topics = [STANDIN_TOPICS[i % len(STANDIN_TOPICS)] for i in range(args.queries)]
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            # ttl=0: an on-demand sweep always asks the outlets, as a fresh query would after the ttl
+            cache = FeedCache(ttl=0, cache_dir=directory)
+            index = TopicIndex()
+            start = time.perf_counter()
+            for topic in topics:
+                fetch_all_articles(topic, feeds=feeds, cache=cache, index=index, poller=None)
+            sweep = (time.perf_counter() - start) / len(topics)
+
+            poller_index = TopicIndex()
+            poller = FeedPoller({source: info['url'] for source, info in feeds.items()}, cache=cache)
+            poller.subscribe(lambda source, new_entries, entries: poller_index.update_feed(source, entries))
+            start = time.perf_counter()
+            poller.start()
+            poller.wait_warm()
+            warmup = time.perf_counter() - start
+            start = time.perf_counter()
+            for topic in topics:
+                fetch_all_articles(topic, feeds=feeds, index=poller_index, poller=poller)
+            warm = (time.perf_counter() - start) / len(topics)
+            poller.stop()
+    finally:
+        server.shutdown()
+
+    print(f"{len(topics)} queries over {len(feeds)} feeds")
+    print(f"  sweep per query      {sweep * 1000:8.1f} ms")
+    print(f"  poller warm-up       {warmup * 1000:8.1f} ms (once, in the background)")
+    print(f"  warm query           {warm * 1000:8.1f} ms")
+    print(f"  poller stats         {poller.stats}")
+
+if __name__ == "__main__":
+    main()
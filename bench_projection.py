@@ -0,0 +1,62 @@
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.decomposition import PCA
+
+from mcpnews.projection import project_rope_embeddings, project_subsample
+from mcpnews.rope import stacked_rope_embeddings
+
+# Peak memory and time of in-RAM PCA on the full RoPE stack (what
+# plot_embeddings used to do) against the streaming projections, as the
+# number of simulated positions grows.
+# Run from the parent directory: python -m mcpnews.bench_projection
+
+def measure(func, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+def full_pca(embeddings, positions):
+    return PCA(n_components=3).fit_transform(stacked_rope_embeddings(embeddings, positions))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming PCA over RoPE embeddings")
+    parser.add_argument("--vocab", type=int, default=8192)
+    parser.add_argument("--hidden", type=int, default=1024)
+    parser.add_argument("--positions", default="5,10,20")
+    parser.add_argument("--full-max-positions", type=int, default=10, help="skip in-RAM PCA above this")
+    parser.add_argument("--tsne", action="store_true", help="also time t-SNE on a 2000-row subsample")
+    args = parser.parse_args()
+
+    # Low-rank signal plus noise: isotropic noise alone has no well-defined principal axes
+    rng = np.random.default_rng(0)
+    signal = (rng.standard_normal((args.vocab, 8)) * np.geomspace(8, 1, 8)) @ rng.standard_normal((8, args.hidden))
+    embeddings = (signal + 0.1 * rng.standard_normal((args.vocab, args.hidden))).astype(np.float32)
+    print(f"{'positions':>9} {'method':<12} {'time s':>7} {'peak MB':>8}")
+    for count in (int(p) for p in args.positions.split(",")):
+        positions = list(range(count))
+        runs = [("covariance", lambda: project_rope_embeddings(embeddings, positions)[0]),
+                ("incremental", lambda: project_rope_embeddings(embeddings, positions, method="incremental")[0])]
+        if count <= args.full_max_positions:
+            runs.insert(0, ("in-RAM PCA", lambda: full_pca(embeddings, positions)))
+        if args.tsne:
+            runs.append(("t-SNE 2k", lambda: project_subsample(embeddings, positions, size=2000)[1]))
+        reference = None
+        for label, run in runs:
+            coords, elapsed, peak = measure(run)
+            note = ""
+            if label in ("in-RAM PCA", "covariance"):
+                if reference is None:
+                    reference = coords
+                else:
+                    note = f"  max |diff| vs in-RAM {np.abs(coords - reference).max():.1e}"
+            print(f"{count:>9} {label:<12} {elapsed:>7.2f} {peak:>8.0f}{note}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import random
+import time
+
+from mcpnews.mcpnews import RSS_FEEDS, build_prompt, prompt_stats, call_ollama_phi
+from mcpnews.ollamaclient import OllamaClient
+from mcpnews.promptbudget import budget_articles, estimate_tokens
+from mcpnews.standins import start_ollama_standin, server_url
+
+# Compares the unbudgeted prompt (raw HTML summaries, wire copies repeated per
+# outlet) with the budgeted one, by size and by fake-Ollama latency with a
+# prefill cost proportional to prompt length.
+# Run from the parent directory: python -m mcpnews.bench_prompt
+
+WIRE_STORY = ("Officials met on Tuesday to discuss the ceasefire proposal, according to people familiar "
+              "with the talks, who said negotiators were working through a draft text that would see a "
+              "phased withdrawal and the exchange of prisoners over several weeks. ")
+
+def synthetic_articles(rng, per_source=3, summary_words=250):
+    articles = []
+    for source, info in RSS_FEEDS.items():
+        for i in range(per_source):
+            if rng.random() < 0.4:
+                body = WIRE_STORY * 3
+            else:
+                body = " ".join(rng.choice(["talks", "ceasefire", "minister", "said", "border", "aid",
+                                            "report", "officials", "week", "vote"]) for _ in range(summary_words))
+            articles.append({
+                "source": source,
+                "country": info["country"],
+                "title": f"{source}: ceasefire talks update {i}",
+                "summary": f'<div class="story"><p>{body}</p><img src="http://img.local/{i}.jpg"/></div>',
+                "link": f"http://standin.local/{source.replace(' ', '-')}/{i}",
+            })
+    return articles
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prompt size and latency with token budgets")
+    parser.add_argument("--prefill-per-kchar", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    articles = synthetic_articles(random.Random(args.seed))
+    raw_prompt = build_prompt({"topic": "ceasefire", "articles": articles})
+    start = time.perf_counter()
+    budgeted, stats = budget_articles(articles)
+    budget_time = time.perf_counter() - start
+    context = {"topic": "ceasefire", "articles": budgeted, "prompt_stats": stats}
+    prompt = build_prompt(context)
+
+    server = start_ollama_standin(prefill_per_kchar=args.prefill_per_kchar)
+    client = OllamaClient(server_url(server))
+    try:
+        timings = {}
+        for label, text in (("raw", raw_prompt), ("budgeted", prompt)):
+            start = time.perf_counter()
+            call_ollama_phi(text, client=client, cache=None)
+            timings[label] = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    print(f"raw:      {len(raw_prompt):7d} chars  ~{estimate_tokens(raw_prompt):6d} tokens  llm {timings['raw']:.2f}s")
+    print(f"budgeted: {len(prompt):7d} chars  ~{estimate_tokens(prompt):6d} tokens  llm {timings['budgeted']:.2f}s")
+    print(f"budgeting took {budget_time * 1000:.1f} ms: {prompt_stats(context, prompt)}")
+
+if __name__ == "__main__":
+    main()
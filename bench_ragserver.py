@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import random
+import time
+
+from mcpnews.bench_retrieval import synthetic_issue, reword
+from mcpnews.ragserver import MicroBatchServer
+from mcpnews.retrieval import IssueStore, hash_embed
+
+# Serves a stream of concurrent queries (Poisson arrivals) through
+# MicroBatchServer, once with batching disabled and once with micro-batching,
+# and reports throughput, p50/p99 latency and batch sizes.
+# Run from the parent directory: python -m mcpnews.bench_ragserver
+
+async def run(store, queries, rate, seed, **kwargs):
+    rng = random.Random(seed)
+    async with MicroBatchServer(store, **kwargs) as server:
+        start = time.perf_counter()
+        tasks = []
+        for query in queries:
+            tasks.append(asyncio.create_task(server.submit(query)))
+            await asyncio.sleep(rng.expovariate(rate))
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - start, server.metrics()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark micro-batched RAG query serving")
+    parser.add_argument("--issues", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=500, help="query arrivals per second")
+    parser.add_argument("--window", type=float, default=0.005)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    issues = [synthetic_issue(rng) for _ in range(args.issues)]
+    store = IssueStore.build(issues, hash_embed)
+    queries = [reword(rng.choice(issues), rng) for _ in range(args.queries)]
+
+    for label, window, max_batch in (("unbatched", 0.0, 1), ("micro-batched", args.window, 64)):
+        elapsed, m = asyncio.run(run(store, queries, args.rate, args.seed, window=window, max_batch=max_batch))
+        print(f"{label:<14} {args.queries / elapsed:7.0f} q/s  p50 {m['p50_ms']:7.2f} ms  "
+              f"p99 {m['p99_ms']:7.2f} ms  batches {m['batches']:5d}  "
+              f"mean batch {m['batch_size_mean']:5.1f}  max {m['batch_size_max']}")
+
+if __name__ == "__main__":
+    main()
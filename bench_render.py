@@ -0,0 +1,68 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from mcpnews.rendering import use_headless, decimate, save_figure, export_figures
+
+# Headless rendering: a 250k-point 3D cloud (the size of 5 RoPE positions x
+# the phi-1.5 vocabulary) drawn in full vs decimated to PNG, and batch export of
+# trajectory figures serially vs in a process pool.
+# Run from the parent directory: python -m mcpnews.bench_render
+
+def point_cloud(n, rng):
+    centers = rng.standard_normal((50, 3)) * 5
+    return (centers[rng.integers(0, 50, n)] + rng.standard_normal((n, 3))).astype(np.float32)
+
+def scatter_figure(points, highlights):
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(14, 10))
+    ax = fig.add_subplot(111, projection='3d')
+    ax.scatter(points[:, 0], points[:, 1], points[:, 2], s=1, alpha=0.2)
+    ax.scatter(highlights[:, 0], highlights[:, 1], highlights[:, 2], color='red', s=40)
+    return fig
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless decimated rendering")
+    parser.add_argument("--points", type=int, default=250000)
+    parser.add_argument("--max-points", type=int, default=20000)
+    parser.add_argument("--figures", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    use_headless(force=True)
+    from mcpnews.matrix_projection import plot_flight
+
+    rng = np.random.default_rng(args.seed)
+    points = point_cloud(args.points, rng)
+    highlight_rows = rng.choice(args.points, 25, replace=False)
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        save_figure(scatter_figure(points, points[highlight_rows]), os.path.join(directory, "full.png"))
+        full_time = time.perf_counter() - start
+
+        for method in ("grid", "random"):
+            start = time.perf_counter()
+            shown = decimate(points, max_points=args.max_points, keep=highlight_rows, method=method)
+            save_figure(scatter_figure(points[shown], points[highlight_rows]),
+                        os.path.join(directory, f"{method}.png"))
+            elapsed = time.perf_counter() - start
+            print(f"{method:<6} decimated to {len(shown):>6} points: {elapsed:6.2f}s "
+                  f"(highlights kept: {np.isin(highlight_rows, shown).all()})")
+        print(f"full   {args.points:>6} points:             {full_time:6.2f}s")
+
+        jobs = [(plot_flight, {"point_A": np.array([0, 0, 0]), "point_B": np.array([800, 600 + 10 * i, 0])},
+                 os.path.join(directory, f"flight{i}.png")) for i in range(args.figures)]
+        start = time.perf_counter()
+        export_figures(jobs, processes=1)
+        serial = time.perf_counter() - start
+        start = time.perf_counter()
+        export_figures(jobs)
+        pooled = time.perf_counter() - start
+        print(f"export {args.figures} figures: serial {serial:.2f}s, process pool {pooled:.2f}s "
+              f"({os.cpu_count()} CPUs)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from mcpnews.retrieval import IssueStore, hash_embed, TOP_K
+
+# Retrieval latency and recall@k against corpus size, using the deterministic
+# hash embedding on synthetic support tickets. Each query is a noisy rewording
+# of one ticket; recall@k is how often that ticket is in the top k.
+# Run from the parent directory: python -m mcpnews.bench_retrieval
+
+COMPONENTS = ["login", "checkout", "dashboard", "password reset", "push notifications", "search",
+              "profile page", "invoice export", "file upload", "two-factor auth", "billing", "chat"]
+SYMPTOMS = ["crashes", "times out", "shows a blank screen", "returns error", "is very slow",
+            "fails silently", "logs the user out", "shows wrong data", "hangs", "rejects input"]
+PLATFORMS = ["on Android", "on iOS", "in Chrome", "in Safari", "on Windows", "on macOS",
+             "after the latest update", "for enterprise accounts", "behind a proxy", "in dark mode"]
+FILLERS = ["customer says", "user reports that", "ticket:", "urgent -", "again,", "since yesterday"]
+
+def synthetic_issue(rng):
+    return (f"{rng.choice(COMPONENTS).capitalize()} {rng.choice(SYMPTOMS)} {rng.choice(PLATFORMS)} "
+            f"with code {rng.randint(100, 99999)}")
+
+def reword(issue, rng):
+    words = issue.split()
+    words.pop(rng.randrange(1, len(words) - 2))
+    return f"{rng.choice(FILLERS)} {' '.join(words).lower()}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedding retrieval over support issues")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=TOP_K)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'issues':>8} {'embed s':>8} {'query ms':>9} {'batch ms/q':>11} {'recall@k':>9} "
+          f"{'stuffed chars':>14} {'top-k chars':>12}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        rng = random.Random(args.seed)
+        issues = [synthetic_issue(rng) for _ in range(size)]
+        start = time.perf_counter()
+        store = IssueStore.build(issues, hash_embed)
+        embed_time = time.perf_counter() - start
+
+        targets = [rng.randrange(size) for _ in range(args.queries)]
+        queries = [reword(issues[t], rng) for t in targets]
+
+        start = time.perf_counter()
+        results = [store.search(q, k=args.k) for q in queries]
+        query_time = (time.perf_counter() - start) / len(queries)
+
+        start = time.perf_counter()
+        store.search_many(queries, k=args.k)
+        batch_time = (time.perf_counter() - start) / len(queries)
+
+        hits = sum(issues[t] in [issue for issue, _ in found] for t, found in zip(targets, results))
+        stuffed = sum(len(i) + 3 for i in issues)
+        top = int(np.mean([sum(len(i) + 3 for i, _ in found) for found in results]))
+        print(f"{size:>8} {embed_time:>8.2f} {query_time * 1000:>9.3f} {batch_time * 1000:>11.3f} "
+              f"{hits / len(queries):>9.2f} {stuffed:>14} {top:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from mcpnews.rope import stacked_rope_embeddings, load_embedding_matrix, embedding_cache_path
+
+# Time and peak memory of the per-position RoPE loop from plot_embeddings
+# (theta and cos/sin recomputed per position, full copies concatenated) against
+# the table-driven in-place version, and the cost of reopening the cached
+# embedding matrix.
+# torch is not required: the loop is a line-for-line NumPy port of apply_rope.
+# Run from the parent directory: python -m mcpnews.bench_rope
+
+def apply_rope(embeddings, position):
+    dim = embeddings.shape[-1]
+    half_dim = dim // 2
+    theta = 10000 ** (-np.arange(0, half_dim, dtype=np.float32) / half_dim)
+    angle = position * theta
+    cos = np.cos(angle)
+    sin = np.sin(angle)
+    emb_even, emb_odd = embeddings[:, 0::2], embeddings[:, 1::2]
+    emb_rotated_even = emb_even * cos - emb_odd * sin
+    emb_rotated_odd = emb_even * sin + emb_odd * cos
+    rotated = np.empty_like(embeddings)
+    rotated[:, 0::2] = emb_rotated_even
+    rotated[:, 1::2] = emb_rotated_odd
+    return rotated
+
+def loop_rope(embeddings, positions):
+    return np.concatenate([apply_rope(embeddings, pos) for pos in positions], axis=0)
+
+def measure(func, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized RoPE and the embedding cache")
+    parser.add_argument("--vocab", type=int, default=16384, help="phi-1.5 has 51200")
+    parser.add_argument("--hidden", type=int, default=2048)
+    parser.add_argument("--positions", type=int, default=5)
+    args = parser.parse_args()
+
+    embeddings = np.random.default_rng(0).standard_normal((args.vocab, args.hidden)).astype(np.float32)
+    positions = list(range(args.positions))
+    output_mb = args.positions * embeddings.nbytes / 2**20
+
+    looped, loop_time, loop_peak = measure(loop_rope, embeddings, positions)
+    del looped
+    vectorized, vec_time, vec_peak = measure(stacked_rope_embeddings, embeddings, positions)
+    print(f"{args.positions} positions x {args.vocab} x {args.hidden} (output {output_mb:.0f} MB)")
+    print(f"loop:       {loop_time:6.2f}s  peak {loop_peak:7.0f} MB")
+    print(f"vectorized: {vec_time:6.2f}s  peak {vec_peak:7.0f} MB")
+    print(f"same result: {np.allclose(loop_rope(embeddings[:64], positions), stacked_rope_embeddings(embeddings[:64], positions), atol=1e-5)}")
+    del vectorized
+
+    with tempfile.TemporaryDirectory() as directory:
+        _, mm_time, mm_peak = measure(stacked_rope_embeddings, embeddings, positions,
+                                      path=os.path.join(directory, "stacked.npy"))
+        print(f"to memmap:  {mm_time:6.2f}s  peak {mm_peak:7.0f} MB")
+
+        np.save(embedding_cache_path("bench/model", directory), embeddings)
+        start = time.perf_counter()
+        cached = load_embedding_matrix("bench/model", directory)
+        print(f"cached embedding matrix reopened in {(time.perf_counter() - start) * 1000:.2f} ms "
+              f"({type(cached).__name__} {cached.shape})")
+
+if __name__ == "__main__":
+    main()
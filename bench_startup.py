@@ -0,0 +1,116 @@
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Cold-start import cost of the entry points, measured with `python -X importtime`
+# in fresh interpreters. Each entry point lists modules it must not load before
+# the user does something (the feed/LLM stack, matplotlib and Basemap); the
+# deferred groups show what the first analysis or the first Show Map pays
+# instead. With --max-ms the run fails if an entry point exceeds the budget or
+# loads a deferred module, so CI catches a heavy import creeping back in.
+# Run from the parent directory: python -m mcpnews.bench_startup
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ("requests", "feedparser", "matplotlib", "mpl_toolkits.basemap", "numpy")
+
+def top_level_imports(path):
+    # The module-level import statements of a script that cannot be imported
+    # without side effects (newsanalyser opens its window on import)
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+def entry_points():
+    # (name, code, modules that must not be loaded after running it)
+    return [
+        ("newsanalyser", top_level_imports(os.path.join(PACKAGE_DIR, "newsanalyser.py")), HEAVY_MODULES),
+        ("mcpnews", "import mcpnews.mcpnews", HEAVY_MODULES),
+        ("batch", "import mcpnews.batch", ()),
+        ("deferred: analysis", "import requests, feedparser", ()),
+        ("deferred: map", "import matplotlib.figure, matplotlib.backends.backend_tkagg, mcpnews.biasmap", ()),
+    ]
+
+def parse_importtime(stderr):
+    # {module: (self us, cumulative us)} from -X importtime output
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(own), int(cumulative))
+    return modules
+
+def measure(code, forbidden, baseline=()):
+    # Modules in `baseline` (what the interpreter loads before running any code,
+    # site and its .pth hooks) are left out of the import time and the listing
+    check = f"\nimport json, sys; print(json.dumps(sorted(m for m in {list(forbidden)!r} if m in sys.modules)))"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.path.dirname(PACKAGE_DIR),
+                                                                    os.environ.get("PYTHONPATH")])))
+    start = time.perf_counter()
+    done = subprocess.run([sys.executable, "-X", "importtime", "-c", code + check],
+                          capture_output=True, text=True, env=env)
+    wall = time.perf_counter() - start
+    if done.returncode != 0:
+        raise RuntimeError(done.stderr.strip().splitlines()[-1] if done.stderr.strip() else "import failed")
+    modules = {name: times for name, times in parse_importtime(done.stderr).items() if name not in baseline}
+    return {"wall": wall, "imports": sum(own for own, _ in modules.values()) / 1e6,
+            "loaded": json.loads(done.stdout.strip().splitlines()[-1]), "modules": modules}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark entry point import time")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=8, help="heaviest modules listed per entry point")
+    parser.add_argument("--max-ms", type=float, help="fail if an entry point's median import time exceeds this")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    baseline = measure("pass", ())
+    baseline_modules = set(baseline["modules"])
+    results = []
+    for name, code, forbidden in entry_points():
+        try:
+            # The first run writes bytecode caches and is not counted
+            runs = [measure(code, forbidden, baseline_modules) for _ in range(args.runs + 1)][1:]
+        except RuntimeError as e:
+            results.append({"entry_point": name, "error": str(e)})
+            continue
+        last = runs[-1]
+        heaviest = sorted(last["modules"].items(), key=lambda item: -item[1][1])
+        results.append({
+            "entry_point": name,
+            "imports_ms": statistics.median(run["imports"] for run in runs) * 1000,
+            "wall_ms": statistics.median(run["wall"] for run in runs) * 1000,
+            "modules": len(last["modules"]),
+            "deferred_loaded": last["loaded"],
+            "heaviest": [(module, cumulative / 1000) for module, (_, cumulative) in heaviest[:args.top]],
+            "budgeted": bool(forbidden),
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"interpreter startup: {baseline['wall'] * 1000:.1f} ms process, not counted below")
+        for result in results:
+            if "error" in result:
+                print(f"{result['entry_point']}: skipped ({result['error']})")
+                continue
+            print(f"{result['entry_point']}: {result['imports_ms']:.1f} ms imports, {result['wall_ms']:.1f} ms "
+                  f"process, {result['modules']} modules")
+            if result["deferred_loaded"]:
+                print(f"  loads deferred modules: {', '.join(result['deferred_loaded'])}")
+            for module, cumulative in result["heaviest"]:
+                print(f"  {module:<40} {cumulative:8.1f} ms")
+
+    failures = [result for result in results if result.get("budgeted") and (
+        result["deferred_loaded"] or (args.max_ms is not None and result["imports_ms"] > args.max_ms))]
+    if failures:
+        print(f"Startup budget exceeded: {', '.join(result['entry_point'] for result in failures)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
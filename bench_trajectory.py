@@ -0,0 +1,62 @@
+import argparse
+import time
+
+import numpy as np
+
+from mcpnews.trajectory import flight_paths, trajectory_metrics
+
+# Compares the per-point Python loop that matrix_projection.py used to build
+# flight paths with the vectorized fleet API, and checks they agree.
+# Run from the parent directory: python -m mcpnews.bench_trajectory
+
+def loop_flight_path(point_A, point_B, num_points):
+    t = np.linspace(0, 1, num_points)
+    flight_path = np.zeros((num_points, 3))
+    for i in range(num_points):
+        flight_path[i, 0] = point_A[0] + (point_B[0] - point_A[0]) * t[i]
+        flight_path[i, 1] = point_A[1] + (point_B[1] - point_A[1]) * t[i] + 100 * np.sin(3 * np.pi * t[i])
+        if t[i] < 0.15:
+            flight_path[i, 2] = 10000 * (t[i] / 0.15)
+        elif t[i] > 0.85:
+            flight_path[i, 2] = 10000 * (1 - (t[i] - 0.85) / 0.15)
+        else:
+            flight_path[i, 2] = 10000 + 500 * np.sin(np.pi * (t[i] - 0.15) / 0.7)
+    return flight_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized flight-path generation")
+    parser.add_argument("--flights", type=int, default=2000)
+    parser.add_argument("--points", type=int, default=1000)
+    parser.add_argument("--loop-flights", type=int, default=20, help="flights timed with the loop")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    points_a = np.column_stack([rng.uniform(0, 2000, (args.flights, 2)), np.zeros(args.flights)])
+    points_b = np.column_stack([rng.uniform(0, 2000, (args.flights, 2)), np.zeros(args.flights)])
+
+    start = time.perf_counter()
+    for a, b in zip(points_a[:args.loop_flights], points_b[:args.loop_flights]):
+        loop_flight_path(a, b, args.points)
+    loop_per_point = (time.perf_counter() - start) / (args.loop_flights * args.points)
+
+    start = time.perf_counter()
+    paths = flight_paths(points_a, points_b, args.points)
+    path_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    metrics = trajectory_metrics(points_a, points_b, args.points)
+    metrics_time = time.perf_counter() - start
+
+    total = args.flights * args.points
+    same = all(np.allclose(loop_flight_path(a, b, args.points), p)
+               for a, b, p in zip(points_a[:5], points_b[:5], paths[:5]))
+    print(f"{args.flights} flights x {args.points} points = {total} points")
+    print(f"loop (extrapolated): {loop_per_point * total:8.2f}s")
+    print(f"vectorized paths:    {path_time:8.2f}s")
+    print(f"paths + velocity, remaining, projection, efficiency: {metrics_time:.2f}s "
+          f"{metrics['projection'].shape}")
+    print(f"matches loop: {same}")
+
+if __name__ == "__main__":
+    main()
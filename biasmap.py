@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+# Bias map with a cached background. The Robinson-projected world (coastlines,
+# countries, fills) is rendered with Basemap once, stored as an RGBA raster
+# together with the projected country coordinates, and shown with imshow after
+# that, so Basemap is only imported on a cache miss. BiasMap keeps the
+# background static and only redraws the country markers, blitting them over a
+# saved copy of the canvas when it is interactive.
+
+# Map bias to color (expand as needed)
+BIAS_COLOR = {
+    "Neutral": "green",
+    "Slightly Negative": "orange",
+    "Extreme Bias (Distraction)": "red",
+    "None": "gray"
+}
+
+# Map country names to (lat, lon) for plotting
+COUNTRY_COORDS = {
+    "France": (46.603354, 1.888334),
+    "United States": (37.09024, -95.712891),
+    "USA": (37.09024, -95.712891),
+    "Japan": (36.204824, 138.252924),
+    "China": (35.86166, 104.195397),
+    "India": (20.593684, 78.96288),
+    "United Kingdom": (55.378051, -3.435973),
+    "Germany": (51.165691, 10.451526),
+    "Australia": (-25.274398, 133.775136),
+    "Russia": (61.52401, 105.318756)
+}
+
+MAP_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mcpnews", "maps")
+MAP_WIDTH = 8
+MAP_DPI = 100
+
+def get_country_from_newsoutlet(newsoutlet):
+    # Extract country from "Outlet Name (Country)"
+    match = re.search(r"\(([^)]+)\)", newsoutlet)
+    if match:
+        return match.group(1)
+    return newsoutlet  # fallback
+
+def background_key(coords=COUNTRY_COORDS, width=MAP_WIDTH, dpi=MAP_DPI):
+    material = json.dumps({"projection": "robin", "lon_0": 0, "resolution": "c", "width": width, "dpi": dpi,
+                           "coords": coords}, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+def render_background(coords=COUNTRY_COORDS, width=MAP_WIDTH, dpi=MAP_DPI):
+    # (rgba raster, extent, {country: (x, y)}) in Robinson map coordinates
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from mpl_toolkits.basemap import Basemap
+
+    m = Basemap(projection='robin', lon_0=0, resolution='c', fix_aspect=False)
+    extent = (m.llcrnrx, m.urcrnrx, m.llcrnry, m.urcrnry)
+    fig = Figure(figsize=(width, width * (extent[3] - extent[2]) / (extent[1] - extent[0])), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    m.ax = ax
+    m.drawcoastlines()
+    m.drawcountries()
+    m.fillcontinents(color='lightgray', lake_color='aqua')
+    m.drawmapboundary(fill_color='aqua')
+    ax.set_xlim(extent[0], extent[1])
+    ax.set_ylim(extent[2], extent[3])
+    ax.set_axis_off()
+    canvas.draw()
+    raster = np.asarray(canvas.buffer_rgba()).copy()
+    projected = {country: tuple(float(v) for v in m(lon, lat)) for country, (lat, lon) in coords.items()}
+    return raster, extent, projected
+
+def load_background(coords=COUNTRY_COORDS, cache_dir=MAP_CACHE_DIR, width=MAP_WIDTH, dpi=MAP_DPI):
+    # Cached render_background; the key covers the projection, size and country table
+    base = os.path.join(cache_dir, "robin-" + background_key(coords, width, dpi))
+    if os.path.exists(base + ".json") and os.path.exists(base + ".npy"):
+        with open(base + ".json", encoding="utf-8") as f:
+            meta = json.load(f)
+        projected = {country: tuple(xy) for country, xy in meta["coords"].items()}
+        return np.load(base + ".npy"), tuple(meta["extent"]), projected
+    raster, extent, projected = render_background(coords, width, dpi)
+    os.makedirs(cache_dir, exist_ok=True)
+    np.save(base + ".tmp.npy", raster)
+    os.replace(base + ".tmp.npy", base + ".npy")
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump({"extent": extent, "coords": projected}, f)
+    return raster, extent, projected
+
+def country_markers(outlet_analysis, projected):
+    # [(country, x, y, color)], one per country in first-seen order like the original plot_map
+    markers = []
+    seen = set()
+    for entry in outlet_analysis:
+        country = get_country_from_newsoutlet(entry.get("country_of_origin", ""))
+        xy = projected.get(country)
+        if xy and country not in seen:
+            seen.add(country)
+            markers.append((country, xy[0], xy[1], BIAS_COLOR.get(entry.get("bias_level", "None"), "black")))
+    return markers
+
+class BiasMap:
+    # A bias map on `fig` (a new 8-inch Figure if None). update() replaces the
+    # markers; with blit=True they are animated artists drawn over the cached
+    # canvas background, so an update costs only the markers, not the map.
+
+    def __init__(self, fig=None, coords=COUNTRY_COORDS, cache_dir=MAP_CACHE_DIR, blit=True):
+        raster, extent, self.projected = load_background(coords, cache_dir)
+        if fig is None:
+            fig = Figure(figsize=(MAP_WIDTH, MAP_WIDTH * raster.shape[0] / raster.shape[1] + 0.6))
+        self.fig = fig
+        self.blit = blit
+        self.ax = fig.add_subplot(111)
+        self.ax.imshow(raster, extent=extent, interpolation="nearest")
+        self.ax.set_axis_off()
+        handles = [Line2D([0], [0], marker='o', color='w', label=label, markerfacecolor=color, markersize=10)
+                   for label, color in BIAS_COLOR.items()]
+        self.ax.legend(handles=handles, loc='lower left', title="Bias Level")
+        self.ax.set_title("Fairness/Bias of News Coverage by Country")
+        self.markers = self.ax.scatter([], [], s=15 ** 2, zorder=3, animated=blit)
+        self.labels = []
+        self._background = None
+        if blit:
+            fig.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event):
+        # Full redraws (first show, resize) refresh the saved background
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_markers()
+
+    def _draw_markers(self):
+        self.ax.draw_artist(self.markers)
+        for label in self.labels:
+            self.ax.draw_artist(label)
+
+    def update(self, outlet_analysis):
+        markers = country_markers(outlet_analysis, self.projected)
+        self.markers.set_offsets(np.array([(x, y) for _, x, y, _ in markers]).reshape(-1, 2))
+        self.markers.set_facecolors([color for *_, color in markers])
+        for label in self.labels:
+            label.remove()
+        self.labels = [self.ax.text(x, y, country, fontsize=9, ha='center', va='center', color='white',
+                                    weight='bold', zorder=4, animated=self.blit)
+                       for country, x, y, _ in markers]
+        canvas = self.fig.canvas
+        if not self.blit or self._background is None:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self._background)
+        self._draw_markers()
+        canvas.blit(self.fig.bbox)
+
+def plot_map(outlet_analysis, cache_dir=MAP_CACHE_DIR):
+    # Static figure of the map, e.g. for savefig
+    bias_map = BiasMap(cache_dir=cache_dir, blit=False)
+    bias_map.update(outlet_analysis)
+    return bias_map.fig
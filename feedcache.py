@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from mcpnews.feedfetch import FEED_TIMEOUT, parse_feed
+from mcpnews.telemetry import tracer
+
+# Seconds a cached feed is served without asking the outlet again
+FEED_CACHE_TTL = 300
+# Number of feeds kept in memory and on disk
+FEED_CACHE_SIZE = 64
+FEED_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mcpnews", "feeds")
+
+class FeedCache:
+    # Parsed-entry cache per feed url. Fresh entries (younger than ttl) are served
+    # from memory or disk; stale ones are revalidated with a conditional GET
+    # (If-None-Match / If-Modified-Since) so unchanged feeds cost a 304 and no parsing.
+
+    def __init__(self, ttl=FEED_CACHE_TTL, max_entries=FEED_CACHE_SIZE, cache_dir=FEED_CACHE_DIR):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"fresh": 0, "not_modified": 0, "downloaded": 0, "stale_on_error": 0}
+
+    def fetch(self, feed_url, timeout=FEED_TIMEOUT, max_age=None):
+        # max_age overrides ttl for this call; max_age=0 always revalidates
+        with tracer.span("fetch", url=feed_url) as span:
+            return self._fetch(feed_url, timeout, max_age, span)
+
+    def _fetch(self, feed_url, timeout, max_age, span):
+        # Imported here rather than at module level, as in feedfetch
+        import requests
+
+        record = self._lookup(feed_url)
+        ttl = self.ttl if max_age is None else max_age
+        if record and time.time() - record["checked_at"] < ttl:
+            self._count("fresh", span)
+            return self._to_feed(record)
+
+        headers = {}
+        if record and record.get("etag"):
+            headers["If-None-Match"] = record["etag"]
+        if record and record.get("modified"):
+            headers["If-Modified-Since"] = record["modified"]
+        try:
+            response = requests.get(feed_url, headers=headers, timeout=timeout)
+            if response.status_code == 304 and record:
+                record["checked_at"] = time.time()
+                self._store(feed_url, record)
+                self._count("not_modified", span)
+                return self._to_feed(record)
+            response.raise_for_status()
+        except requests.RequestException:
+            if record:
+                # Serve the last good copy rather than dropping the outlet
+                self._count("stale_on_error", span)
+                return self._to_feed(record)
+            raise
+
+        span.count("bytes", len(response.content))
+        parsed = parse_feed(response)
+        record = {
+            "url": feed_url,
+            "etag": response.headers.get("ETag"),
+            "modified": response.headers.get("Last-Modified"),
+            "checked_at": time.time(),
+            "feed": dict(parsed.get("feed", {})),
+            "entries": [dict(entry) for entry in parsed.entries],
+        }
+        self._store(feed_url, record)
+        self._count("downloaded", span)
+        return self._to_feed(record)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def _count(self, key, span=None):
+        if span is not None:
+            span.set(cache=key)
+        with self._lock:
+            self.stats[key] += 1
+
+    def _to_feed(self, record):
+        import feedparser
+
+        return feedparser.FeedParserDict(
+            feed=feedparser.FeedParserDict(record["feed"]),
+            entries=[feedparser.FeedParserDict(entry) for entry in record["entries"]],
+        )
+
+    def _path(self, feed_url):
+        return os.path.join(self.cache_dir, hashlib.sha1(feed_url.encode("utf-8")).hexdigest() + ".json")
+
+    def _lookup(self, feed_url):
+        with self._lock:
+            if feed_url in self._entries:
+                self._entries.move_to_end(feed_url)
+                return self._entries[feed_url]
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(feed_url), encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._remember(feed_url, record)
+        return record
+
+    def _remember(self, feed_url, record):
+        with self._lock:
+            self._entries[feed_url] = record
+            self._entries.move_to_end(feed_url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _store(self, feed_url, record):
+        self._remember(feed_url, record)
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(feed_url)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(record, f, default=str)
+            os.replace(tmp_path, path)
+            self._evict_disk()
+        except OSError as e:
+            print("Error writing feed cache:", e)
+
+    def _evict_disk(self):
+        # Least recently written files go first once the directory exceeds the cap
+        files = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                 if name.endswith(".json")]
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
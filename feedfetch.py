@@ -0,0 +1,82 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from mcpnews.telemetry import tracer
+
+# requests and feedparser are imported on first fetch, not with this module, so
+# entry points that import the pipeline start without paying for them.
+
+# Seconds a single outlet may take before it is dropped from the sweep
+FEED_TIMEOUT = 5.0
+# Seconds the whole sweep may take; feeds still pending are reported as errors
+FETCH_DEADLINE = 10.0
+MAX_FETCH_WORKERS = 16
+# Seconds between checks of a sweep's cancel event while no feed completes
+CANCEL_POLL = 0.05
+
+def fetch_feed(feed_url, timeout=FEED_TIMEOUT):
+    # feedparser.parse(url) has no timeout, so download with requests and parse the bytes.
+    # The fetch span includes the nested parse span, as in FeedCache.fetch.
+    import requests
+
+    with tracer.span("fetch", url=feed_url) as span:
+        response = requests.get(feed_url, timeout=timeout)
+        response.raise_for_status()
+        span.count("bytes", len(response.content))
+        return parse_feed(response)
+
+def parse_feed(response):
+    import feedparser
+
+    with tracer.span("parse") as span:
+        feed = feedparser.parse(response.content, response_headers=dict(response.headers))
+        span.count("entries", len(feed.entries))
+    return feed
+
+def iter_feeds(feeds, timeout=FEED_TIMEOUT, deadline=FETCH_DEADLINE,
+               max_workers=MAX_FETCH_WORKERS, fetch=fetch_feed, cancel=None):
+    # Yields (source, feed, error) for each {source: url} as soon as it completes.
+    # Exactly one of feed/error is None. Feeds still pending at the deadline are
+    # yielded with an error so callers can work with partial results. Setting the
+    # `cancel` threading.Event ends the sweep without waiting for pending feeds.
+    if not feeds:
+        return
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(feeds))))
+    # Each worker runs in a copy of the caller's context so its spans nest under the caller's
+    futures = {executor.submit(contextvars.copy_context().run, fetch, url, timeout): source
+               for source, url in feeds.items()}
+    pending = set(futures)
+    deadline_at = time.monotonic() + deadline
+    try:
+        while pending:
+            if cancel is not None and cancel.is_set():
+                return
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                for future in pending:
+                    yield futures[future], None, f"deadline of {deadline}s exceeded"
+                return
+            done, pending = wait(pending, timeout=remaining if cancel is None else min(remaining, CANCEL_POLL),
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                source = futures[future]
+                try:
+                    yield source, future.result(), None
+                except Exception as e:
+                    yield source, None, str(e) or e.__class__.__name__
+    finally:
+        # Do not wait on stragglers; their own per-feed timeout ends them
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def fetch_feeds(feeds, timeout=FEED_TIMEOUT, deadline=FETCH_DEADLINE,
+                max_workers=MAX_FETCH_WORKERS, fetch=fetch_feed):
+    parsed = {}
+    errors = {}
+    for source, feed, error in iter_feeds(feeds, timeout=timeout, deadline=deadline,
+                                          max_workers=max_workers, fetch=fetch):
+        if error is None:
+            parsed[source] = feed
+        else:
+            errors[source] = error
+    return parsed, errors
@@ -0,0 +1,256 @@
+import argparse
+import calendar
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+from mcpnews.feedfetch import fetch_feed, iter_feeds, FEED_TIMEOUT, FETCH_DEADLINE, MAX_FETCH_WORKERS
+from mcpnews.topicindex import entry_key
+
+# Background feed poller. A daemon thread re-polls each feed on its own
+# schedule, adapted to how often the feed publishes, deduplicates entries by
+# GUID/link and publishes only the new ones to in-process subscribers (the
+# topic index, the GUI, batch --watch), so topic queries run against data that
+# is already local instead of paying for a feed sweep.
+
+MIN_POLL_INTERVAL = 60
+MAX_POLL_INTERVAL = 30 * 60
+INITIAL_POLL_INTERVAL = 5 * 60
+# First retry of a failed feed; doubles per consecutive failure up to max_interval
+FAILURE_RETRY_INTERVAL = 30
+# Entry keys remembered per feed; comfortably more than a feed ever lists at once
+SEEN_LIMIT = 2000
+
+def entry_timestamp(entry):
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    if not parsed:
+        return None
+    try:
+        # struct_time from feedparser, or a plain list once round-tripped through the feed cache
+        return calendar.timegm(tuple(parsed)[:9])
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+def update_period(entries):
+    # Median seconds between consecutive entries, or None without usable timestamps
+    stamps = sorted(stamp for stamp in map(entry_timestamp, entries) if stamp is not None)
+    gaps = sorted(b - a for a, b in zip(stamps, stamps[1:]) if b > a)
+    return gaps[len(gaps) // 2] if gaps else None
+
+class FeedState:
+    # Schedule and dedup state of one polled feed
+
+    def __init__(self, source, url, interval):
+        self.source = source
+        self.url = url
+        self.interval = interval
+        self.next_poll = 0.0
+        self.seen = OrderedDict()
+        # Keys of the entries the feed listed at its last successful poll
+        self.current = frozenset()
+        self.polls = 0
+        self.failures = 0
+        self.ok = False
+        self.last_error = None
+        self.last_new_at = None
+
+class FeedPoller:
+    # Polls {source: url}. Subscribers are called as callback(source, new_entries,
+    # entries) on the poller thread whenever a feed's entry set changed, where
+    # entries is the feed's full current list (what TopicIndex.update_feed wants,
+    # so dropped entries leave the index too) and new_entries may be empty. A
+    # feed is re-polled every interval seconds: half its median gap between
+    # entries when it has timestamps, otherwise halved when something new arrived
+    # and grown 1.5x when nothing did, clamped to [min_interval, max_interval].
+    # Failures are retried after retry_interval, doubling per consecutive failure,
+    # without touching the normal interval. With a FeedCache every poll is a
+    # conditional GET.
+
+    def __init__(self, feeds, cache=None, min_interval=MIN_POLL_INTERVAL, max_interval=MAX_POLL_INTERVAL,
+                 initial_interval=INITIAL_POLL_INTERVAL, timeout=FEED_TIMEOUT, deadline=FETCH_DEADLINE,
+                 max_workers=MAX_FETCH_WORKERS, seen_limit=SEEN_LIMIT, retry_interval=FAILURE_RETRY_INTERVAL):
+        self.feeds = {source: FeedState(source, url, initial_interval) for source, url in feeds.items()}
+        self.cache = cache
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_workers = max_workers
+        self.seen_limit = seen_limit
+        self.retry_interval = retry_interval
+        self.stats = {"polls": 0, "errors": 0, "new_entries": 0}
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._warm = threading.Event()
+        self._thread = None
+
+    def subscribe(self, callback):
+        # Returns a function that removes the subscription
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def subscribe_queue(self):
+        # (queue of (source, new_entries, entries), unsubscribe) for consumers on other threads
+        updates = queue.Queue()
+        return updates, self.subscribe(lambda *update: updates.put(update))
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="feed-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wait_warm(self, timeout=None):
+        # True once a poll round has finished with at least one feed polled successfully
+        return self._warm.wait(timeout)
+
+    def warm_sources(self, feeds):
+        # Sources of `feeds` ({source: {"url": ...}}) with polled data, in feeds order, or
+        # None unless the poller is running, warm and tracks every one of those urls.
+        # Callers sweep the sources left out themselves (see mcpnews.indexed_sources).
+        if not self.running or not self._warm.is_set():
+            return None
+        states = [self.feeds.get(source) for source in feeds]
+        if any(state is None or state.url != info['url'] for state, info in zip(states, feeds.values())):
+            return None
+        return [state.source for state in states if state.ok]
+
+    def due(self, now=None):
+        now = time.time() if now is None else now
+        return [source for source, state in self.feeds.items() if state.next_poll <= now]
+
+    def status(self):
+        now = time.time()
+        return {source: {"ok": state.ok, "interval": state.interval, "next_poll_in": max(0.0, state.next_poll - now),
+                         "failures": state.failures, "last_error": state.last_error, "seen": len(state.seen)}
+                for source, state in self.feeds.items()}
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.poll(self.due())
+            if any(state.ok for state in self.feeds.values()):
+                self._warm.set()
+            next_poll = min((state.next_poll for state in self.feeds.values()), default=time.time() + 1)
+            self._stop.wait(min(max(next_poll - time.time(), 0.5), self.max_interval))
+
+    def _fetch(self, url, timeout):
+        if self.cache:
+            return self.cache.fetch(url, timeout=timeout, max_age=0)
+        return fetch_feed(url, timeout=timeout)
+
+    def poll(self, sources=None):
+        # Polls `sources` (default: all) now and returns {source: new entry count}
+        # for those that succeeded. Runs on the caller's thread.
+        sources = list(self.feeds) if sources is None else sources
+        counts = {}
+        for source, feed, error in iter_feeds({source: self.feeds[source].url for source in sources},
+                                              timeout=self.timeout, deadline=self.deadline,
+                                              max_workers=self.max_workers, fetch=self._fetch):
+            state = self.feeds[source]
+            now = time.time()
+            state.polls += 1
+            self._count("polls")
+            if error is not None:
+                state.failures += 1
+                state.last_error = error
+                state.next_poll = now + min(self.max_interval, self.retry_interval * 2 ** (state.failures - 1))
+                self._count("errors")
+                continue
+            state.ok = True
+            state.failures = 0
+            state.last_error = None
+            new_entries = self._dedup(state, feed.entries)
+            current = frozenset(filter(None, map(entry_key, feed.entries)))
+            # Dropped entries change the set too, and must reach the index
+            changed = bool(new_entries) or current != state.current
+            state.current = current
+            state.interval = self._next_interval(state, feed.entries, bool(new_entries))
+            state.next_poll = now + state.interval
+            counts[source] = len(new_entries)
+            if new_entries:
+                state.last_new_at = now
+                self._count("new_entries", len(new_entries))
+            if changed:
+                self._publish(source, new_entries, feed.entries)
+        return counts
+
+    def _dedup(self, state, entries):
+        new_entries = []
+        for entry in entries:
+            key = entry_key(entry)
+            if key is None:
+                continue
+            if key in state.seen:
+                state.seen.move_to_end(key)
+                continue
+            state.seen[key] = True
+            new_entries.append(entry)
+        while len(state.seen) > self.seen_limit:
+            state.seen.popitem(last=False)
+        return new_entries
+
+    def _next_interval(self, state, entries, changed):
+        period = update_period(entries)
+        if period is not None:
+            interval = period / 2 if changed else max(period / 2, state.interval * 1.5)
+        else:
+            interval = state.interval / 2 if changed else state.interval * 1.5
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def _publish(self, source, new_entries, entries):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(source, new_entries, entries)
+            except Exception as e:
+                # One broken subscriber must not stop the others or the poller
+                print(f"Error in feed subscriber for {source}:", e)
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+def main():
+    from mcpnews.mcpnews import feed_poller
+
+    parser = argparse.ArgumentParser(description="Poll the outlets in the background and print new entries")
+    parser.add_argument("--min-interval", type=float, default=MIN_POLL_INTERVAL)
+    args = parser.parse_args()
+    feed_poller.min_interval = args.min_interval
+
+    def show(source, new_entries, entries):
+        for entry in new_entries:
+            print(f"[{source}] {entry.get('title', '')}", flush=True)
+    feed_poller.subscribe(show)
+    feed_poller.start()
+    try:
+        while True:
+            time.sleep(60)
+            waiting = sorted(feed_poller.status().items(), key=lambda item: item[1]["next_poll_in"])
+            print(f"-- {feed_poller.stats}; next: " + ", ".join(
+                f"{source} in {status['next_poll_in']:.0f}s" for source, status in waiting[:3]), flush=True)
+    except KeyboardInterrupt:
+        feed_poller.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+from mcpnews.outletparser import BIAS_LEVELS, parse_analysis
+
+# Persistent history of analyses in SQLite: the articles, prompt and response
+# of every run plus one row per parsed outlet with its bias level. Outlet rows
+# carry the topic and timestamp of their analysis so bias aggregates by outlet,
+# country, topic and time window are answered from indexes alone, and a recent
+# stored analysis can be served instead of re-fetching feeds and re-prompting.
+
+HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".cache", "mcpnews", "history.sqlite3")
+# Ordinal used for the mean bias score: 0 neutral .. 2 extreme; "None" is unrated
+BIAS_SCORES = {level: score for score, level in enumerate(BIAS_LEVELS)}
+GROUP_COLUMNS = {"outlet": "outlet", "country": "country", "topic": "topic_key"}
+DURATION = re.compile(r"^(\d+(?:\.\d+)?)([smhdw]?)$")
+DURATION_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY, topic TEXT, topic_key TEXT, model TEXT, mode TEXT,
+    created_at REAL, prompt TEXT, response TEXT, summary TEXT);
+CREATE TABLE IF NOT EXISTS articles (
+    analysis_id INTEGER REFERENCES analyses (id) ON DELETE CASCADE,
+    source TEXT, country TEXT, title TEXT, summary TEXT, link TEXT);
+CREATE TABLE IF NOT EXISTS outlets (
+    analysis_id INTEGER REFERENCES analyses (id) ON DELETE CASCADE,
+    topic_key TEXT, created_at REAL, outlet TEXT, country TEXT, bias_level TEXT, score INTEGER,
+    analysis TEXT);
+CREATE INDEX IF NOT EXISTS analyses_topic ON analyses (topic_key, created_at);
+CREATE INDEX IF NOT EXISTS articles_analysis ON articles (analysis_id);
+CREATE INDEX IF NOT EXISTS outlets_analysis ON outlets (analysis_id);
+CREATE INDEX IF NOT EXISTS outlets_outlet ON outlets (outlet, created_at, bias_level, score);
+CREATE INDEX IF NOT EXISTS outlets_country ON outlets (country, created_at, bias_level, score);
+CREATE INDEX IF NOT EXISTS outlets_topic ON outlets (topic_key, created_at, bias_level, score);
+CREATE INDEX IF NOT EXISTS outlets_time ON outlets (created_at, bias_level, score);
+"""
+
+def topic_key(topic):
+    return " ".join(topic.lower().split())
+
+def parse_duration(text):
+    # "90", "45m", "12h", "30d", "2w" -> seconds
+    match = DURATION.match(text.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid duration: {text}")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+class AnalysisStore:
+    # Thread-safe like ResponseCache: one lazily opened connection behind a lock.
+    # record() stores one analysis; record_many() ingests a batch in a single
+    # transaction. Timestamps are Unix seconds.
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @property
+    def _db(self):
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode = WAL")
+                self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def record(self, topic, result, model=None, mode="single", created_at=None):
+        # result: a get_mcp_analysis / iter_mcp_analysis / batch result dict. Returns the analysis id.
+        with self._lock:
+            analysis_id = self._insert(topic, result, model, mode, created_at)
+            self._db.commit()
+        return analysis_id
+
+    def record_many(self, results, model=None, mode="single"):
+        # Bulk ingest of batch records (each with a "topic"); failed and reused ones are skipped.
+        # Returns the number stored.
+        count = 0
+        with self._lock:
+            try:
+                for result in results:
+                    if result.get("error") or result.get("reused") or not result.get("response"):
+                        continue
+                    self._insert(result["topic"], result, result.get("model", model),
+                                 result.get("mode", mode), result.get("created_at"))
+                    count += 1
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+        return count
+
+    def _insert(self, topic, result, model, mode, created_at):
+        created_at = time.time() if created_at is None else created_at
+        outlets = result.get("outlet_analysis")
+        summary = result.get("summary")
+        if outlets is None:
+            parsed = parse_analysis(result.get("response") or "")
+            outlets, summary = parsed["articles"], summary or parsed["summary"]
+        cursor = self._db.execute(
+            "INSERT INTO analyses (topic, topic_key, model, mode, created_at, prompt, response, summary)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (topic, topic_key(topic), model, mode, created_at, result.get("prompt"), result.get("response"),
+             summary),
+        )
+        analysis_id = cursor.lastrowid
+        self._db.executemany(
+            "INSERT INTO articles VALUES (?, ?, ?, ?, ?, ?)",
+            [(analysis_id, a.get("source"), a.get("country"), a.get("title"), a.get("summary"), a.get("link"))
+             for a in result.get("articles") or []],
+        )
+        self._db.executemany(
+            "INSERT INTO outlets VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(analysis_id, topic_key(topic), created_at, o["newsoutlet"], o.get("country_of_origin"),
+              o["bias_level"], BIAS_SCORES.get(o["bias_level"]), o.get("newsanalysis"))
+             for o in outlets],
+        )
+        return analysis_id
+
+    def latest(self, topic, max_age=None, model=None):
+        # Most recent stored analysis of `topic` (no older than max_age seconds,
+        # from `model` if given) in the shape get_mcp_analysis returns, or None
+        query = "SELECT * FROM analyses WHERE topic_key = ?"
+        params = [topic_key(topic)]
+        if max_age is not None:
+            query += " AND created_at >= ?"
+            params.append(time.time() - max_age)
+        if model:
+            query += " AND model = ?"
+            params.append(model)
+        with self._lock:
+            self._db.row_factory = sqlite3.Row
+            try:
+                row = self._db.execute(query + " ORDER BY created_at DESC LIMIT 1", params).fetchone()
+                if row is None:
+                    return None
+                articles = [dict(a) for a in self._db.execute(
+                    "SELECT source, country, title, summary, link FROM articles WHERE analysis_id = ?"
+                    " ORDER BY rowid", (row["id"],))]
+                outlets = [{"newsoutlet": o["outlet"], "newsanalysis": o["analysis"],
+                            "country_of_origin": o["country"], "bias_level": o["bias_level"]}
+                           for o in self._db.execute(
+                               "SELECT * FROM outlets WHERE analysis_id = ? ORDER BY rowid", (row["id"],))]
+            finally:
+                self._db.row_factory = None
+        return {
+            "id": row["id"],
+            "topic": row["topic"],
+            "model": row["model"],
+            "mode": row["mode"],
+            "created_at": row["created_at"],
+            "prompt": row["prompt"],
+            "response": row["response"],
+            "summary": row["summary"],
+            "articles": articles,
+            "outlet_analysis": outlets,
+        }
+
+    def _filters(self, since, until, topic, outlet, country):
+        clauses, params = [], []
+        for column, value in (("topic_key", topic and topic_key(topic)), ("outlet", outlet), ("country", country)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _level_columns(self):
+        counts = ", ".join("SUM(bias_level = ?)" for _ in BIAS_LEVELS + ["None"])
+        return counts + ", COUNT(*), AVG(score)", BIAS_LEVELS + ["None"]
+
+    def _rows(self, key_name, rows):
+        levels = BIAS_LEVELS + ["None"]
+        return [dict({key_name: row[0]}, **dict(zip(levels, row[1:1 + len(levels)])),
+                     total=row[-2], score=row[-1]) for row in rows]
+
+    def bias_counts(self, by="outlet", since=None, until=None, topic=None, outlet=None, country=None):
+        # Per-level outlet counts, total and mean score (0 neutral .. 2 extreme)
+        # grouped by outlet, country or topic, most analysed first
+        column = GROUP_COLUMNS[by]
+        where, params = self._filters(since, until, topic, outlet, country)
+        levels, level_params = self._level_columns()
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {column}, {levels} FROM outlets{where} GROUP BY {column} ORDER BY COUNT(*) DESC, {column}",
+                level_params + params,
+            ).fetchall()
+        return self._rows(by, rows)
+
+    def bias_trend(self, bucket=86400, since=None, until=None, topic=None, outlet=None, country=None):
+        # The same aggregates per time bucket of `bucket` seconds, oldest first;
+        # "start" is the bucket's start time
+        where, params = self._filters(since, until, topic, outlet, country)
+        levels, level_params = self._level_columns()
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT CAST(created_at / ? AS INTEGER) * ? AS start, {levels} FROM outlets{where}"
+                " GROUP BY start ORDER BY start",
+                [bucket, bucket] + level_params + params,
+            ).fetchall()
+        return self._rows("start", rows)
+
+    def prune(self, before):
+        # Drops analyses older than `before`; returns how many
+        with self._lock:
+            count = self._db.execute("DELETE FROM analyses WHERE created_at < ?", (before,)).rowcount
+            self._db.commit()
+        return count
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+def read_records(lines):
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Query or fill the analysis history")
+    parser.add_argument("--db", default=HISTORY_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="bulk-load batch JSONL output")
+    ingest.add_argument("files", nargs="+", help="JSONL files from mcpnews.batch, '-' for stdin")
+    ingest.add_argument("--model", default="gemma3:latest")
+    for name in ("counts", "trend"):
+        query = commands.add_parser(name)
+        query.add_argument("--since", help="window start as a duration ago, e.g. 30d")
+        query.add_argument("--topic")
+        query.add_argument("--outlet")
+        query.add_argument("--country")
+        if name == "counts":
+            query.add_argument("--by", choices=sorted(GROUP_COLUMNS), default="outlet")
+        else:
+            query.add_argument("--bucket", default="1d", help="bucket width, e.g. 1h, 1d, 1w")
+    args = parser.parse_args()
+
+    store = AnalysisStore(args.db)
+    if args.command == "ingest":
+        for name in args.files:
+            if name == "-":
+                stored = store.record_many(read_records(sys.stdin), model=args.model)
+            else:
+                with open(name, encoding="utf-8") as f:
+                    stored = store.record_many(read_records(f), model=args.model)
+            print(f"{name}: {stored} analyses stored", file=sys.stderr)
+        return
+
+    since = time.time() - parse_duration(args.since) if args.since else None
+    filters = dict(since=since, topic=args.topic, outlet=args.outlet, country=args.country)
+    if args.command == "counts":
+        rows, key = store.bias_counts(by=args.by, **filters), args.by
+    else:
+        rows, key = store.bias_trend(bucket=parse_duration(args.bucket), **filters), "start"
+    for row in rows:
+        label = time.strftime("%Y-%m-%d %H:%M", time.localtime(row[key])) if key == "start" else row[key]
+        score = f"{row['score']:.2f}" if row["score"] is not None else "-"
+        levels = "  ".join(f"{level}={row[level]}" for level in BIAS_LEVELS + ["None"] if row[level])
+        print(f"{label:<30} n={row['total']:<5} score={score:<5} {levels}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Seconds a cached LLM response stays valid
+RESPONSE_CACHE_TTL = 7 * 24 * 3600
+# Total bytes of cached responses kept before least recently used ones are evicted
+RESPONSE_CACHE_BYTES = 256 * 1024 * 1024
+RESPONSE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "mcpnews", "responses.sqlite3")
+
+def cache_key(model, prompt, options=None):
+    material = json.dumps({"model": model, "prompt": prompt, "options": options or {}}, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    # Content-addressed LLM response store in SQLite, keyed on a hash of model,
+    # prompt and generation options. Entries expire after ttl seconds and the
+    # least recently used ones are evicted once the total exceeds max_bytes.
+
+    def __init__(self, path=RESPONSE_CACHE_PATH, ttl=RESPONSE_CACHE_TTL, max_bytes=RESPONSE_CACHE_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @property
+    def _db(self):
+        # Opened on first use so importing a module that owns a cache touches no files
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, model TEXT, response TEXT,"
+                " size INTEGER, created_at REAL, accessed_at REAL);"
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);"
+            )
+        return self._conn
+
+    def get(self, model, prompt, options=None):
+        key = cache_key(model, prompt, options)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                self.stats["expired"] += 1
+                row = None
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.stats["hits"] += 1
+            return row[0]
+
+    def put(self, model, prompt, response, options=None):
+        if not response:
+            return
+        key = cache_key(model, prompt, options)
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.stats["evicted"] += 1
+
+    def cached_stream(self, model, prompt, stream, options=None):
+        # Yields the cached response in one piece on a hit; otherwise yields from
+        # stream() and stores the joined response only if stream() ran to its end.
+        # stream() must raise when the generation did not finish (OllamaClient.stream
+        # does); a consumer that stops early (GUI Cancel) closes this generator at a
+        # yield, so nothing is stored then either.
+        cached = self.get(model, prompt, options)
+        if cached is not None:
+            yield cached
+            return
+        fragments = []
+        for fragment in stream():
+            fragments.append(fragment)
+            yield fragment
+        self.put(model, prompt, "".join(fragments), options)
+
+    def hit_rate(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,125 @@
+import contextvars
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from mcpnews.mcpnews import build_prompt, call_ollama_phi, response_cache, ollama_client
+from mcpnews.promptbudget import strip_html, truncate_tokens, estimate_tokens, PER_SOURCE_TOKENS
+from mcpnews.outletparser import BIAS_LEVELS
+
+# Map-reduce analysis: one single-article prompt per outlet, run in parallel,
+# then merged into the {"summary", "articles"} schema of the multi-article
+# prompt, so wall-clock time is bounded by the slowest outlet instead of one
+# huge serial generation.
+
+MAP_CONCURRENCY = 4
+BIAS_INSTRUCTION = (
+    "\n\nEnd your answer with a single line of the form 'Bias level: <level>' where <level> "
+    "is one of Neutral, Slightly Negative, Extreme Bias (Distraction)."
+)
+BIAS_PATTERN = re.compile(
+    r"bias level\W*(" + "|".join(re.escape(level) for level in BIAS_LEVELS) + ")", re.IGNORECASE
+)
+
+def lead_articles(all_articles, per_source_tokens=PER_SOURCE_TOKENS):
+    # One article per outlet (the first matched, i.e. the feed's top story), cleaned and truncated
+    leads = {}
+    for article in all_articles:
+        if article['source'] not in leads:
+            summary = truncate_tokens(strip_html(article['summary']), per_source_tokens)
+            leads[article['source']] = dict(article, title=strip_html(article['title']), summary=summary)
+    return list(leads.values())
+
+def build_outlet_prompt(topic, article):
+    return build_prompt({"topic": topic, "articles": [article]}) + BIAS_INSTRUCTION
+
+def parse_bias_level(analysis):
+    match = BIAS_PATTERN.search(analysis)
+    if not match:
+        return "None"
+    return next(level for level in BIAS_LEVELS if level.lower() == match.group(1).lower())
+
+def map_outlets(topic, articles, model="gemma3:latest", concurrency=MAP_CONCURRENCY, client=None,
+                cache=response_cache):
+    # Returns [(article, analysis, seconds)] in the order of `articles`; analysis is ""
+    # for outlets whose call failed. Calls go through `client` (the shared one by
+    # default), whose max_concurrency caps Ollama requests in flight across all its
+    # callers, e.g. every batch worker; a wider `concurrency` is capped to it.
+    client = client or ollama_client
+    concurrency = max(1, min(concurrency, client.max_concurrency))
+
+    def analyze(article):
+        start = time.perf_counter()
+        analysis = call_ollama_phi(build_outlet_prompt(topic, article), model=model, client=client, cache=cache)
+        return article, analysis, time.perf_counter() - start
+
+    # One copy of the caller's context per call, so each outlet's llm span nests under the request
+    contexts = [contextvars.copy_context() for _ in articles]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(lambda context, article: context.run(analyze, article), contexts, articles))
+
+def merge_analyses(mapped):
+    # Outlets whose call failed are left out rather than recorded with no analysis
+    outlets = []
+    failed = 0
+    for article, analysis, _ in mapped:
+        if not analysis.strip():
+            failed += 1
+            continue
+        outlets.append({
+            "newsoutlet": article['source'],
+            "newsanalysis": BIAS_PATTERN.split(analysis)[0].strip().rstrip("'\"").strip(),
+            "country_of_origin": article['country'],
+            "bias_level": parse_bias_level(analysis),
+        })
+    counts = {level: sum(o["bias_level"] == level for o in outlets) for level in BIAS_LEVELS + ["None"]}
+    summary = f"{len(outlets)} outlets analysed: " + ", ".join(
+        f"{count} {level}" for level, count in counts.items() if count
+    ) + "."
+    if failed:
+        summary += f" {failed} could not be analysed."
+    return {"summary": summary, "articles": outlets}
+
+def build_reduce_prompt(topic, merged):
+    lines = [f"- {o['newsoutlet']} [{o['bias_level']}]: {truncate_tokens(o['newsanalysis'], 80)}"
+             for o in merged["articles"]]
+    return (
+        f"Here are short analyses of how different news outlets covered '{topic}':\n\n"
+        + "\n".join(lines)
+        + "\n\nWrite one short paragraph summarizing the overall fairness and any noticeable bias across these outlets."
+    )
+
+def run_mapreduce(topic, all_articles, model="gemma3:latest", concurrency=MAP_CONCURRENCY, reduce="merge",
+                  client=None, cache=response_cache):
+    # Same result shape as get_mcp_analysis, plus timings; outlet_analysis is empty
+    # when every map call failed. reduce="merge" builds the summary
+    # deterministically; reduce="llm" asks for it in one small extra call.
+    timings = {}
+    articles = lead_articles(all_articles)
+    start = time.perf_counter()
+    mapped = map_outlets(topic, articles, model=model, concurrency=concurrency, client=client, cache=cache)
+    timings["map"] = time.perf_counter() - start
+    timings["outlets"] = {article['source']: seconds for article, _, seconds in mapped}
+
+    merged = merge_analyses(mapped)
+    prompts = [build_outlet_prompt(topic, article) for article in articles]
+    if reduce == "llm" and merged["articles"]:
+        reduce_prompt = build_reduce_prompt(topic, merged)
+        start = time.perf_counter()
+        summary = call_ollama_phi(reduce_prompt, model=model, client=client, cache=cache)
+        timings["reduce"] = time.perf_counter() - start
+        if summary:
+            merged["summary"] = summary.strip()
+        prompts.append(reduce_prompt)
+    prompt = "\n\n---\n\n".join(prompts)
+    return {
+        "prompt": prompt,
+        "response": "```json\n" + json.dumps(merged, indent=2) + "\n```",
+        "articles": all_articles,
+        "summary": merged["summary"],
+        "outlet_analysis": merged["articles"],
+        "prompt_stats": {"input_articles": len(all_articles), "articles": len(articles),
+                         "prompt_chars": len(prompt), "prompt_tokens": estimate_tokens(prompt)},
+        "timings": timings
+    }
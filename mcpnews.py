@@ -1,6 +1,18 @@
-import feedparser
 import re
-import requests
+import time
+
+# requests and feedparser are imported where they are first needed (see feedfetch),
+# so the CLI prompt and the GUI window appear before the feed and LLM stacks load
+from mcpnews.feedfetch import fetch_feed, fetch_feeds, iter_feeds, FEED_TIMEOUT, FETCH_DEADLINE, MAX_FETCH_WORKERS
+from mcpnews.feedcache import FeedCache
+from mcpnews.topicindex import TopicIndex, entry_fields
+from mcpnews.ollamaclient import OllamaClient
+from mcpnews.llmcache import ResponseCache
+from mcpnews.promptbudget import budget_articles, estimate_tokens, PER_SOURCE_TOKENS, TOTAL_TOKENS
+from mcpnews.outletparser import OutletStream, parse_analysis
+from mcpnews.telemetry import tracer, maybe_profiled
+from mcpnews.history import AnalysisStore
+from mcpnews.feedpoller import FeedPoller
 
 RSS_FEEDS = {
     "RT": {
@@ -69,29 +81,120 @@ RSS_FEEDS = {
     }
 }
 
-def fetch_articles(feed_url, topic, max_articles=3):
-    feed = feedparser.parse(feed_url)
+# Shared across topics so repeated analyses reuse parsed feeds; pass cache=None to bypass
+feed_cache = FeedCache()
+# Token index over the entries of every refreshed feed, so topic lookups skip the entry scan
+topic_index = TopicIndex()
+# Pooled keep-alive connection to Ollama shared by every analysis in the process
+ollama_client = OllamaClient()
+# Responses keyed on model + prompt, so re-running an analysis skips the LLM; pass cache=None to bypass
+response_cache = ResponseCache()
+# Every completed analysis with its parsed outlets, for bias trends and reuse; pass history=None to skip
+analysis_store = AnalysisStore()
+# Background poller keeping topic_index warm; idle until feed_poller.start(). While it is
+# running and warm, analyses read the index instead of sweeping the feeds.
+feed_poller = FeedPoller({source: info['url'] for source, info in RSS_FEEDS.items()}, cache=feed_cache)
+feed_poller.subscribe(lambda source, new_entries, entries: topic_index.update_feed(source, entries))
+
+def match_articles(entries, topic, max_articles=3):
     articles = []
     topic_pattern = re.compile(re.escape(topic), re.IGNORECASE)
-    for entry in feed.entries:
-        # print(feed)
-        summary = getattr(entry, 'summary', '') or getattr(entry, 'description', '')
-        if topic_pattern.search(entry.title) or topic_pattern.search(summary):
-            articles.append({
-                "title": entry.title,
-                "summary": summary,
-                "link": entry.link
-            })
+    for entry in entries:
+        article = entry_fields(entry)
+        if topic_pattern.search(article['title']) or topic_pattern.search(article['summary']):
+            articles.append(article)
         if len(articles) >= max_articles:
             break
     return articles
 
-def build_mcp_context(topic, all_articles):
+def fetch_articles(feed_url, topic, max_articles=3, timeout=FEED_TIMEOUT, cache=feed_cache):
+    import requests
+
+    fetch = cache.fetch if cache else fetch_feed
+    try:
+        feed = fetch(feed_url, timeout=timeout)
+    except requests.RequestException as e:
+        print(f"Error fetching {feed_url}:", e)
+        return []
+    return match_articles(feed.entries, topic, max_articles)
+
+def refresh_feeds(feeds=RSS_FEEDS, timeout=FEED_TIMEOUT, deadline=FETCH_DEADLINE,
+                  max_workers=MAX_FETCH_WORKERS, cache=feed_cache, index=topic_index, verbose=True):
+    # Fetch every outlet concurrently and fold the entries into the index.
+    # Outlets that fail or miss the deadline are skipped; returns the refreshed sources.
+    with tracer.span("sweep") as span:
+        parsed, errors = fetch_feeds({source: info['url'] for source, info in feeds.items()},
+                                     timeout=timeout, deadline=deadline, max_workers=max_workers,
+                                     fetch=cache.fetch if cache else fetch_feed)
+        span.count("feeds", len(feeds))
+        span.count("errors", len(errors))
+        if verbose:
+            for source, error in errors.items():
+                print(f"Skipping {source}: {error}")
+        for source, feed in parsed.items():
+            index.update_feed(source, feed.entries)
+            span.count("entries", len(feed.entries))
+    return [source for source in feeds if source in parsed]
+
+def find_articles(topic, sources, feeds=RSS_FEEDS, max_articles=3, index=topic_index, match_mode="index",
+                  verbose=True):
+    # match_mode="substring" restores the original case-insensitive substring matching
+    with tracer.span("match") as span:
+        matches = index.search(topic, max_articles=max_articles, sources=set(sources), mode=match_mode)
+        span.count("articles", sum(len(articles) for articles in matches.values()))
+    all_articles = []
+    for source, info in feeds.items():
+        for article in matches.get(source, []):
+            article['source'] = source
+            article['country'] = info['country']
+            all_articles.append(article)
+            if verbose:
+                print(f"Found {len(all_articles)} articles from {source} on topic '{topic}'")
+    return all_articles
+
+def indexed_sources(feeds=RSS_FEEDS, timeout=FEED_TIMEOUT, deadline=FETCH_DEADLINE,
+                    max_workers=MAX_FETCH_WORKERS, cache=feed_cache, index=topic_index, poller=feed_poller,
+                    verbose=True):
+    # Sources of `feeds` whose entries are in `index`, in feeds order. `poller` must
+    # publish into `index`; the outlets it has polled data for are not swept, the
+    # rest (all of them while it is cold or absent) are.
+    warm = set((poller.warm_sources(feeds) if poller else None) or ())
+    missing = {source: info for source, info in feeds.items() if source not in warm}
+    swept = set(refresh_feeds(missing, timeout=timeout, deadline=deadline, max_workers=max_workers,
+                              cache=cache, index=index, verbose=verbose) if missing else ())
+    return [source for source in feeds if source in warm or source in swept]
+
+def fetch_all_articles(topic, feeds=RSS_FEEDS, max_articles=3, timeout=FEED_TIMEOUT,
+                       deadline=FETCH_DEADLINE, max_workers=MAX_FETCH_WORKERS, cache=feed_cache,
+                       index=topic_index, match_mode="index", poller=feed_poller):
+    sources = indexed_sources(feeds, timeout=timeout, deadline=deadline, max_workers=max_workers,
+                              cache=cache, index=index, poller=poller)
+    return find_articles(topic, sources, feeds=feeds, max_articles=max_articles, index=index,
+                         match_mode=match_mode)
+
+def build_mcp_context(topic, all_articles, per_source_tokens=PER_SOURCE_TOKENS, total_tokens=TOTAL_TOKENS):
+    # Summaries are cleaned, deduplicated and truncated to the token budgets before prompting
+    articles, stats = budget_articles(all_articles, per_source_tokens=per_source_tokens,
+                                      total_tokens=total_tokens)
     return {
         "topic": topic,
-        "articles": all_articles
+        "articles": articles,
+        "prompt_stats": stats
     }
 
+def prepare_prompt(topic, all_articles):
+    # (context, prompt) for the single-prompt analysis, timed as the "prompt" stage
+    with tracer.span("prompt") as span:
+        context = build_mcp_context(topic, all_articles)
+        prompt = build_prompt(context)
+        span.count("articles", len(context["articles"]))
+        span.count("chars", len(prompt))
+        span.count("tokens", estimate_tokens(prompt))
+    return context, prompt
+
+def prompt_stats(context, prompt):
+    return dict(context.get("prompt_stats", {}), prompt_chars=len(prompt), prompt_tokens=estimate_tokens(prompt))
+
 def build_prompt(context):
     articles = context['articles']
     topic = context['topic']
@@ -137,43 +240,197 @@ def build_prompt(context):
        
     return prompt
 
-def call_ollama_phi(prompt, model="gemma3:latest"):
-    url = "http://localhost:11434/api/generate"
-    payload = {
-        "model": model,
-        "prompt": prompt,
-        "stream": False
-    }
-    response = requests.post(url, json=payload)
-    if response.status_code == 200:
-        result = response.json()
-        return result.get("response", "")
-    else:
-        print("Error communicating with Ollama:", response.text)
+def call_ollama_phi(prompt, model="gemma3:latest", client=None, cache=response_cache):
+    import requests
+
+    client = client or ollama_client
+    if cache:
+        cached = cache.get(model, prompt)
+        if cached is not None:
+            return cached
+    try:
+        response = client.generate(prompt, model)
+    except requests.HTTPError as e:
+        print("Error communicating with Ollama:", e.response.text if e.response is not None else e)
         return ""
+    if cache:
+        cache.put(model, prompt, response)
+    return response
 
-def get_mcp_analysis(topic, model="gemma3:latest"):
-    all_articles = []
-    for source, info in RSS_FEEDS.items():
-        articles = fetch_articles(info['url'], topic)
-        for article in articles:
-            article['source'] = source
-            article['country'] = info['country']
-            all_articles.append(article)
-            print(f"Found {len(all_articles)} articles from {source} on topic '{topic}'")
+def generate_stream(prompt, model, client=None, cache=response_cache, cancel=None):
+    client = client or ollama_client
+    if not cache:
+        return client.stream(prompt, model, cancel=cancel)
+    return cache.cached_stream(model, prompt, lambda: client.stream(prompt, model, cancel=cancel))
+
+def get_mcp_analysis(topic, model="gemma3:latest", feeds=RSS_FEEDS, mode="single", history=analysis_store,
+                     max_age=None, profile=None, map_concurrency=None):
+    # mode="mapreduce" analyzes each outlet in its own parallel LLM call (see mapreduce.py),
+    # map_concurrency at a time (default mapreduce.MAP_CONCURRENCY, capped at the shared
+    # client's max_concurrency). With max_age (seconds), a stored analysis of the topic
+    # that recent is returned without touching the feeds or the LLM. profile="cpu", "memory" or "cpu,memory"
+    # profiles this request (default: the MCPNEWS_PROFILE environment variable).
+    with maybe_profiled("analysis", profile), tracer.span("analysis", mode=mode):
+        return run_analysis(topic, model, feeds, mode, history, max_age, map_concurrency)
+
+def run_analysis(topic, model, feeds, mode, history, max_age, map_concurrency=None):
+    if history and max_age is not None:
+        stored = history.latest(topic, max_age=max_age, model=model)
+        if stored is not None:
+            return stored, None
+
+    all_articles = fetch_all_articles(topic, feeds=feeds)
 
     if not all_articles:
         return None, f"No articles found for topic: {topic}"
 
-    context = build_mcp_context(topic, all_articles)
-    prompt = build_prompt(context)
-    print(prompt)
+    if mode == "mapreduce":
+        from mcpnews.mapreduce import run_mapreduce, MAP_CONCURRENCY
+        result = run_mapreduce(topic, all_articles, model=model, concurrency=map_concurrency or MAP_CONCURRENCY)
+        # As with an empty single-mode response, a run where every outlet failed is not stored
+        if history and result["outlet_analysis"]:
+            history.record(topic, result, model=model, mode=mode)
+        return result, None
+
+    context, prompt = prepare_prompt(topic, all_articles)
+    stats = prompt_stats(context, prompt)
+    print(f"Prompt: {stats['articles']} of {stats['input_articles']} articles "
+          f"({stats['duplicates']} duplicates), ~{stats['prompt_tokens']} tokens")
     response = call_ollama_phi(prompt, model=model)
-    return {
+    with tracer.span("parse_response") as span:
+        parsed = parse_analysis(response)
+        span.count("outlets", len(parsed["articles"]))
+    result = {
         "prompt": prompt,
         "response": response,
-        "articles": all_articles
-    }, None
+        "articles": all_articles,
+        "summary": parsed["summary"],
+        "outlet_analysis": parsed["articles"],
+        "prompt_stats": stats
+    }
+    if history and response:
+        history.record(topic, result, model=model, mode=mode)
+    return result, None
+
+def iter_mcp_analysis(topic, model="gemma3:latest", feeds=RSS_FEEDS, cancel=None, cache=feed_cache,
+                      index=topic_index, client=None, llm_cache=response_cache, history=analysis_store,
+                      max_age=None, poller=feed_poller):
+    # Progressive get_mcp_analysis. Yields (kind, payload) events:
+    #   ("articles", (source, articles))  as each outlet's feed arrives
+    #   ("skipped", (source, error))      for outlets that failed or missed the deadline
+    #   ("prompt", prompt)                once all outlets are in
+    #   ("token", fragment)               as the LLM generates
+    #   ("outlet", outlet)                as each element of the response's articles array completes
+    #   ("done", result) or ("error", message) last
+    # Setting the `cancel` threading.Event stops the sweep and the generation at once,
+    # also while a feed or the model's prefill is still pending, and releases the
+    # client's concurrency slot; no further events are yielded after that. With max_age, a
+    # recent stored analysis is replayed as the same events instead.
+    def cancelled():
+        return cancel is not None and cancel.is_set()
+
+    stored = history.latest(topic, max_age=max_age, model=model) if history and max_age is not None else None
+    if stored is not None:
+        yield from replay_analysis(stored, feeds)
+        return
+
+    # A generator cannot hold an active span across yields, so the request span is started, not activated
+    span = tracer.start("analysis", mode="stream")
+    started = time.perf_counter()
+    try:
+        yield from stream_analysis(topic, model, feeds, cancel, cache, index, client, llm_cache, history,
+                                   poller)
+    finally:
+        tracer.finish(span, started, "cancelled" if cancelled() else None)
+
+def stream_analysis(topic, model, feeds, cancel, cache, index, client, llm_cache, history, poller):
+    # `cancel` goes down to the feed sweep and the Ollama stream, so a cancel
+    # during a slow fetch or the prompt prefill ends them instead of waiting
+    import requests
+
+    def cancelled():
+        return cancel is not None and cancel.is_set()
+
+    by_source = {}
+    # Outlets a warm poller has already put in the index are read from it; the
+    # rest (all of them without a warm poller) are swept as in indexed_sources
+    warm = set((poller.warm_sources(feeds) if poller else None) or ())
+    for source in feeds:
+        if source in warm:
+            by_source[source] = find_articles(topic, [source], feeds=feeds, index=index, verbose=False)
+            yield "articles", (source, by_source[source])
+    sweep = iter_feeds({source: info['url'] for source, info in feeds.items() if source not in warm},
+                       fetch=cache.fetch if cache else fetch_feed, cancel=cancel)
+    try:
+        for source, feed, error in sweep:
+            if cancelled():
+                return
+            if error is not None:
+                yield "skipped", (source, error)
+                continue
+            index.update_feed(source, feed.entries)
+            by_source[source] = find_articles(topic, [source], feeds=feeds, index=index, verbose=False)
+            yield "articles", (source, by_source[source])
+    finally:
+        sweep.close()
+    if cancelled():
+        return
+
+    all_articles = [article for source in feeds for article in by_source.get(source, [])]
+    if not all_articles:
+        yield "error", f"No articles found for topic: {topic}"
+        return
+    context, prompt = prepare_prompt(topic, all_articles)
+    yield "prompt", prompt
+
+    fragments = []
+    outlets = OutletStream()
+    parse_seconds = 0.0
+    stream = generate_stream(prompt, model, client=client, cache=llm_cache, cancel=cancel)
+    try:
+        for fragment in stream:
+            if cancelled():
+                return
+            fragments.append(fragment)
+            yield "token", fragment
+            parse_start = time.perf_counter()
+            completed = outlets.feed(fragment)
+            parse_seconds += time.perf_counter() - parse_start
+            for outlet in completed:
+                yield "outlet", outlet
+    except requests.RequestException as e:
+        if not cancelled():
+            yield "error", f"Error communicating with Ollama: {e}"
+        return
+    finally:
+        stream.close()
+    parse_start = time.perf_counter()
+    parsed = outlets.close()
+    tracer.record("parse_response", parse_seconds + time.perf_counter() - parse_start,
+                  outlets=len(parsed["articles"]))
+    result = {
+        "prompt": prompt,
+        "response": "".join(fragments),
+        "articles": all_articles,
+        "summary": parsed["summary"],
+        "outlet_analysis": parsed["articles"],
+        "prompt_stats": prompt_stats(context, prompt)
+    }
+    if history and result["response"]:
+        history.record(topic, result, model=model)
+    yield "done", result
+
+def replay_analysis(stored, feeds=RSS_FEEDS):
+    # iter_mcp_analysis events for an analysis loaded from the history store
+    for source in feeds:
+        articles = [article for article in stored["articles"] if article["source"] == source]
+        if articles:
+            yield "articles", (source, articles)
+    yield "prompt", stored["prompt"]
+    yield "token", stored["response"]
+    for outlet in stored["outlet_analysis"]:
+        yield "outlet", outlet
+    yield "done", stored
 
 # Example usage as a script
 if __name__ == "__main__":
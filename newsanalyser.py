@@ -1,111 +1,62 @@
 import tkinter as tk
 from tkinter import scrolledtext, messagebox, ttk
 import threading
-import json
-import re
-
-from mcpnews.mcpnews import get_mcp_analysis
-
-import matplotlib.pyplot as plt
-from mpl_toolkits.basemap import Basemap
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-# Map bias to color (expand as needed)
-BIAS_COLOR = {
-    "Neutral": "green",
-    "Slightly Negative": "orange",
-    "Extreme Bias (Distraction)": "red",
-    "None": "gray"
-}
-
-# Map country names to (lat, lon) for plotting
-COUNTRY_COORDS = {
-    "France": (46.603354, 1.888334),
-    "United States": (37.09024, -95.712891),
-    "USA": (37.09024, -95.712891),
-    "Japan": (36.204824, 138.252924),
-    "China": (35.86166, 104.195397),
-    "India": (20.593684, 78.96288),
-    "United Kingdom": (55.378051, -3.435973),
-    "Germany": (51.165691, 10.451526),
-    "Australia": (-25.274398, 133.775136),
-    "Russia": (61.52401, 105.318756)
-}
-
-def get_country_from_newsoutlet(newsoutlet):
-    # Extract country from "Outlet Name (Country)"
-    match = re.search(r"\(([^)]+)\)", newsoutlet)
-    if match:
-        return match.group(1)
-    return newsoutlet  # fallback
-
-def plot_map(outlet_analysis):
-    fig = plt.figure(figsize=(8, 5))
-    m = Basemap(projection='robin', lon_0=0, resolution='c')
-    m.drawcoastlines()
-    m.drawcountries()
-    m.fillcontinents(color='lightgray', lake_color='aqua')
-    m.drawmapboundary(fill_color='aqua')
-
-    plotted_countries = set()
-    for entry in outlet_analysis:
-        country = get_country_from_newsoutlet(entry.get("country_of_origin", ""))
-        print("country is " +country)
-        bias = entry.get("bias_level", "None")
-        color = BIAS_COLOR.get(bias, "black")
-        coords = COUNTRY_COORDS.get(country)
-        if coords and country not in plotted_countries:
-            x, y = m(coords[1], coords[0])
-            m.plot(x, y, 'o', markersize=15, color=color, label=bias)
-            plt.text(x, y, country, fontsize=9, ha='center', va='center', color='white', weight='bold')
-            plotted_countries.add(country)
-
-    # Custom legend
-    handles = [plt.Line2D([0], [0], marker='o', color='w', label=label, markerfacecolor=color, markersize=10)
-               for label, color in BIAS_COLOR.items()]
-    plt.legend(handles=handles, loc='lower left', title="Bias Level")
-    plt.title("Fairness/Bias of News Coverage by Country")
-    return fig
+import queue
+
+from mcpnews.outletparser import parse_analysis
+
+# Only Tk and the response parser load before the window appears. The feed and
+# LLM pipeline is imported by the first analysis (load_pipeline) and matplotlib
+# with the map by the first Show Map.
 
 def extract_outlet_analysis(llm_response):
-    # Try to extract the JSON block from the LLM response
-    try:
-        # If the response is a JSON string, parse it directly
-        if isinstance(llm_response, dict):
-            return llm_response.get("outlet_analysis", [])
-        # If the response is a string, try to find the JSON part
-        code_block = re.search(r"```json(.*?)```", llm_response, re.DOTALL)
-        if code_block:
-            json_str = code_block.group(1).strip()
-        else:
-            start = llm_response.find('{')
-            end = llm_response.rfind('}') + 1
-            if start == -1 or end == -1:
-                return []
-            json_str = llm_response[start:end]
-        data = json.loads(json_str)
-        return data.get("articles", [])
-    except Exception as e:
-        print("Error parsing outlet_analysis:", e)
-    return []
+    # Outlets from a complete LLM response; the schema is validated and common
+    # JSON slips repaired by outletparser, so a malformed element drops only itself
+    if isinstance(llm_response, dict):
+        return llm_response.get("outlet_analysis", [])
+    return parse_analysis(llm_response)["articles"]
 
 def show_map():
+    # While a response is still streaming the map shows the outlets parsed so far
     llm_response = last_llm_response[0]
-    print(llm_response)
-    if not llm_response:
+    if not llm_response and not outlet_rows:
         messagebox.showinfo("No Data", "Please analyze a topic first.")
         return
-    outlet_analysis = extract_outlet_analysis(llm_response)
+    outlet_analysis = extract_outlet_analysis(llm_response) if llm_response else list(outlet_rows)
     if not outlet_analysis:
         messagebox.showinfo("No Data", "No outlet_analysis found in LLM response.")
         return
-    fig = plot_map(outlet_analysis)
-    # Show in a new Tkinter window
-    map_window = tk.Toplevel(root)
-    map_window.title("News Fairness Map")
-    canvas = FigureCanvasTkAgg(fig, master=map_window)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    # One map window is reused; the background is drawn once and later calls only move markers
+    if map_view[0] is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from mcpnews.biasmap import BiasMap
+
+        map_window = tk.Toplevel(root)
+        map_window.title("News Fairness Map")
+        fig = Figure(figsize=(8, 5))
+        canvas = FigureCanvasTkAgg(fig, master=map_window)
+        bias_map = BiasMap(fig)
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        map_window.protocol("WM_DELETE_WINDOW", close_map)
+        map_view[0] = (map_window, bias_map)
+        bias_map.update(outlet_analysis)
+        canvas.draw()
+    else:
+        map_window, bias_map = map_view[0]
+        map_window.deiconify()
+        map_window.lift()
+        bias_map.update(outlet_analysis)
+
+def close_map():
+    map_window, _ = map_view[0]
+    map_view[0] = None
+    map_window.destroy()
+
+def refresh_map():
+    # Keeps an open map in step with the outlets parsed so far
+    if map_view[0] is not None:
+        map_view[0][1].update(outlet_rows)
 
 def analyze_topic():
     topic = topic_entry.get().strip()
@@ -113,28 +64,133 @@ def analyze_topic():
         messagebox.showwarning("Input Error", "Please enter a topic.")
         return
     analyze_button.config(state=tk.DISABLED)
+    cancel_button.config(state=tk.NORMAL)
     result_text.delete(1.0, tk.END)
-    result_text.insert(tk.END, "Analyzing, please wait...\n")
+    result_text.insert(tk.END, "Analyzing, please wait...\n\n=== Articles ===\n")
+    last_llm_response[0] = None
+    outlet_rows.clear()
+    outlet_table.delete(*outlet_table.get_children())
+    refresh_map()
+
+    # The worker only talks to the GUI through the queue; poll_events applies updates
+    cancel = threading.Event()
+    current_run[0] = cancel
 
     def worker():
-        result, error = get_mcp_analysis(topic)
-        def update_gui():
-            analyze_button.config(state=tk.NORMAL)
-            result_text.delete(1.0, tk.END)
-            if error:
-                result_text.insert(tk.END, error)
-                last_llm_response[0] = None
-            else:
-                result_text.insert(tk.END, "=== Prompt for LLM ===\n")
-                result_text.insert(tk.END, result["prompt"] + "\n\n")
-                result_text.insert(tk.END, "=== LLM Response ===\n")
-                result_text.insert(tk.END, result["response"])
-                last_llm_response[0] = result["response"]
-        root.after(0, update_gui)
+        try:
+            iter_mcp_analysis = load_pipeline()
+            from mcpnews.telemetry import maybe_profiled
+            # MCPNEWS_PROFILE=cpu and/or memory profiles each analysis run from the GUI
+            with maybe_profiled("gui-analysis"):
+                for kind, payload in iter_mcp_analysis(topic, cancel=cancel):
+                    events.put((cancel, kind, payload))
+        except Exception as e:
+            events.put((cancel, "error", f"Analysis failed: {e}"))
+        finally:
+            events.put((cancel, "finished", None))
     threading.Thread(target=worker, daemon=True).start()
 
+def load_pipeline():
+    # Imports the pipeline on the first analysis's worker thread and starts the
+    # background poller there, so later analyses read its warm index
+    from mcpnews.mcpnews import iter_mcp_analysis, feed_poller
+    with pipeline_lock:
+        if feed_updates[0] is None:
+            feed_updates[0], _ = feed_poller.subscribe_queue()
+            feed_poller.start()
+    return iter_mcp_analysis
+
+def cancel_analysis():
+    cancel = current_run[0]
+    if cancel is None:
+        return
+    cancel.set()
+    current_run[0] = None
+    analyze_button.config(state=tk.NORMAL)
+    cancel_button.config(state=tk.DISABLED)
+    result_text.insert(tk.END, "\n\n[Analysis cancelled]\n")
+
+def add_outlet(outlet):
+    outlet_rows.append(outlet)
+    outlet_table.insert("", tk.END, values=(outlet["newsoutlet"], outlet["country_of_origin"], outlet["bias_level"]))
+
+def handle_event(kind, payload):
+    if kind == "articles":
+        source, articles = payload
+        for article in articles:
+            result_text.insert(tk.END, f"[{source}] {article['title']}\n")
+    elif kind == "skipped":
+        source, error = payload
+        result_text.insert(tk.END, f"[{source}] skipped: {error}\n")
+    elif kind == "prompt":
+        result_text.insert(tk.END, "\n=== Prompt for LLM ===\n")
+        result_text.insert(tk.END, payload + "\n\n")
+        result_text.insert(tk.END, "=== LLM Response ===\n")
+    elif kind == "token":
+        result_text.insert(tk.END, payload)
+    elif kind == "outlet":
+        add_outlet(payload)
+        refresh_map()
+    elif kind == "error":
+        result_text.insert(tk.END, "\n" + payload + "\n")
+    elif kind == "done":
+        last_llm_response[0] = payload["response"]
+        # Outlets only recovered by the final lenient parse of the whole response
+        for outlet in payload["outlet_analysis"][len(outlet_rows):]:
+            add_outlet(outlet)
+        refresh_map()
+    elif kind == "finished":
+        current_run[0] = None
+        analyze_button.config(state=tk.NORMAL)
+        cancel_button.config(state=tk.DISABLED)
+        return
+    result_text.see(tk.END)
+
+def poll_events():
+    try:
+        while True:
+            cancel, kind, payload = events.get_nowait()
+            # Events from a cancelled or superseded run are dropped
+            if cancel is current_run[0]:
+                handle_event(kind, payload)
+    except queue.Empty:
+        pass
+    poll_feed_updates()
+    root.after(POLL_INTERVAL_MS, poll_events)
+
+def poll_feed_updates():
+    # New entries pushed by the background poller; analyses read its warm index
+    if feed_updates[0] is None:
+        return
+    from mcpnews.mcpnews import feed_poller
+    updates = 0
+    try:
+        while True:
+            _, new_entries, _ = feed_updates[0].get_nowait()
+            updates += len(new_entries)
+    except queue.Empty:
+        pass
+    if updates:
+        new_entry_count[0] += updates
+        status = feed_poller.status()
+        warm = sum(1 for feed in status.values() if feed["ok"])
+        feed_status.config(text=f"Feeds: {warm}/{len(status)} polled, {new_entry_count[0]} entries since launch")
+
 # Store last LLM response for map visualization
 last_llm_response = [None]
+# Outlets of the current analysis in table order, filled in as the response streams
+outlet_rows = []
+# (Toplevel, BiasMap) of the open map window, if any
+map_view = [None]
+# Cancel event of the analysis in flight, and the queue its worker reports through
+current_run = [None]
+events = queue.Queue()
+POLL_INTERVAL_MS = 50
+# Entries published by the background poller, drained by poll_feed_updates; None until
+# the first analysis has loaded the pipeline and started the poller
+feed_updates = [None]
+pipeline_lock = threading.Lock()
+new_entry_count = [0]
 
 root = tk.Tk()
 root.title("Media Coverage Perspective Analyzer")
@@ -144,11 +200,23 @@ topic_entry = tk.Entry(root, width=50)
 topic_entry.pack(pady=5)
 analyze_button = tk.Button(root, text="Analyze", command=analyze_topic)
 analyze_button.pack(pady=5)
+cancel_button = tk.Button(root, text="Cancel", command=cancel_analysis, state=tk.DISABLED)
+cancel_button.pack(pady=5)
 
 result_text = scrolledtext.ScrolledText(root, width=100, height=30, wrap=tk.WORD)
 result_text.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
 
+outlet_table = ttk.Treeview(root, columns=("outlet", "country", "bias"), show="headings", height=8)
+for column, heading, width in (("outlet", "News outlet", 300), ("country", "Country", 150), ("bias", "Bias level", 200)):
+    outlet_table.heading(column, text=heading)
+    outlet_table.column(column, width=width)
+outlet_table.pack(padx=10, pady=(0, 10), fill=tk.X)
+
 show_map_button = tk.Button(root, text="Show Map", command=show_map)
 show_map_button.pack(pady=5)
 
+feed_status = tk.Label(root, text="Feeds: polled in the background after the first analysis", anchor="w")
+feed_status.pack(padx=10, pady=(0, 5), fill=tk.X)
+
+root.after(POLL_INTERVAL_MS, poll_events)
 root.mainloop()
@@ -0,0 +1,195 @@
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from mcpnews.telemetry import tracer
+
+OLLAMA_URL = "http://localhost:11434"
+# (connect, read) seconds; the read timeout bounds the gap between streamed chunks
+OLLAMA_TIMEOUT = (3.05, 300)
+OLLAMA_RETRIES = 2
+OLLAMA_BACKOFF = 0.5
+# Generations allowed in flight at once across all threads using a client
+OLLAMA_CONCURRENCY = 4
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Seconds between checks of a stream's cancel event while no chunk arrives
+CANCEL_POLL = 0.05
+
+def record_ollama_timings(data):
+    # Ollama reports prefill (prompt_eval_*) and generation (eval_*) in nanoseconds
+    if data.get("prompt_eval_duration") is not None:
+        tracer.record("llm_prefill", data["prompt_eval_duration"] / 1e9, tokens=data.get("prompt_eval_count", 0))
+    if data.get("eval_duration") is not None:
+        tracer.record("llm_generate", data["eval_duration"] / 1e9, tokens=data.get("eval_count", 0))
+
+class OllamaClient:
+    # Keep-alive connection pool to Ollama's /api/generate with timeouts,
+    # retries with exponential backoff and a cap on concurrent generations.
+
+    def __init__(self, base_url=OLLAMA_URL, timeout=OLLAMA_TIMEOUT, retries=OLLAMA_RETRIES,
+                 backoff=OLLAMA_BACKOFF, max_concurrency=OLLAMA_CONCURRENCY):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_concurrency = max_concurrency
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    @property
+    def session(self):
+        # Created on first request so importing a module that owns a client does not import requests
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def _post(self, payload, stream, cancel=None):
+        # Retries connection errors, timeouts and retryable statuses before any
+        # output has been consumed; raises requests.HTTPError on other failures.
+        import requests
+
+        url = f"{self.base_url}/api/generate"
+        for attempt in range(self.retries + 1):
+            if cancel is not None and cancel.is_set():
+                raise requests.ConnectionError("Ollama stream cancelled")
+            try:
+                response = self.session.post(url, json=payload, stream=stream, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    response.raise_for_status()
+                    return response
+                response.close()
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+            time.sleep(self.backoff * (2 ** attempt))
+
+    def generate(self, prompt, model, options=None):
+        payload = {"model": model, "prompt": prompt, "stream": False}
+        if options:
+            payload["options"] = options
+        with self._slots, tracer.span("llm", model=model, stream=False) as span:
+            span.count("prompt_chars", len(prompt))
+            response = self._post(payload, stream=False)
+            span.count("bytes", len(response.content))
+            data = response.json()
+            record_ollama_timings(data)
+            return data.get("response", "")
+
+    def _lines(self, payload, cancel=None):
+        # NDJSON lines of a streamed request. With a cancel event the request runs
+        # in a reader thread, so setting it during connect or prefill (when no line
+        # arrives for a long time) returns here at once, freeing the caller's slot;
+        # the reader closes the response as soon as it has one.
+        import requests
+
+        if cancel is None:
+            with self._post(payload, stream=True) as response:
+                yield from response.iter_lines()
+            return
+        lines = queue.Queue()
+        stop = threading.Event()
+
+        def read():
+            try:
+                with self._post(payload, stream=True, cancel=stop) as response:
+                    for line in response.iter_lines():
+                        if stop.is_set():
+                            return
+                        lines.put((line, None))
+                lines.put((None, None))
+            except BaseException as e:
+                lines.put((None, e))
+
+        threading.Thread(target=read, daemon=True).start()
+        try:
+            while True:
+                try:
+                    line, error = lines.get(timeout=CANCEL_POLL)
+                except queue.Empty:
+                    if cancel.is_set():
+                        raise requests.ConnectionError("Ollama stream cancelled")
+                    continue
+                if error is not None:
+                    raise error
+                if line is None:
+                    return
+                yield line
+        finally:
+            stop.set()
+
+    def stream(self, prompt, model, options=None, cancel=None):
+        # Yields response fragments as Ollama's NDJSON chunks arrive. Raises
+        # requests.ConnectionError if the stream ends without Ollama's "done"
+        # chunk, so a truncated generation never looks like a complete one, or
+        # when the `cancel` threading.Event is set before it is done.
+        payload = {"model": model, "prompt": prompt, "stream": True}
+        if options:
+            payload["options"] = options
+        # Spans are started, not activated: the caller's code runs between our yields.
+        # Prefill is the wait for the first fragment, generation the rest of the stream.
+        import requests
+
+        span = tracer.start("llm", model=model, stream=True)
+        span.count("prompt_chars", len(prompt))
+        started = time.perf_counter()
+        first_at = None
+        error = None
+        fragments = 0
+        try:
+            with self._slots:
+                lines = self._lines(payload, cancel)
+                try:
+                    for line in lines:
+                        if not line:
+                            continue
+                        span.count("bytes", len(line))
+                        chunk = json.loads(line)
+                        if chunk.get("error"):
+                            raise requests.HTTPError(chunk["error"])
+                        if chunk.get("response"):
+                            if first_at is None:
+                                first_at = time.perf_counter()
+                                tracer.record("llm_prefill", first_at - started)
+                            fragments += 1
+                            yield chunk["response"]
+                        if chunk.get("done"):
+                            if first_at is not None:
+                                tracer.record("llm_generate", time.perf_counter() - first_at,
+                                              tokens=chunk.get("eval_count", fragments))
+                            break
+                    else:
+                        raise requests.ConnectionError("Ollama stream ended before the response was done")
+                finally:
+                    lines.close()
+        except GeneratorExit:
+            error = "cancelled"
+            raise
+        except BaseException as e:
+            error = "cancelled" if cancel is not None and cancel.is_set() else e.__class__.__name__
+            raise
+        finally:
+            span.count("fragments", fragments)
+            tracer.finish(span, started, error)
+
+    def generate_many(self, prompts, model, options=None):
+        # Runs the prompts in parallel (bounded by max_concurrency); results keep prompt order
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return list(executor.map(lambda prompt: self.generate(prompt, model, options), prompts))
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
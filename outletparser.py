@@ -0,0 +1,294 @@
+import json
+import re
+
+# Tolerant parser for the {"summary", "articles": [...]} schema the multi-article
+# prompt asks for. OutletStream scans the response as it streams and returns each
+# outlet as soon as its object in the articles array closes, so the GUI can fill
+# in outlets without waiting for the full generation. Elements are parsed
+# leniently (fences, trailing commas, single quotes, Python literals, unquoted
+# keys, truncation) and normalized to the schema; invalid ones are dropped.
+
+BIAS_LEVELS = ["Neutral", "Slightly Negative", "Extreme Bias (Distraction)"]
+ARTICLE_KEYS = ("articles", "outlet_analysis", "outlets")
+FIELD_ALIASES = {
+    "newsoutlet": "newsoutlet", "news_outlet": "newsoutlet", "outlet": "newsoutlet", "source": "newsoutlet",
+    "newsanalysis": "newsanalysis", "news_analysis": "newsanalysis", "analysis": "newsanalysis",
+    "country_of_origin": "country_of_origin", "country": "country_of_origin",
+    "bias_level": "bias_level", "bias": "bias_level",
+}
+LITERALS = {"True": "true", "False": "false", "None": "null", "true": "true", "false": "false", "null": "null"}
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+IDENTIFIER = re.compile(r"[A-Za-z_][\w-]*")
+
+def opens_string(text, i):
+    # A quote at text[i] can only open a string where a key or value may start;
+    # anywhere else (e.g. "the outlet's view" in a bracketed aside) it is an apostrophe
+    j = i - 1
+    while j >= 0 and text[j].isspace():
+        j -= 1
+    return j < 0 or text[j] in "{[,:"
+
+def closes_single_quote(text, i, final=True):
+    # A single quote at text[i] ends the string only when a , : } ] or the end of
+    # the text follows; otherwise it is an apostrophe inside it. With final=False
+    # (more text may arrive) an undecided quote at the end returns None.
+    j = i + 1
+    while j < len(text) and text[j].isspace():
+        j += 1
+    if j == len(text):
+        return True if final else None
+    return text[j] in ",:}]"
+
+def repair_json(text):
+    # Rewrites common LLM slips into valid JSON: single-quoted strings, unquoted
+    # keys, Python literals, trailing commas, and brackets or strings left open
+    # by a truncated response
+    out = []
+    stack = []
+    quote = None
+    i = 0
+    text = text.translate(SMART_QUOTES)
+    while i < len(text):
+        char = text[i]
+        if quote:
+            if char == "\\" and i + 1 < len(text):
+                # \' is valid in a single-quoted string but not in JSON
+                out.append("'" if text[i + 1] == "'" else text[i:i + 2])
+                i += 2
+                continue
+            if char == quote and (quote == '"' or closes_single_quote(text, i)):
+                out.append('"')
+                quote = None
+            elif char == '"':
+                out.append('\\"')
+            else:
+                out.append(char)
+        elif char == '"' or (char == "'" and opens_string(text, i)):
+            out.append('"')
+            quote = char
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+            out.append(char)
+        elif char in "}]":
+            _strip_trailing_comma(out)
+            if stack:
+                out.append(stack.pop())
+        elif char.isalpha() or char == "_":
+            word = IDENTIFIER.match(text, i).group()
+            rest = text[i + len(word):].lstrip()
+            if rest.startswith(":") and (not stack or stack[-1] == "}"):
+                out.append(json.dumps(word))
+            else:
+                out.append(LITERALS.get(word, word))
+            i += len(word)
+            continue
+        else:
+            out.append(char)
+        i += 1
+    # Close whatever a truncated response left open
+    if quote:
+        out.append('"')
+    if out and out[-1].rstrip().endswith(":"):
+        out.append("null")
+    for closer in reversed(stack):
+        _strip_trailing_comma(out)
+        out.append(closer)
+    return "".join(out)
+
+def _strip_trailing_comma(out):
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+def loads_lenient(text):
+    try:
+        return json.loads(text, strict=False)
+    except ValueError:
+        return json.loads(repair_json(text), strict=False)
+
+def loads_prefix(text, attempts=3):
+    # Lenient parse of a truncated object, dropping trailing members that were
+    # cut off mid-key until what remains parses; None if nothing does
+    for _ in range(attempts):
+        try:
+            return loads_lenient(text)
+        except ValueError:
+            cut = text.rfind(",")
+            if cut == -1:
+                return None
+            text = text[:cut]
+    return None
+
+def normalize_bias(value):
+    value = str(value or "").strip()
+    for level in BIAS_LEVELS:
+        if value.lower() == level.lower():
+            return level
+    lowered = value.lower()
+    if "extreme" in lowered:
+        return "Extreme Bias (Distraction)"
+    if "slight" in lowered or "negative" in lowered:
+        return "Slightly Negative"
+    if "neutral" in lowered:
+        return "Neutral"
+    return "None"
+
+def normalize_article(item):
+    # One outlet in the prompt's schema, or None if it has no outlet name
+    if not isinstance(item, dict):
+        return None
+    article = {}
+    for key, value in item.items():
+        field = FIELD_ALIASES.get(re.sub(r"[\s-]+", "_", str(key).strip().lower()))
+        if field and field not in article:
+            article[field] = "" if value is None else str(value).strip()
+    if not article.get("newsoutlet"):
+        return None
+    article.setdefault("newsanalysis", "")
+    article.setdefault("country_of_origin", "")
+    article["bias_level"] = normalize_bias(article.get("bias_level"))
+    return article
+
+class OutletStream:
+    # feed() response fragments in order; each call returns the outlets completed
+    # by that fragment. close() returns {"summary", "articles"} for the whole
+    # response, falling back to a lenient parse of everything if streaming found
+    # no articles array (e.g. an unusual layout).
+
+    def __init__(self):
+        self.summary = ""
+        self.articles = []
+        self._text = ""
+        self._pos = 0
+        self._started = False
+        self._stack = []        # open containers: "{" or "["
+        self._keys = []         # current key per open object (None for arrays)
+        self._expect_value = []
+        self._quote = None
+        self._escape = False
+        self._string_start = None
+        self._articles_depth = None
+        self._element_start = None
+
+    def feed(self, fragment):
+        self._text += fragment
+        found = len(self.articles)
+        text = self._text
+        while self._pos < len(text):
+            i = self._pos
+            char = text[i]
+            self._pos += 1
+            if not self._started:
+                # Skip prose and ```json fences up to the first container
+                if char in "{[":
+                    self._started = True
+                    self._open(char, i)
+                continue
+            if self._quote:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == self._quote:
+                    closes = char == '"' or closes_single_quote(text, i, final=False)
+                    if closes is None:
+                        # Whether this ends the string depends on text not yet received
+                        self._pos = i
+                        break
+                    if closes:
+                        self._string_done(text[self._string_start:i], self._quote)
+                        self._quote = None
+                continue
+            if char == '"' or (char == "'" and opens_string(text, i)):
+                self._quote = char
+                self._string_start = i + 1
+            elif char in "{[":
+                self._open(char, i)
+            elif char in "}]":
+                article = self._close(i)
+                if article is not None:
+                    self.articles.append(article)
+            elif char == ":" and self._stack:
+                self._expect_value[-1] = True
+            elif char == "," and self._stack:
+                self._expect_value[-1] = False
+        return self.articles[found:]
+
+    def _open(self, char, i):
+        depth = len(self._stack)
+        if char == "[" and self._articles_depth is None and (
+                depth == 0 or (depth == 1 and self._keys[0] in ARTICLE_KEYS)):
+            # Either {"articles": [...]} or a bare top-level array of outlets
+            self._articles_depth = depth + 1
+        elif char == "{" and depth == self._articles_depth and self._stack[-1] == "[":
+            self._element_start = i
+        self._stack.append(char)
+        self._keys.append(None)
+        self._expect_value.append(False)
+
+    def _close(self, i):
+        if not self._stack:
+            return None
+        self._stack.pop()
+        self._keys.pop()
+        self._expect_value.pop()
+        depth = len(self._stack)
+        if self._articles_depth is not None and depth == self._articles_depth and self._element_start is not None:
+            start, self._element_start = self._element_start, None
+            try:
+                return normalize_article(loads_lenient(self._text[start:i + 1]))
+            except ValueError:
+                return None
+        if self._articles_depth is not None and depth < self._articles_depth:
+            self._articles_depth = -1  # array finished; later arrays are not outlets
+        if depth == 0 and not self.articles:
+            # A bracketed aside in the prose rather than the answer; rescan for the next container
+            self._started = False
+            self._articles_depth = None
+        return None
+
+    def _string_done(self, raw, quote):
+        if not self._stack or self._stack[-1] != "{":
+            return
+        if not self._expect_value[-1]:
+            self._keys[-1] = raw.strip().lower()
+        elif len(self._stack) == 1 and self._keys[-1] == "summary":
+            try:
+                self.summary = loads_lenient(quote + raw + quote)
+            except ValueError:
+                self.summary = raw
+
+    def close(self):
+        if self._element_start is not None:
+            # Response cut off inside an outlet: keep it if what arrived is enough
+            article = normalize_article(loads_prefix(self._text[self._element_start:]))
+            self._element_start = None
+            if article is not None:
+                self.articles.append(article)
+        if not self.articles:
+            data = self._parse_whole()
+            if isinstance(data, dict):
+                self.summary = self.summary or str(data.get("summary") or "")
+                items = next((data[key] for key in ARTICLE_KEYS if isinstance(data.get(key), list)), [])
+            else:
+                items = data if isinstance(data, list) else []
+            self.articles = [a for a in map(normalize_article, items) if a is not None]
+        return {"summary": self.summary, "articles": self.articles}
+
+    def _parse_whole(self):
+        fenced = re.search(r"```(?:json)?(.*?)(```|$)", self._text, re.DOTALL)
+        body = fenced.group(1) if fenced else self._text
+        # The first bracket may belong to prose before the answer; try the next ones too
+        for match in list(re.finditer(r"[{\[]", body))[:20]:
+            try:
+                return loads_lenient(body[match.start():])
+            except ValueError:
+                continue
+        return None
+
+def parse_analysis(response):
+    # {"summary", "articles"} from a complete response string
+    stream = OutletStream()
+    stream.feed(response)
+    return stream.close()
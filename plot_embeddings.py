@@ -1,71 +1,93 @@
-import torch
+import argparse
+
 import matplotlib.pyplot as plt
-from transformers import AutoTokenizer, AutoModelForCausalLM
-from sklearn.decomposition import PCA
+from transformers import AutoTokenizer
 from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
 
-# Load model and tokenizer
+from mcpnews.rendering import use_headless, decimate, save_figure, MAX_POINTS
+from mcpnews.rope import load_embedding_matrix
+from mcpnews.projection import project_rope_embeddings, project_subsample
+
 model_name = "microsoft/phi-1_5"
-tokenizer = AutoTokenizer.from_pretrained(model_name)
-model = AutoModelForCausalLM.from_pretrained(model_name)
+positions_to_simulate = [0, 1, 2, 3, 4]
+highlight_words = ["Ginny", "Dumbledore", "Harry", "Hermione", "Snape"]
 
-# Token embeddings
-token_embeddings = model.base_model.embed_tokens.weight.detach().cpu()  # shape: [vocab_size, hidden_dim]
-vocab_size, hidden_dim = token_embeddings.shape
-head_dim = hidden_dim // 2  # RoPE applies to even dims in pairs
+def load_token_embeddings(model_name=model_name):
+    # The tokenizer is small; the embedding matrix comes from the .npy cache so
+    # only the first run loads the full model. shape: [vocab_size, hidden_dim]
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    token_embeddings = load_embedding_matrix(model_name)
+    return tokenizer, token_embeddings
 
-# Simulate RoPE effect: apply rotation for positions 0 to 4
-def apply_rope(embeddings, position):
-    dim = embeddings.shape[-1]
-    half_dim = dim // 2
-    theta = 10000 ** (-torch.arange(0, half_dim, dtype=torch.float32) / half_dim)
-    angle = position * theta
-    cos = torch.cos(angle)
-    sin = torch.sin(angle)
-    emb_even, emb_odd = embeddings[:, 0::2], embeddings[:, 1::2]
-    emb_rotated_even = emb_even * cos - emb_odd * sin
-    emb_rotated_odd = emb_even * sin + emb_odd * cos
-    rotated = torch.empty_like(embeddings)
-    rotated[:, 0::2] = emb_rotated_even
-    rotated[:, 1::2] = emb_rotated_odd
-    return rotated
+def project_embeddings(token_embeddings, positions=positions_to_simulate, method="pca", keep=()):
+    # Simulate RoPE and project the [num_positions * vocab_size, hidden_dim] stack to 3D.
+    # PCA streams chunks so the stack is never held in memory. t-SNE/UMAP only lay out
+    # a subsample that always contains `keep`. Returns (rows, coords); rows is None
+    # when every row of the stack was projected.
+    if method in ("pca", "incremental"):
+        coords, _ = project_rope_embeddings(token_embeddings, positions,
+                                            method="covariance" if method == "pca" else "incremental")
+        return None, coords
+    return project_subsample(token_embeddings, positions, keep=keep, method=method)
 
-# Combine embeddings across positions (simulate RoPE)
-augmented_embeddings = []
-positions_to_simulate = [0, 1, 2, 3, 4]
-for pos in positions_to_simulate:
-    rope_emb = apply_rope(token_embeddings, pos)
-    augmented_embeddings.append(rope_emb)
+def find_highlights(tokenizer, vocab_size, words=highlight_words, positions=positions_to_simulate):
+    # (row in the stacked embeddings, label) for every subtoken of the highlighted words
+    highlights = []
+    for word in words:
+        tokens = tokenizer.tokenize(word)
+        token_ids = tokenizer.convert_tokens_to_ids(tokens)
+        for pos_idx, pos in enumerate(positions):
+            for subtoken, token_id in zip(tokens, token_ids):
+                if token_id != tokenizer.unk_token_id:
+                    highlights.append((pos_idx * vocab_size + token_id, f"{subtoken}@{pos}"))
+    return highlights
 
-# Stack them: shape → [num_positions * vocab_size, hidden_dim]
-stacked_embeddings = torch.cat(augmented_embeddings, dim=0)
+def plot_embeddings_3d(embeddings_3d, highlights, max_points=MAX_POINTS, method="grid", projection="PCA"):
+    # Only a decimated level of detail of the cloud is drawn; highlighted points are always kept
+    highlight_rows = [index for index, _ in highlights]
+    shown = decimate(embeddings_3d, max_points=max_points, keep=highlight_rows, method=method)
+    fig = plt.figure(figsize=(14, 10))
+    ax = fig.add_subplot(111, projection='3d')
+    ax.scatter(embeddings_3d[shown, 0], embeddings_3d[shown, 1], embeddings_3d[shown, 2], s=1, alpha=0.2)
 
-# PCA to 3D
-pca = PCA(n_components=3)
-embeddings_3d = pca.fit_transform(stacked_embeddings.numpy())
+    # Highlight tokens
+    for index, label in highlights:
+        x, y, z = embeddings_3d[index]
+        ax.scatter(x, y, z, color='red', s=40)
+        ax.text(x, y, z, label, fontsize=9, color='black')
 
-# Plot
-fig = plt.figure(figsize=(14, 10))
-ax = fig.add_subplot(111, projection='3d')
-ax.scatter(embeddings_3d[:, 0], embeddings_3d[:, 1], embeddings_3d[:, 2], s=1, alpha=0.2)
+    ax.set_title(f"Token Embeddings + Simulated RoPE (3D {projection}, {len(shown)} of {len(embeddings_3d)} points)")
+    ax.set_xlabel(f"{projection} 1")
+    ax.set_ylabel(f"{projection} 2")
+    ax.set_zlabel(f"{projection} 3")
+    fig.tight_layout()
+    return fig
 
-# Highlight tokens
-highlight_words = ["Ginny", "Dumbledore", "Harry", "Hermione", "Snape"]
-for word in highlight_words:
-    tokens = tokenizer.tokenize(word)
-    token_ids = tokenizer.convert_tokens_to_ids(tokens)
-    for pos_idx, pos in enumerate(positions_to_simulate):
-        for subtoken, token_id in zip(tokens, token_ids):
-            index = pos_idx * vocab_size + token_id
-            if token_id != tokenizer.unk_token_id:
-                x, y, z = embeddings_3d[index]
-                ax.scatter(x, y, z, color='red', s=40)
-                ax.text(x, y, z, f"{subtoken}@{pos}", fontsize=9, color='black')
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plot token embeddings with simulated RoPE")
+    parser.add_argument("--output", help="write a PNG instead of opening a window")
+    parser.add_argument("--positions", type=int, default=len(positions_to_simulate))
+    parser.add_argument("--projection", choices=["pca", "incremental", "tsne", "umap"], default="pca")
+    parser.add_argument("--max-points", type=int, default=MAX_POINTS)
+    parser.add_argument("--decimate", choices=["grid", "random"], default="grid")
+    args = parser.parse_args()
+    if args.output:
+        use_headless(force=True)
 
-ax.set_title("Token Embeddings + Simulated RoPE (3D PCA)")
-ax.set_xlabel("PCA 1")
-ax.set_ylabel("PCA 2")
-ax.set_zlabel("PCA 3")
-plt.tight_layout()
-plt.show()
+    positions = list(range(args.positions))
+    tokenizer, token_embeddings = load_token_embeddings()
+    vocab_size, hidden_dim = token_embeddings.shape
+    highlights = find_highlights(tokenizer, vocab_size, positions=positions)
+    rows, embeddings_3d = project_embeddings(token_embeddings, positions, args.projection,
+                                             keep=[index for index, _ in highlights])
+    if rows is not None:
+        # Highlight indices refer to the full stack; map them into the subsample
+        highlights = [(int(np.searchsorted(rows, index)), label) for index, label in highlights]
+    label = {"pca": "PCA", "incremental": "PCA", "tsne": "t-SNE", "umap": "UMAP"}[args.projection]
+    fig = plot_embeddings_3d(embeddings_3d, highlights, max_points=args.max_points, method=args.decimate,
+                             projection=label)
+    if args.output:
+        save_figure(fig, args.output)
+    else:
+        plt.show()
@@ -0,0 +1,124 @@
+import numpy as np
+
+from mcpnews.rope import apply_rope_positions, ROPE_BASE
+
+# Out-of-core 3D projection of stacked RoPE embeddings. Rows are streamed in
+# chunks, either computed on the fly from the cached [vocab, hidden] matrix or
+# read from a memory-mapped stacked .npy, so memory stays bounded by the chunk
+# size and hidden_dim no matter how many positions are simulated.
+
+CHUNK_ROWS = 8192
+SUBSAMPLE = 20000
+
+def iter_rope_chunks(embeddings, positions, chunk_rows=CHUNK_ROWS, base=ROPE_BASE):
+    # Yields (start_row, chunk) of the position-major stack [num_positions * vocab, hidden]
+    # without materializing it
+    vocab_size = embeddings.shape[0]
+    for pos_idx, position in enumerate(positions):
+        for start in range(0, vocab_size, chunk_rows):
+            block = np.asarray(embeddings[start:start + chunk_rows], dtype=np.float32)
+            yield pos_idx * vocab_size + start, apply_rope_positions(block, [position], base=base)[0]
+
+def iter_row_chunks(matrix, chunk_rows=CHUNK_ROWS):
+    for start in range(0, matrix.shape[0], chunk_rows):
+        yield start, np.asarray(matrix[start:start + chunk_rows], dtype=np.float32)
+
+class StreamingPCA:
+    # PCA fitted chunk by chunk. method="covariance" accumulates the mean and the
+    # hidden x hidden scatter matrix in one pass and solves it exactly (NumPy only);
+    # method="incremental" uses sklearn's IncrementalPCA.partial_fit per chunk.
+
+    def __init__(self, n_components=3, method="covariance"):
+        self.n_components = n_components
+        self.method = method
+        self.mean_ = None
+        self.components_ = None
+        self.explained_variance_ratio_ = None
+        self._sklearn = None
+
+    def fit(self, chunks):
+        # chunks: iterable of (start_row, array) as produced by iter_rope_chunks / iter_row_chunks
+        if self.method == "incremental":
+            from sklearn.decomposition import IncrementalPCA
+            self._sklearn = IncrementalPCA(n_components=self.n_components)
+            for _, chunk in chunks:
+                if len(chunk) >= self.n_components:
+                    self._sklearn.partial_fit(chunk)
+            self.mean_ = self._sklearn.mean_
+            self.components_ = self._sklearn.components_
+            self.explained_variance_ratio_ = self._sklearn.explained_variance_ratio_
+            return self
+
+        count = 0
+        total = None
+        scatter = None
+        for _, chunk in chunks:
+            chunk = chunk.astype(np.float64)
+            if total is None:
+                total = np.zeros(chunk.shape[1])
+                scatter = np.zeros((chunk.shape[1], chunk.shape[1]))
+            count += len(chunk)
+            total += chunk.sum(axis=0)
+            scatter += chunk.T @ chunk
+        self.mean_ = total / count
+        covariance = (scatter - count * np.outer(self.mean_, self.mean_)) / max(count - 1, 1)
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        order = np.argsort(eigenvalues)[::-1][:self.n_components]
+        components = eigenvectors[:, order].T
+        # Same sign convention as sklearn: largest-magnitude loading positive
+        signs = np.sign(components[np.arange(len(components)), np.argmax(np.abs(components), axis=1)])
+        self.components_ = components * signs[:, np.newaxis]
+        self.explained_variance_ratio_ = eigenvalues[order] / eigenvalues.sum()
+        return self
+
+    def transform(self, chunks, total_rows, out=None):
+        # Projects every chunk into `out` (allocated as [total_rows, n_components] if not given)
+        if out is None:
+            out = np.empty((total_rows, self.n_components), dtype=np.float32)
+        mean = self.mean_.astype(np.float32)
+        components = self.components_.astype(np.float32)
+        for start, chunk in chunks:
+            out[start:start + len(chunk)] = (chunk - mean) @ components.T
+        return out
+
+def project_rope_embeddings(embeddings, positions, n_components=3, method="covariance", chunk_rows=CHUNK_ROWS):
+    # Two streaming passes (fit, transform) over the RoPE stack of a cached embedding matrix
+    pca = StreamingPCA(n_components, method).fit(iter_rope_chunks(embeddings, positions, chunk_rows))
+    total_rows = len(positions) * embeddings.shape[0]
+    return pca.transform(iter_rope_chunks(embeddings, positions, chunk_rows), total_rows), pca
+
+def gather_rope_rows(embeddings, positions, rows, base=ROPE_BASE):
+    # Rows of the stacked matrix by index, computed only for those rows
+    rows = np.asarray(rows)
+    vocab_size = embeddings.shape[0]
+    out = np.empty((len(rows), embeddings.shape[1]), dtype=np.float32)
+    for pos_idx, position in enumerate(positions):
+        mask = rows // vocab_size == pos_idx
+        if mask.any():
+            block = np.asarray(embeddings[rows[mask] % vocab_size], dtype=np.float32)
+            out[mask] = apply_rope_positions(block, [position], base=base)[0]
+    return out
+
+def embed_subsample(data, n_components=3, method="tsne", seed=0, **kwargs):
+    # Nonlinear layouts only scale to a subsample; data is [rows, features].
+    # t-SNE needs scikit-learn, UMAP needs the optional umap-learn package.
+    if method == "tsne":
+        from sklearn.manifold import TSNE
+        return TSNE(n_components=n_components, init="pca", random_state=seed, **kwargs).fit_transform(data)
+    if method == "umap":
+        try:
+            import umap
+        except ImportError as e:
+            raise ImportError("method='umap' requires the umap-learn package") from e
+        return umap.UMAP(n_components=n_components, random_state=seed, **kwargs).fit_transform(data)
+    raise ValueError(f"Unknown embedding method: {method}")
+
+def project_subsample(embeddings, positions, keep=(), size=SUBSAMPLE, n_components=3, method="tsne", seed=0, **kwargs):
+    # Returns (rows, coords): a random subsample of the stack (always including
+    # `keep`, e.g. highlighted tokens) laid out with t-SNE or UMAP
+    total_rows = len(positions) * embeddings.shape[0]
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(total_rows, size=min(size, total_rows), replace=False)
+    rows = np.union1d(sample, np.asarray(keep, dtype=np.int64))
+    coords = embed_subsample(gather_rope_rows(embeddings, positions, rows), n_components, method, seed, **kwargs)
+    return rows, coords
@@ -0,0 +1,106 @@
+import html
+import re
+from collections import defaultdict
+
+# Approximate token budgets for the article section of the prompt
+PER_SOURCE_TOKENS = 300
+TOTAL_TOKENS = 3000
+# Word-shingle Jaccard similarity above which two stories count as the same wire copy
+DUPLICATE_THRESHOLD = 0.6
+SHINGLE_SIZE = 4
+
+TAG_PATTERN = re.compile(r"<[^>]+>")
+SPACE_PATTERN = re.compile(r"\s+")
+WORD_PATTERN = re.compile(r"\w+")
+
+def strip_html(text):
+    text = TAG_PATTERN.sub(" ", text or "")
+    return SPACE_PATTERN.sub(" ", html.unescape(text)).strip()
+
+def estimate_tokens(text):
+    # No tokenizer for the served model is available here; ~4 characters per token
+    return (len(text) + 3) // 4
+
+def truncate_tokens(text, max_tokens):
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    cut = text[:max(0, max_tokens * 4 - 1)]
+    if " " in cut:
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip(" ,;:") + "…"
+
+def shingles(text, size=SHINGLE_SIZE):
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def article_tokens(article):
+    return estimate_tokens(
+        f"Source: {article['source']} ({article['country']})\nTitle: {article['title']}\n"
+        f"Summary: {article['summary']}\nLink: {article['link']}\n\n"
+    )
+
+def budget_articles(articles, per_source_tokens=PER_SOURCE_TOKENS, total_tokens=TOTAL_TOKENS,
+                    duplicate_threshold=DUPLICATE_THRESHOLD):
+    # Returns (articles, stats). Summaries are stripped of HTML; near-duplicate
+    # stories within one outlet are dropped, and across outlets the later copy
+    # keeps its title but points at the earlier one instead of repeating the
+    # summary, so every outlet stays represented. Articles are then admitted
+    # round-robin across outlets (first story of each outlet first), with
+    # summaries truncated to the outlet's share of per_source_tokens, until
+    # total_tokens is used up.
+    stats = {"input_articles": len(articles), "duplicates": 0, "truncated": 0, "dropped": 0}
+    seen = []
+    by_source = defaultdict(list)
+    for article in articles:
+        article = dict(article, title=strip_html(article['title']), summary=strip_html(article['summary']))
+        article_shingles = shingles(article['title'] + " " + article['summary'])
+        duplicate_of = None
+        for other_source, other_shingles in seen:
+            if jaccard(article_shingles, other_shingles) >= duplicate_threshold:
+                duplicate_of = other_source
+                break
+        if duplicate_of is not None:
+            stats["duplicates"] += 1
+            if duplicate_of == article['source']:
+                continue
+            article['summary'] = f"(Same story as the {duplicate_of} article.)"
+        else:
+            seen.append((article['source'], article_shingles))
+        by_source[article['source']].append(article)
+
+    for source_articles in by_source.values():
+        share = per_source_tokens // len(source_articles)
+        for article in source_articles:
+            overhead = article_tokens(dict(article, summary=""))
+            summary = truncate_tokens(article['summary'], max(0, share - overhead))
+            if summary != article['summary']:
+                stats["truncated"] += 1
+                article['summary'] = summary
+
+    kept = []
+    used = 0
+    rounds = max((len(a) for a in by_source.values()), default=0)
+    for i in range(rounds):
+        for source_articles in by_source.values():
+            if i >= len(source_articles):
+                continue
+            cost = article_tokens(source_articles[i])
+            if used + cost > total_tokens:
+                stats["dropped"] += 1
+                continue
+            used += cost
+            kept.append(source_articles[i])
+
+    # Back to the caller's outlet order for the prompt
+    order = {id(article): n for n, article in enumerate(a for group in by_source.values() for a in group)}
+    kept.sort(key=lambda article: order[id(article)])
+    stats["articles"] = len(kept)
+    stats["article_tokens"] = used
+    return kept, stats
@@ -0,0 +1,153 @@
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from mcpnews.retrieval import TOP_K
+
+# Asyncio serving layer for the issue retriever. Concurrent queries are
+# collected into micro-batches (up to max_batch, waiting at most `window`
+# seconds after the first one), embedded and scored against the issue matrix
+# in one matrix multiply, and then handed to the LLM with bounded concurrency.
+# Run from the parent directory: python -m mcpnews.ragserver < queries.txt
+
+BATCH_WINDOW = 0.005
+MAX_BATCH = 64
+LLM_CONCURRENCY = 4
+METRICS_WINDOW = 10000
+
+def percentile_ms(samples, q):
+    return float(np.percentile(np.asarray(samples), q) * 1000) if samples else 0.0
+
+class MicroBatchServer:
+    def __init__(self, store, answer=None, k=TOP_K, window=BATCH_WINDOW, max_batch=MAX_BATCH,
+                 llm_concurrency=LLM_CONCURRENCY):
+        # answer(query, candidates) -> str is called in a worker thread; None skips the LLM stage
+        self.store = store
+        self.answer = answer
+        self.k = k
+        self.window = window
+        self.max_batch = max_batch
+        self.llm_concurrency = llm_concurrency
+        self._queue = None
+        self._worker = None
+        self._llm_slots = None
+        # Requests taken off the queue whose retrieval has not been resolved yet
+        self._batch = []
+        self._latencies = deque(maxlen=METRICS_WINDOW)
+        self._retrieval_latencies = deque(maxlen=METRICS_WINDOW)
+        self._batch_sizes = deque(maxlen=METRICS_WINDOW)
+        self._requests = 0
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._llm_slots = asyncio.Semaphore(self.llm_concurrency)
+        self._worker = asyncio.create_task(self._batch_loop())
+
+    async def stop(self):
+        # Requests still queued or mid-batch fail with RuntimeError instead of waiting forever
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        pending, self._batch = self._batch, []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, retrieved, _ in pending:
+            if not retrieved.done():
+                retrieved.set_exception(RuntimeError("MicroBatchServer stopped"))
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def submit(self, query):
+        # Returns {"query", "candidates": [(issue, score)], "answer"}
+        if self._worker is None:
+            raise RuntimeError("MicroBatchServer is not running")
+        start = time.perf_counter()
+        retrieved = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, retrieved, start))
+        candidates = await retrieved
+        self._retrieval_latencies.append(time.perf_counter() - start)
+        answer = None
+        if self.answer is not None:
+            async with self._llm_slots:
+                answer = await asyncio.to_thread(self.answer, query, [issue for issue, _ in candidates])
+        self._latencies.append(time.perf_counter() - start)
+        self._requests += 1
+        return {"query": query, "candidates": candidates, "answer": answer}
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = self._batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self._batch_sizes.append(len(batch))
+            queries = [query for query, _, _ in batch]
+            try:
+                # Embedding and scoring run off the event loop so new queries keep queueing
+                results = await asyncio.to_thread(self.store.search_many, queries, self.k)
+            except Exception as e:
+                for _, retrieved, _ in batch:
+                    if not retrieved.done():
+                        retrieved.set_exception(e)
+                continue
+            for (_, retrieved, _), candidates in zip(batch, results):
+                if not retrieved.done():
+                    retrieved.set_result(candidates)
+            self._batch = []
+
+    def metrics(self):
+        sizes = list(self._batch_sizes)
+        return {
+            "requests": self._requests,
+            "batches": len(sizes),
+            "batch_size_mean": float(np.mean(sizes)) if sizes else 0.0,
+            "batch_size_max": max(sizes, default=0),
+            "retrieval_p50_ms": percentile_ms(self._retrieval_latencies, 50),
+            "retrieval_p99_ms": percentile_ms(self._retrieval_latencies, 99),
+            "p50_ms": percentile_ms(self._latencies, 50),
+            "p99_ms": percentile_ms(self._latencies, 99),
+        }
+
+async def serve_queries(store, queries, answer=None, **kwargs):
+    async with MicroBatchServer(store, answer=answer, **kwargs) as server:
+        results = await asyncio.gather(*(server.submit(query) for query in queries))
+        return results, server.metrics()
+
+def main():
+    from mcpnews.training_phi_rag import ollama, past_issues, load_issue_store, build_prompt, ask_llm
+    from mcpnews.retrieval import ollama_embedder
+
+    queries = [line.strip() for line in sys.stdin if line.strip()]
+    if not queries:
+        print("No queries given. Exiting.", file=sys.stderr)
+        return
+    store = load_issue_store(past_issues, ollama_embedder(ollama))
+    results, metrics = asyncio.run(serve_queries(
+        store, queries, answer=lambda query, candidates: ask_llm(build_prompt(query, candidates))
+    ))
+    for result in results:
+        print(json.dumps(result))
+    print(json.dumps(metrics), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
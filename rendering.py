@@ -0,0 +1,73 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Headless rendering helpers shared by the trajectory and embedding plots:
+# Agg backend selection, level-of-detail decimation of large point clouds and
+# batch PNG export in a process pool.
+
+MAX_POINTS = 20000
+GRID_BINS = 64
+DPI = 100
+
+def use_headless(force=False):
+    # Switch matplotlib to Agg when forced, when MPLBACKEND/HEADLESS asks for it,
+    # or when there is no display to open a window on. Returns True if headless.
+    import matplotlib
+    headless = force or bool(os.environ.get("HEADLESS")) or (
+        os.name != "nt" and not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY")
+    )
+    if headless:
+        matplotlib.use("Agg", force=True)
+    return headless
+
+def decimate(points, max_points=MAX_POINTS, keep=None, method="grid", bins=GRID_BINS, seed=0):
+    # Indices of at most max_points rows of `points` (plus every index in `keep`,
+    # which is always retained, e.g. highlighted tokens). method="grid" keeps one
+    # point per occupied cell of a bins^d grid first, so sparse regions and
+    # outliers survive; method="random" is a uniform subsample.
+    points = np.asarray(points)
+    n = len(points)
+    keep = np.unique(np.asarray(keep if keep is not None else [], dtype=np.intp))
+    if n <= max_points:
+        return np.arange(n)
+    rng = np.random.default_rng(seed)
+    if method == "grid":
+        low = points.min(axis=0)
+        span = np.where(points.max(axis=0) > low, points.max(axis=0) - low, 1)
+        cells = np.minimum(((points - low) / span * bins).astype(np.int64), bins - 1)
+        cell_ids = np.ravel_multi_index(cells.T, (bins,) * points.shape[1])
+        # Shuffle first so the representative of each cell is a random member
+        order = rng.permutation(n)
+        _, first = np.unique(cell_ids[order], return_index=True)
+        chosen = order[first]
+        if len(chosen) > max_points:
+            chosen = rng.choice(chosen, size=max_points, replace=False)
+        elif len(chosen) < max_points:
+            rest = np.setdiff1d(np.arange(n), chosen, assume_unique=True)
+            chosen = np.concatenate([chosen, rng.choice(rest, size=max_points - len(chosen), replace=False)])
+    else:
+        chosen = rng.choice(n, size=max_points, replace=False)
+    return np.union1d(chosen, keep)
+
+def save_figure(fig, path, dpi=DPI):
+    import matplotlib.pyplot as plt
+    fig.savefig(path, dpi=dpi)
+    plt.close(fig)
+    return path
+
+def _render_job(job):
+    func, kwargs, path, dpi = job
+    use_headless(force=True)
+    return save_figure(func(**kwargs), path, dpi)
+
+def export_figures(jobs, processes=None, dpi=DPI):
+    # jobs: iterable of (figure_function, kwargs, png_path); figure_function must be
+    # a module-level function returning a Figure so it can be sent to a worker.
+    # Returns the written paths in job order.
+    jobs = [(func, kwargs, path, dpi) for func, kwargs, path in jobs]
+    if processes == 1:
+        return [_render_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(_render_job, jobs))
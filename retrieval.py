@@ -0,0 +1,209 @@
+import json
+import os
+import re
+import shutil
+import zlib
+
+import numpy as np
+
+# Embedding retrieval over past support issues: issues are embedded in batches
+# into one L2-normalised float32 matrix, persisted as .npy, and a query's top-k
+# matches are found with a single matrix-vector product.
+
+EMBED_MODEL = "nomic-embed-text"
+EMBED_BATCH_SIZE = 64
+HASH_DIM = 256
+TOP_K = 5
+
+WORD_PATTERN = re.compile(r"\w+")
+
+def normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+def hash_embed(texts, dim=HASH_DIM):
+    # Deterministic feature-hashing embedding of words and word bigrams; no model
+    # needed, so it is what the benchmarks use. crc32 keeps it stable across runs.
+    rows, cols, signs = [], [], []
+    for row, text in enumerate(texts):
+        words = WORD_PATTERN.findall(text.lower())
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            h = zlib.crc32(feature.encode("utf-8"))
+            rows.append(row)
+            cols.append(h % dim)
+            signs.append(1.0 if h & 0x80000000 else -1.0)
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    np.add.at(matrix, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)),
+              np.array(signs, dtype=np.float32))
+    return normalize_rows(matrix)
+
+hash_embed.embedder_id = f"hash:{HASH_DIM}"
+
+def ollama_embedder(client, model=EMBED_MODEL):
+    # Embedding function backed by Ollama's /api/embed, which accepts a batch per request
+    def embed(texts):
+        response = client.embed(model=model, input=list(texts))
+        return normalize_rows(np.asarray(response["embeddings"], dtype=np.float32))
+    embed.embedder_id = f"ollama:{model}"
+    return embed
+
+def embedder_id(embed):
+    # What produced a store's vectors, saved with them: vectors of different
+    # embedders live in different spaces and must not be mixed
+    name = getattr(embed, "__qualname__", type(embed).__qualname__)
+    return getattr(embed, "embedder_id", None) or f"{embed.__module__}.{name}"
+
+def save_array(path, array):
+    # Written beside the target and renamed over it, so a memory-mapped copy of
+    # the old file stays readable while it is replaced
+    tmp_path = path + ".tmp.npy"
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+
+def embed_batched(texts, embed, batch_size=EMBED_BATCH_SIZE):
+    batches = [embed(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)]
+    if not batches:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.vstack(batches).astype(np.float32, copy=False)
+
+def top_k(scores, k):
+    # Indices of the k largest scores per row, best first; scores is (n,) or (q, n)
+    scores = np.atleast_2d(scores)
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.zeros((scores.shape[0], 0), dtype=np.intp)
+    if k < scores.shape[1]:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+class IssueStore:
+    def __init__(self, issues, vectors, embed, index=None, ids=None, embedder=None):
+        self.issues = list(issues)
+        self.vectors = vectors
+        self.embed = embed
+        # Id of the embedder the vectors came from; differs from embedder_id(embed)
+        # when a store saved by another embedder is loaded
+        self.embedder = embedder_id(embed) if embedder is None else embedder
+        # Stable id per issue, so update() can change the issue list without
+        # renumbering what the index holds
+        self.ids = np.arange(len(self.issues), dtype=np.int64) if ids is None else np.asarray(ids, dtype=np.int64)
+        # Optional approximate index (annindex.IVFIndex) keyed by issue id;
+        # when set, searches go through it instead of the exact matrix product
+        self.index = index
+        self._id_order = None
+
+    @classmethod
+    def build(cls, issues, embed, batch_size=EMBED_BATCH_SIZE):
+        return cls(issues, embed_batched(list(issues), embed, batch_size), embed)
+
+    def build_index(self, **kwargs):
+        from mcpnews.annindex import IVFIndex
+        self.index = IVFIndex.build(self.vectors, self.ids, **kwargs)
+        return self.index
+
+    def update(self, issues, batch_size=EMBED_BATCH_SIZE):
+        # Re-aligns the store with `issues`, embedding only those it does not hold
+        # yet (new or edited ones); the index drops removed issues and gains the
+        # new ones in place. Returns (added, removed).
+        issues = list(issues)
+        held = {}
+        for position, issue in enumerate(self.issues):
+            held.setdefault(issue, []).append(position)
+        # Old position of each issue, or -1 where it has to be embedded
+        if self.embedder != embedder_id(self.embed):
+            raise ValueError(f"Store vectors come from {self.embedder}, not {embedder_id(self.embed)}")
+        rows = np.array([held[issue].pop(0) if held.get(issue) else -1 for issue in issues], dtype=np.intp)
+        removed = np.array(sorted(p for positions in held.values() for p in positions), dtype=np.intp)
+        kept = rows >= 0
+        fresh = np.flatnonzero(~kept)
+        added = embed_batched([issues[i] for i in fresh], self.embed, batch_size)
+        if len(fresh) and len(self.vectors) and added.shape[1] != self.vectors.shape[1]:
+            raise ValueError(f"Embedding dimension {added.shape[1]} does not match the store's {self.vectors.shape[1]}")
+        vectors = np.empty((len(issues), added.shape[1] if len(fresh) else self.vectors.shape[1]), dtype=np.float32)
+        vectors[kept] = self.vectors[rows[kept]]
+        ids = np.empty(len(issues), dtype=np.int64)
+        ids[kept] = self.ids[rows[kept]]
+        next_id = int(self.ids.max()) + 1 if len(self.ids) else 0
+        ids[fresh] = np.arange(next_id, next_id + len(fresh))
+        if len(fresh):
+            vectors[fresh] = added
+        if self.index is not None:
+            self.index.delete(self.ids[removed])
+            if len(fresh):
+                self.index.add(added, ids[fresh])
+        self.issues, self.vectors, self.ids = issues, vectors, ids
+        self._id_order = None
+        return len(fresh), len(removed)
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        save_array(os.path.join(directory, "vectors.npy"), self.vectors)
+        save_array(os.path.join(directory, "ids.npy"), self.ids)
+        with open(os.path.join(directory, "issues.json"), "w", encoding="utf-8") as f:
+            json.dump(self.issues, f)
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"embedder": self.embedder, "dim": int(self.vectors.shape[1])}, f)
+        if self.index is not None:
+            self.index.save(os.path.join(directory, "ivf"))
+        elif os.path.isdir(os.path.join(directory, "ivf")):
+            shutil.rmtree(os.path.join(directory, "ivf"))
+
+    @classmethod
+    def load(cls, directory, embed, mmap=True):
+        # The matrix is memory-mapped by default so large stores open instantly
+        vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r" if mmap else None)
+        with open(os.path.join(directory, "issues.json"), encoding="utf-8") as f:
+            issues = json.load(f)
+        ids_path = os.path.join(directory, "ids.npy")
+        ids = np.load(ids_path) if os.path.exists(ids_path) else None
+        try:
+            with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            # Saved before the embedder was recorded: unknown origin
+            meta = {"embedder": "unknown", "dim": vectors.shape[1]}
+        if meta["dim"] != vectors.shape[1]:
+            raise ValueError(f"vectors.npy has dimension {vectors.shape[1]}, meta.json says {meta['dim']}")
+        index = None
+        if os.path.isdir(os.path.join(directory, "ivf")):
+            from mcpnews.annindex import IVFIndex
+            index = IVFIndex.load(os.path.join(directory, "ivf"), mmap=mmap)
+        return cls(issues, vectors, embed, index, ids, meta["embedder"])
+
+    def __len__(self):
+        return len(self.issues)
+
+    def search_vectors(self, query_vectors, k=TOP_K, exact=False):
+        # (q, dim) normalised queries -> (indices, scores), each (q, k), best first.
+        # Approximate searches pad missing hits with index -1.
+        if self.index is not None and not exact:
+            ids, scores = self.index.search(query_vectors, k)
+            return self._positions(ids), scores
+        scores = np.asarray(query_vectors, dtype=np.float32) @ self.vectors.T
+        indices = top_k(scores, k)
+        return indices, np.take_along_axis(scores, indices, axis=1)
+
+    def _positions(self, ids):
+        # Issue positions of index ids; the -1 padding stays -1
+        if self._id_order is None:
+            self._id_order = np.argsort(self.ids)
+        order = self._id_order
+        if not len(order):
+            return np.full(ids.shape, -1, dtype=np.intp)
+        slots = np.minimum(np.searchsorted(self.ids[order], ids), len(order) - 1)
+        return np.where(ids >= 0, order[slots], -1)
+
+    def _results(self, indices, scores):
+        return [(self.issues[i], float(score)) for i, score in zip(indices, scores) if i >= 0]
+
+    def search(self, query, k=TOP_K):
+        indices, scores = self.search_vectors(self.embed([query]), k)
+        return self._results(indices[0], scores[0])
+
+    def search_many(self, queries, k=TOP_K):
+        indices, scores = self.search_vectors(self.embed(list(queries)), k)
+        return [self._results(row, row_scores) for row, row_scores in zip(indices, scores)]
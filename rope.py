@@ -0,0 +1,71 @@
+import os
+import re
+
+import numpy as np
+
+# Multi-position rotary position embedding (RoPE) over a token embedding
+# matrix, computed one position at a time from a precomputed cos/sin table
+# into a preallocated output, plus an on-disk cache of the extracted
+# embedding matrix so only the first run has to load the model.
+
+ROPE_BASE = 10000
+EMBEDDING_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mcpnews", "embeddings")
+
+def rope_table(positions, dim, base=ROPE_BASE):
+    # (num_positions, dim // 2) cos and sin tables, same angles as plot_embeddings' original apply_rope
+    half_dim = dim // 2
+    theta = base ** (-np.arange(0, half_dim, dtype=np.float32) / half_dim)
+    angles = np.asarray(positions, dtype=np.float32)[:, np.newaxis] * theta
+    return np.cos(angles), np.sin(angles)
+
+def apply_rope_positions(embeddings, positions, out=None, base=ROPE_BASE):
+    # [vocab_size, hidden_dim] -> [num_positions, vocab_size, hidden_dim]. Pairs
+    # (even, odd) are rotated by each position's angles. `out` may be a
+    # preallocated array or memmap to write into instead of allocating.
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    vocab_size, dim = embeddings.shape
+    cos, sin = rope_table(positions, dim, base)
+    if out is None:
+        out = np.empty((len(positions), vocab_size, dim), dtype=np.float32)
+    even, odd = embeddings[:, 0::2], embeddings[:, 1::2]
+    # One position at a time, written in place, so the only temporary is a single
+    # [vocab_size, hidden_dim / 2] product buffer reused for every position
+    product = np.empty_like(even)
+    for p in range(len(positions)):
+        out_even, out_odd = out[p, :, 0::2], out[p, :, 1::2]
+        np.multiply(even, cos[p], out=out_even)
+        out_even -= np.multiply(odd, sin[p], out=product)
+        np.multiply(even, sin[p], out=out_odd)
+        out_odd += np.multiply(odd, cos[p], out=product)
+    return out
+
+def stacked_rope_embeddings(embeddings, positions, path=None, base=ROPE_BASE):
+    # [num_positions * vocab_size, hidden_dim], position-major like the old torch.cat.
+    # With `path` the result is written straight to a memory-mapped .npy file.
+    vocab_size, dim = embeddings.shape
+    out = None
+    if path:
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32,
+                                        shape=(len(positions), vocab_size, dim))
+    out = apply_rope_positions(embeddings, positions, out=out, base=base)
+    if path:
+        out.flush()
+    return out.reshape(len(positions) * vocab_size, dim)
+
+def embedding_cache_path(model_name, cache_dir=EMBEDDING_CACHE_DIR):
+    return os.path.join(cache_dir, re.sub(r"[^\w.-]+", "__", model_name) + ".npy")
+
+def load_embedding_matrix(model_name, cache_dir=EMBEDDING_CACHE_DIR):
+    # The input embedding matrix as a read-only memmap. Only a cache miss loads
+    # the model (transformers is imported lazily for that case).
+    path = embedding_cache_path(model_name, cache_dir)
+    if not os.path.exists(path):
+        from transformers import AutoModelForCausalLM
+        model = AutoModelForCausalLM.from_pretrained(model_name)
+        weights = model.get_input_embeddings().weight.detach().cpu().float().numpy()
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = path + ".tmp.npy"
+        np.save(tmp_path, weights)
+        os.replace(tmp_path, path)
+        del model
+    return np.load(path, mmap_mode="r")
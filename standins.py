@@ -0,0 +1,207 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote, urlparse
+
+from mcpnews.outletparser import BIAS_LEVELS
+
+# Local HTTP stand-ins used by the benchmarks so they never touch the real outlets
+
+STANDIN_TOPICS = ["election", "climate", "trade", "ukraine", "gaza", "ai", "cricket", "markets"]
+
+def build_rss(source, num_entries=20, topics=STANDIN_TOPICS):
+    items = []
+    for i in range(num_entries):
+        topic = topics[i % len(topics)]
+        items.append(
+            "<item>"
+            f"<title>{source} report {i} on {topic}</title>"
+            f"<description>&lt;p&gt;{source} coverage of the latest {topic} developments, story {i}.&lt;/p&gt;</description>"
+            f"<link>http://standin.local/{quote(source)}/{i}</link>"
+            f"<guid>{quote(source)}-{i}</guid>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0"><channel>'
+        f"<title>{source}</title><link>http://standin.local/</link><description>{source} stand-in</description>"
+        + "".join(items)
+        + "</channel></rss>"
+    ).encode("utf-8")
+
+def start_server(handler_class):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def server_url(server):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+def start_feed_standin(feeds, delays=None, num_entries=20):
+    # Serves one RSS document per source of `feeds` ({source: {"url", "country"}}),
+    # sleeping delays[source] seconds before answering. Returns the server and a
+    # copy of `feeds` whose urls point at the stand-in.
+    delays = delays or {}
+    documents = {source: build_rss(source, num_entries) for source in feeds}
+    etags = {source: '"%s"' % hashlib.sha1(body).hexdigest() for source, body in documents.items()}
+
+    class FeedHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            source = unquote(urlparse(self.path).path.lstrip("/"))
+            if source not in documents:
+                self.send_error(404)
+                return
+            time.sleep(delays.get(source, 0))
+            body = documents[source]
+            try:
+                if self.headers.get("If-None-Match") == etags[source]:
+                    self.send_response(304)
+                    self.send_header("ETag", etags[source])
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etags[source])
+                self.send_header("Last-Modified", formatdate(usegmt=True))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    server = start_server(FeedHandler)
+    base = server_url(server)
+    standin_feeds = {
+        source: dict(info, url=f"{base}/{quote(source)}") for source, info in feeds.items()
+    }
+    return server, standin_feeds
+
+SOURCE_LINE = re.compile(r"^Source: (.+) \(([^)]+)\)$", re.MULTILINE)
+
+def canned_bias(outlet):
+    return BIAS_LEVELS[int(hashlib.sha1(outlet.encode("utf-8")).hexdigest(), 16) % len(BIAS_LEVELS)]
+
+def canned_analysis(prompt):
+    # Deterministic stand-in for the model: one analysis per "Source:" line, in
+    # the JSON schema requested by build_prompt, or a paragraph for one article
+    outlets = list(dict.fromkeys(SOURCE_LINE.findall(prompt)))
+    if "Respond in JSON" not in prompt:
+        outlet = outlets[0][0] if outlets else "the outlet"
+        text = f"The coverage from {outlet} reads as largely neutral, reporting the events without loaded language."
+        if "Bias level:" in prompt:
+            text += f"\nBias level: {canned_bias(outlet)}"
+        return text
+    articles = []
+    for outlet, country in outlets:
+        bias = canned_bias(outlet)
+        articles.append({
+            "newsoutlet": outlet,
+            "newsanalysis": f"{outlet} frames the story from a {country} perspective.",
+            "country_of_origin": country,
+            "bias_level": bias,
+        })
+    data = {"summary": f"Coverage from {len(articles)} outlets differs mainly in framing.", "articles": articles}
+    return "```json\n" + json.dumps(data, indent=2) + "\n```"
+
+def split_tokens(text):
+    return re.findall(r"\S+\s*|\s+", text)
+
+def start_ollama_standin(respond=canned_analysis, prefill_delay=0.0, prefill_per_kchar=0.0,
+                         token_delay=0.0, fail_first=0, truncate_after=None):
+    # Fake Ollama serving /api/generate and /api/chat, streamed (NDJSON) or not.
+    # Each request waits prefill_delay + prefill_per_kchar * len(prompt) / 1000
+    # seconds before the first token and token_delay between tokens. The first
+    # fail_first requests get a 503 to exercise client retries. server.stats
+    # counts requests and the peak number of generations in flight at once.
+    # truncate_after ends every stream cleanly after that many fragments but
+    # without the final "done" chunk, like a model server that died mid-generation.
+    state = {"requests": 0, "in_flight": 0, "peak_in_flight": 0, "lock": threading.Lock()}
+
+    class OllamaHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            path = urlparse(self.path).path
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            with state["lock"]:
+                state["requests"] += 1
+                failing = state["requests"] <= fail_first
+            if path not in ("/api/generate", "/api/chat") or failing:
+                payload = json.dumps({"error": "unavailable" if failing else "not found"}).encode("utf-8")
+                self.send_response(503 if failing else 404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                return
+            with state["lock"]:
+                state["in_flight"] += 1
+                state["peak_in_flight"] = max(state["peak_in_flight"], state["in_flight"])
+            try:
+                self._generate(path, body)
+            finally:
+                with state["lock"]:
+                    state["in_flight"] -= 1
+
+        def _generate(self, path, body):
+            chat = path == "/api/chat"
+            prompt = "\n".join(m.get("content", "") for m in body.get("messages", [])) if chat else body.get("prompt", "")
+            model = body.get("model", "")
+            time.sleep(prefill_delay + prefill_per_kchar * len(prompt) / 1000)
+            text = respond(prompt)
+
+            def chunk(fragment, done):
+                if chat:
+                    data = {"model": model, "message": {"role": "assistant", "content": fragment}, "done": done}
+                else:
+                    data = {"model": model, "response": fragment, "done": done}
+                if done:
+                    data["prompt_eval_count"] = len(prompt) // 4
+                    data["eval_count"] = len(split_tokens(text))
+                return data
+
+            try:
+                if body.get("stream", True):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/x-ndjson")
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for i, fragment in enumerate(split_tokens(text)):
+                        if i == truncate_after:
+                            break
+                        if i:
+                            time.sleep(token_delay)
+                        self._write_chunk(json.dumps(chunk(fragment, False)).encode("utf-8") + b"\n")
+                    else:
+                        self._write_chunk(json.dumps(chunk("", True)).encode("utf-8") + b"\n")
+                    self._write_chunk(b"")
+                else:
+                    time.sleep(token_delay * max(0, len(split_tokens(text)) - 1))
+                    payload = json.dumps(chunk(text, True)).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+
+        def _write_chunk(self, data):
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = start_server(OllamaHandler)
+    server.stats = state
+    return server
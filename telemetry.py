@@ -0,0 +1,298 @@
+import contextlib
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Stage timing spans for the analysis pipeline. Code wraps each stage in
+# tracer.span(name) and adds counters (bytes, entries, tokens, ...); finished
+# spans are aggregated per stage into Prometheus-style histograms, kept in a
+# short ring buffer and optionally appended to a JSON-lines log. A per-request
+# cProfile/tracemalloc hook sits alongside for when timings are not enough.
+#
+# Stages: sweep, fetch, parse, match, prompt, llm, llm_prefill, llm_generate,
+# parse_response, analysis (one whole request).
+
+# Set to a file path to log every finished span as one JSON line
+TRACE_LOG_ENV = "MCPNEWS_TRACE_LOG"
+# Set to "cpu", "memory" or "cpu,memory" to profile every request
+PROFILE_ENV = "MCPNEWS_PROFILE"
+PROFILE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mcpnews", "profiles")
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+RECENT_SPANS = 1000
+METRICS_PORT = 9464
+
+# The active span of the current thread/context, so nested spans find their parent
+_current_span = contextvars.ContextVar("mcpnews_span", default=None)
+
+class Span:
+    def __init__(self, name, span_id, parent, attrs):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else span_id
+        self.attrs = attrs
+        self.counters = {}
+        self.started_at = time.time()
+        self.duration = None
+        self.error = None
+
+    def count(self, key, amount=1):
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def to_dict(self):
+        return {
+            "name": self.name, "trace_id": self.trace_id, "span_id": self.span_id, "parent_id": self.parent_id,
+            "started_at": self.started_at, "duration": self.duration, "error": self.error,
+            "attrs": self.attrs, "counters": self.counters,
+        }
+
+class Tracer:
+    # Thread-safe. span() is a context manager that becomes the parent of spans
+    # opened inside it; start()/finish() time a span without activating it, for
+    # generators whose body interleaves with the caller's. record() adds a span
+    # whose duration was measured elsewhere (e.g. reported by Ollama).
+
+    def __init__(self, log_path=None, buckets=STAGE_BUCKETS, recent=RECENT_SPANS):
+        self.log_path = log_path
+        self.buckets = buckets
+        self.recent = deque(maxlen=recent)
+        self._stages = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._log = None
+
+    def start(self, name, **attrs):
+        return Span(name, next(self._ids), _current_span.get(), attrs)
+
+    def finish(self, span, started=None, error=None):
+        if span.duration is None:
+            span.duration = time.time() - span.started_at if started is None else time.perf_counter() - started
+        span.error = span.error or error
+        stage = self._stage(span.name)
+        with self._lock:
+            stage["count"] += 1
+            stage["seconds"] += span.duration
+            stage["errors"] += bool(span.error)
+            for i, bound in enumerate(self.buckets):
+                if span.duration <= bound:
+                    stage["buckets"][i] += 1
+                    break
+            for key, amount in span.counters.items():
+                stage["counters"][key] = stage["counters"].get(key, 0) + amount
+            self.recent.append(span)
+            if self.log_path:
+                if self._log is None:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                    self._log = open(self.log_path, "a", encoding="utf-8")
+                self._log.write(json.dumps(span.to_dict(), default=str) + "\n")
+                self._log.flush()
+        return span
+
+    @contextlib.contextmanager
+    def span(self, name, **attrs):
+        span = self.start(name, **attrs)
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = e.__class__.__name__
+            raise
+        finally:
+            _current_span.reset(token)
+            self.finish(span, started)
+
+    def record(self, name, duration, **counters):
+        span = self.start(name)
+        span.duration = duration
+        span.counters.update(counters)
+        return self.finish(span)
+
+    def _stage(self, name):
+        with self._lock:
+            if name not in self._stages:
+                self._stages[name] = {"count": 0, "seconds": 0.0, "errors": 0,
+                                      "buckets": [0] * len(self.buckets), "counters": {}}
+            return self._stages[name]
+
+    def summary(self):
+        # {stage: {"count", "seconds", "mean", "errors", "counters"}}
+        with self._lock:
+            return {name: {"count": stage["count"], "seconds": stage["seconds"],
+                           "mean": stage["seconds"] / stage["count"] if stage["count"] else 0.0,
+                           "errors": stage["errors"], "counters": dict(stage["counters"])}
+                    for name, stage in self._stages.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self.recent.clear()
+
+    def prometheus_text(self):
+        # Prometheus text exposition format (version 0.0.4)
+        lines = ["# HELP mcpnews_stage_seconds Time spent per pipeline stage.",
+                 "# TYPE mcpnews_stage_seconds histogram"]
+        counters = []
+        errors = []
+        with self._lock:
+            for name, stage in sorted(self._stages.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, stage["buckets"]):
+                    cumulative += count
+                    lines.append(f'mcpnews_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'mcpnews_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {stage["count"]}')
+                lines.append(f'mcpnews_stage_seconds_sum{{stage="{name}"}} {stage["seconds"]:.6f}')
+                lines.append(f'mcpnews_stage_seconds_count{{stage="{name}"}} {stage["count"]}')
+                errors.append(f'mcpnews_stage_errors_total{{stage="{name}"}} {stage["errors"]}')
+                for key, amount in sorted(stage["counters"].items()):
+                    counters.append(f'mcpnews_stage_items_total{{stage="{name}",counter="{key}"}} {amount}')
+        lines += ["# HELP mcpnews_stage_errors_total Spans that ended in an exception.",
+                  "# TYPE mcpnews_stage_errors_total counter"] + errors
+        lines += ["# HELP mcpnews_stage_items_total Bytes, entries, tokens, ... counted by each stage.",
+                  "# TYPE mcpnews_stage_items_total counter"] + counters
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+# Shared by every module; MCPNEWS_TRACE_LOG turns on the JSON log
+tracer = Tracer(log_path=os.environ.get(TRACE_LOG_ENV) or None)
+
+def serve_metrics(port=METRICS_PORT, host="127.0.0.1", tracer=tracer):
+    # /metrics in Prometheus text format and /spans with the recent spans as JSON,
+    # served from a daemon thread. Returns the server; call shutdown() to stop.
+    # Every module imports the tracer, so the server and profilers are imported on use.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body = tracer.prometheus_text().encode("utf-8")
+                content_type = "text/plain; version=0.0.4"
+            elif self.path == "/spans":
+                body = json.dumps([span.to_dict() for span in list(tracer.recent)], default=str).encode("utf-8")
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# tracemalloc is process-wide, so concurrent memory profiles share one trace: the
+# first user starts it (unless something else already had) and the last one stops it
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_state = {"users": 0, "owned": False}
+# Python 3.12+ allows one active profiler per process (sys.monitoring), so only
+# one request at a time is CPU-profiled; overlapping ones skip it and say so
+_cprofile_lock = threading.Lock()
+# Per-process sequence number in report names, so same-second reports do not collide
+_profile_ids = itertools.count(1)
+
+def _acquire_tracemalloc():
+    import tracemalloc
+
+    with _tracemalloc_lock:
+        if _tracemalloc_state["users"] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_state["owned"] = True
+        _tracemalloc_state["users"] += 1
+
+def _release_tracemalloc():
+    # (snapshot, current bytes, peak bytes), taken before the trace can be stopped
+    import tracemalloc
+
+    with _tracemalloc_lock:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        _tracemalloc_state["users"] -= 1
+        if _tracemalloc_state["users"] == 0 and _tracemalloc_state["owned"]:
+            tracemalloc.stop()
+            _tracemalloc_state["owned"] = False
+    return snapshot, current, peak
+
+def _start_cprofile():
+    # An enabled cProfile.Profile, or None if another profile is already running
+    import cProfile
+
+    if not _cprofile_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # A profiler outside this module (e.g. python -m cProfile) is active
+        _cprofile_lock.release()
+        return None
+    return profiler
+
+def _stop_cprofile(profiler):
+    profiler.disable()
+    _cprofile_lock.release()
+
+@contextlib.contextmanager
+def profiled(name, cpu=True, memory=False, out_dir=PROFILE_DIR, top=25):
+    # cProfile (calling thread only) and/or tracemalloc around one request. Writes
+    # <name>-<time>-<pid>-<seq>.prof plus a .txt with the top functions by cumulative
+    # time and the top allocation sites; the yielded dict gets their paths on exit.
+    # Memory figures of overlapping profiles include each other's allocations;
+    # CPU profiling is skipped (report["cpu_skipped"]) while another one runs.
+    import io
+    import pstats
+
+    report = {}
+    if memory:
+        _acquire_tracemalloc()
+    profiler = _start_cprofile() if cpu else None
+    try:
+        yield report
+    finally:
+        if profiler:
+            _stop_cprofile(profiler)
+        os.makedirs(out_dir, exist_ok=True)
+        base = os.path.join(out_dir, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_profile_ids)}")
+        text = io.StringIO()
+        if profiler:
+            profiler.dump_stats(base + ".prof")
+            report["prof"] = base + ".prof"
+            pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(top)
+        elif cpu:
+            text.write("cProfile: skipped, another profile was already active\n")
+            report["cpu_skipped"] = True
+        if memory:
+            snapshot, current, peak = _release_tracemalloc()
+            text.write(f"tracemalloc: current {current / 2**20:.1f} MiB, peak {peak / 2**20:.1f} MiB\n")
+            for stat in snapshot.statistics("lineno")[:top]:
+                text.write(f"{stat}\n")
+            report["peak_bytes"] = peak
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(text.getvalue())
+        report["report"] = base + ".txt"
+
+def maybe_profiled(name, profile=None):
+    # profiled() when `profile` ("cpu", "memory", "cpu,memory"), or MCPNEWS_PROFILE
+    # if profile is None, asks for it; otherwise a no-op context
+    modes = os.environ.get(PROFILE_ENV, "") if profile is None else (profile or "")
+    modes = {mode.strip() for mode in modes.split(",") if mode.strip()}
+    if not modes:
+        return contextlib.nullcontext({})
+    return profiled(name, cpu="cpu" in modes, memory="memory" in modes)
@@ -0,0 +1,62 @@
+import numpy as np
+
+from mcpnews.annindex import IVFIndex
+from mcpnews.retrieval import normalize_rows, top_k
+
+def clustered(n=2000, dim=32, clusters=16, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return normalize_rows((centers[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim)))
+                          .astype(np.float32))
+
+def exact_ids(vectors, queries, k):
+    return top_k(queries @ vectors.T, k)
+
+def test_probing_every_list_is_exact_and_few_lists_keep_recall():
+    vectors = clustered()
+    queries = vectors[:50] + 0.05
+    index = IVFIndex.build(vectors, n_lists=16)
+    ids, scores = index.search(queries, k=10, nprobe=16)
+    assert ids.tolist() == exact_ids(vectors, normalize_rows(queries), 10).tolist()
+    assert np.all(np.diff(scores, axis=1) <= 1e-6)
+    ids, _ = index.search(queries, k=10, nprobe=4)
+    expected = exact_ids(vectors, normalize_rows(queries), 10)
+    recall = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(ids.tolist(), expected.tolist())])
+    assert recall > 0.9
+
+def test_add_replace_and_delete():
+    vectors = clustered(500)
+    index = IVFIndex.build(vectors, n_lists=8)
+    assert index.delete([3, 4, 999]) == 2
+    assert len(index) == 498
+    ids, _ = index.search(vectors[3], k=5, nprobe=8)
+    assert 3 not in ids[0]
+    # Adding an id that is present replaces its vector
+    index.add(vectors[3:4], ids=[10])
+    assert len(index) == 498
+    ids, scores = index.search(vectors[3], k=1, nprobe=8)
+    assert ids[0, 0] == 10 and scores[0, 0] > 0.999
+    new_ids = index.add(clustered(5, seed=1))
+    assert new_ids.tolist() == [500, 501, 502, 503, 504]
+
+def test_missing_hits_are_padded():
+    index = IVFIndex.build(clustered(20), n_lists=2)
+    ids, scores = index.search(clustered(1, seed=2), k=30, nprobe=2)
+    assert (ids[0, 20:] == -1).all() and np.isneginf(scores[0, 20:]).all()
+
+def test_save_compacts_and_load_memory_maps(tmp_path):
+    vectors = clustered(300)
+    index = IVFIndex.build(vectors, n_lists=8)
+    index.delete(range(100))
+    index.add(clustered(10, seed=3))
+    expected = index.search(vectors[150:160], k=5, nprobe=8)
+    index.save(str(tmp_path))
+    loaded = IVFIndex.load(str(tmp_path))
+    assert len(loaded) == 210
+    ids, scores = loaded.search(vectors[150:160], k=5, nprobe=8)
+    assert ids.tolist() == expected[0].tolist()
+    np.testing.assert_allclose(scores, expected[1], rtol=1e-6)
+    assert loaded.add(clustered(1, seed=4)).tolist() == [310]
+    # Saving over the directory the index is mapped from leaves the mapping readable
+    loaded.save(str(tmp_path))
+    assert loaded.search(vectors[150:160], k=5, nprobe=8)[0].tolist() == ids.tolist()
@@ -0,0 +1,65 @@
+import functools
+import io
+import json
+
+import pytest
+
+import mcpnews.batch as batch
+from mcpnews.history import AnalysisStore
+from mcpnews.mcpnews import find_articles, refresh_feeds
+from mcpnews.standins import canned_analysis, start_feed_standin
+from mcpnews.topicindex import TopicIndex
+
+FEEDS = {"CNN": {"url": "", "country": "USA"}, "BBC": {"url": "", "country": "UK"},
+         "Al Jazeera": {"url": "", "country": "Qatar"}}
+
+@pytest.fixture
+def pipeline(monkeypatch, tmp_path):
+    # The batch module's feed sweep, topic lookup and LLM call, pointed at
+    # stand-in feeds, a private index and the canned stand-in model
+    server, feeds = start_feed_standin(FEEDS)
+    index = TopicIndex()
+    sweeps = []
+
+    def sweep(feeds, **kwargs):
+        sweeps.append(sorted(feeds))
+        return refresh_feeds(feeds, cache=None, index=index, **kwargs)
+
+    monkeypatch.setattr(batch, "refresh_feeds", sweep)
+    monkeypatch.setattr(batch, "find_articles", functools.partial(find_articles, index=index))
+    monkeypatch.setattr(batch, "call_ollama_phi", lambda prompt, model=None: canned_analysis(prompt))
+    history = AnalysisStore(str(tmp_path / "history.sqlite3"))
+    yield feeds, sweeps, history
+    history.close()
+    server.shutdown()
+
+def run(topics, feeds, history, **kwargs):
+    out = io.StringIO()
+    totals = batch.analyze_topics(topics, out, feeds=feeds, history=history, **kwargs)
+    records = {record["topic"]: record for record in map(json.loads, out.getvalue().splitlines())}
+    return records, totals
+
+def test_read_topics_skips_blanks_comments_and_duplicates():
+    assert batch.read_topics(["election\n", "\n", "# note\n", "Election\n", " climate \n"]) == ["election", "climate"]
+
+def test_topics_share_one_sweep_and_are_recorded(pipeline):
+    feeds, sweeps, history = pipeline
+    records, totals = run(["election", "climate", "volcano"], feeds, history)
+    assert len(sweeps) == 1
+    assert records["volcano"]["error"] == "No articles found for topic: volcano"
+    for topic in ("election", "climate"):
+        assert records[topic]["error"] is None
+        assert sorted(o["newsoutlet"] for o in records[topic]["outlet_analysis"]) == sorted(FEEDS)
+    assert {"fetch", "match", "prompt", "llm", "store", "wall"} <= set(totals)
+    assert history.latest("election")["outlet_analysis"] == records["election"]["outlet_analysis"]
+    assert history.latest("volcano") is None
+
+def test_recent_analyses_are_reused_without_a_sweep(pipeline):
+    feeds, sweeps, history = pipeline
+    run(["election"], feeds, history, model="m")
+    records, totals = run(["election"], feeds, history, model="m", max_age=3600)
+    assert len(sweeps) == 1
+    assert records["election"]["reused"] is True and totals["reused"] == 1
+    records, _ = run(["election", "climate"], feeds, history, model="m", max_age=3600)
+    assert len(sweeps) == 2
+    assert records["election"]["reused"] is True and "reused" not in records["climate"]
@@ -0,0 +1,47 @@
+import json
+import os
+import sys
+
+import numpy as np
+
+from mcpnews.biasmap import BiasMap, background_key, country_markers, get_country_from_newsoutlet, load_background
+
+PROJECTED = {"USA": (10.0, 20.0), "India": (30.0, 5.0), "France": (15.0, 25.0)}
+
+def seed_cache(cache_dir, coords):
+    # The files load_background writes after a Basemap render
+    os.makedirs(cache_dir, exist_ok=True)
+    base = os.path.join(cache_dir, "robin-" + background_key(coords))
+    np.save(base + ".npy", np.zeros((40, 80, 4), dtype=np.uint8))
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump({"extent": [0, 80, 0, 40], "coords": PROJECTED}, f)
+
+def test_country_markers_one_per_country_in_first_seen_order():
+    analysis = [
+        {"newsoutlet": "CNN", "country_of_origin": "USA", "bias_level": "Neutral"},
+        {"newsoutlet": "Fox", "country_of_origin": "USA", "bias_level": "Extreme Bias (Distraction)"},
+        {"newsoutlet": "NDTV", "country_of_origin": "NDTV (India)", "bias_level": "Slightly Negative"},
+        {"newsoutlet": "ABC", "country_of_origin": "Narnia", "bias_level": "Neutral"},
+    ]
+    assert country_markers(analysis, PROJECTED) == [("USA", 10.0, 20.0, "green"), ("India", 30.0, 5.0, "orange")]
+    assert get_country_from_newsoutlet("Le Monde (France)") == "France"
+
+def test_cached_background_is_used_without_basemap(tmp_path):
+    cache_dir = str(tmp_path)
+    seed_cache(cache_dir, PROJECTED)
+    raster, extent, projected = load_background(PROJECTED, cache_dir)
+    assert raster.shape == (40, 80, 4) and extent == (0, 80, 0, 40) and projected == PROJECTED
+    assert "mpl_toolkits.basemap" not in sys.modules
+
+def test_update_replaces_the_markers(tmp_path):
+    cache_dir = str(tmp_path)
+    seed_cache(cache_dir, PROJECTED)
+    bias_map = BiasMap(coords=PROJECTED, cache_dir=cache_dir, blit=False)
+    bias_map.update([{"country_of_origin": "USA", "bias_level": "Neutral"},
+                     {"country_of_origin": "France", "bias_level": "None"}])
+    assert bias_map.markers.get_offsets().tolist() == [[10.0, 20.0], [15.0, 25.0]]
+    assert [label.get_text() for label in bias_map.labels] == ["USA", "France"]
+    bias_map.update([{"country_of_origin": "India", "bias_level": "Neutral"}])
+    assert [label.get_text() for label in bias_map.labels] == ["India"]
+    assert len(bias_map.ax.texts) == 1
+    bias_map.fig.canvas.draw()
@@ -0,0 +1,56 @@
+import pytest
+import requests
+
+from mcpnews.feedcache import FeedCache
+from mcpnews.standins import start_feed_standin
+
+FEEDS = {"CNN": {"url": "", "country": "USA"}, "BBC": {"url": "", "country": "UK"}}
+
+@pytest.fixture
+def standin():
+    server, feeds = start_feed_standin(FEEDS)
+    yield server, feeds
+    server.shutdown()
+
+def test_fresh_entries_are_served_without_a_request(standin, tmp_path):
+    _, feeds = standin
+    cache = FeedCache(cache_dir=str(tmp_path))
+    first = cache.fetch(feeds["CNN"]["url"])
+    second = cache.fetch(feeds["CNN"]["url"])
+    assert cache.stats["downloaded"] == 1 and cache.stats["fresh"] == 1
+    assert [e.title for e in second.entries] == [e.title for e in first.entries]
+
+def test_stale_entries_are_revalidated_with_a_conditional_get(standin, tmp_path):
+    _, feeds = standin
+    cache = FeedCache(cache_dir=str(tmp_path))
+    cache.fetch(feeds["CNN"]["url"])
+    feed = cache.fetch(feeds["CNN"]["url"], max_age=0)
+    assert cache.stats["not_modified"] == 1 and cache.stats["downloaded"] == 1
+    assert len(feed.entries) == 20
+
+def test_last_good_copy_is_served_when_the_outlet_fails(standin, tmp_path):
+    server, feeds = standin
+    cache = FeedCache(cache_dir=str(tmp_path))
+    cache.fetch(feeds["CNN"]["url"])
+    server.shutdown()
+    server.server_close()
+    assert len(cache.fetch(feeds["CNN"]["url"], timeout=0.5, max_age=0).entries) == 20
+    assert cache.stats["stale_on_error"] == 1
+    with pytest.raises(requests.RequestException):
+        cache.fetch(feeds["BBC"]["url"], timeout=0.5)
+
+def test_entries_persist_across_instances(standin, tmp_path):
+    _, feeds = standin
+    FeedCache(cache_dir=str(tmp_path)).fetch(feeds["CNN"]["url"])
+    cache = FeedCache(cache_dir=str(tmp_path))
+    assert len(cache.fetch(feeds["CNN"]["url"]).entries) == 20
+    assert cache.stats == {"fresh": 1, "not_modified": 0, "downloaded": 0, "stale_on_error": 0}
+
+def test_least_recently_used_feeds_are_evicted(standin, tmp_path):
+    _, feeds = standin
+    cache = FeedCache(max_entries=1, cache_dir=str(tmp_path))
+    cache.fetch(feeds["CNN"]["url"])
+    cache.fetch(feeds["BBC"]["url"])
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    cache.fetch(feeds["CNN"]["url"])
+    assert cache.stats["downloaded"] == 3
@@ -0,0 +1,46 @@
+import time
+
+from mcpnews.feedfetch import fetch_feeds, iter_feeds
+from mcpnews.standins import start_feed_standin, server_url
+
+FEEDS = {f"Outlet {i}": {"url": "", "country": "USA"} for i in range(4)}
+
+def urls(feeds):
+    return {source: info["url"] for source, info in feeds.items()}
+
+def test_feeds_are_fetched_concurrently():
+    server, feeds = start_feed_standin(FEEDS, {source: 0.3 for source in FEEDS})
+    try:
+        start = time.perf_counter()
+        parsed, errors = fetch_feeds(urls(feeds))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+    assert errors == {}
+    assert sorted(parsed) == sorted(FEEDS)
+    assert all(len(feed.entries) == 20 for feed in parsed.values())
+    assert elapsed < 0.9
+
+def test_failed_and_slow_feeds_are_reported_as_errors():
+    server, feeds = start_feed_standin(FEEDS, {"Outlet 0": 0.5, "Outlet 1": 2.0})
+    targets = urls(feeds)
+    targets["Missing"] = f"{server_url(server)}/Missing"
+    try:
+        start = time.perf_counter()
+        parsed, errors = fetch_feeds(targets, timeout=0.2, deadline=1.0)
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+    assert sorted(parsed) == ["Outlet 2", "Outlet 3"]
+    assert sorted(errors) == ["Missing", "Outlet 0", "Outlet 1"]
+    assert elapsed < 1.5
+
+def test_deadline_yields_pending_feeds():
+    server, feeds = start_feed_standin(FEEDS, {"Outlet 3": 1.0})
+    try:
+        results = list(iter_feeds(urls(feeds), timeout=5.0, deadline=0.3))
+    finally:
+        server.shutdown()
+    assert [source for source, _, _ in results][-1] == "Outlet 3"
+    assert results[-1][1] is None and "deadline" in results[-1][2]
+    assert all(error is None for _, _, error in results[:-1])
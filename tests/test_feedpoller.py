@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import feedparser
+
+from mcpnews.feedpoller import FeedPoller
+from mcpnews.mcpnews import indexed_sources
+from mcpnews.standins import start_feed_standin
+from mcpnews.topicindex import TopicIndex
+
+def entry(i):
+    return feedparser.FeedParserDict(id=f"e{i}", title=f"election story {i}", link=f"http://x/{i}", summary="")
+
+class FakeFeeds:
+    # Stands in for the network behind FeedPoller._fetch: {url: [entries] or an exception}
+    def __init__(self, responses):
+        self.responses = responses
+
+    def __call__(self, url, timeout):
+        response = self.responses[url]
+        if isinstance(response, Exception):
+            raise response
+        return SimpleNamespace(entries=list(response))
+
+def make_poller(responses, **kwargs):
+    poller = FeedPoller({source: source for source in responses}, **kwargs)
+    poller._fetch = FakeFeeds(responses)
+    return poller
+
+def test_failed_feeds_retry_quickly_and_do_not_count_as_warm():
+    poller = make_poller({"A": OSError("down"), "B": OSError("down")}, retry_interval=30)
+    poller.poll()
+    state = poller.feeds["A"]
+    assert not state.ok
+    assert 29 <= poller.status()["A"]["next_poll_in"] <= 30
+    # The normal interval is left alone, so recovery does not inherit the backoff
+    assert state.interval == poller.feeds["B"].interval == 5 * 60
+    poller.poll()
+    assert 59 <= poller.status()["A"]["next_poll_in"] <= 60
+
+def test_warm_only_after_a_success():
+    poller = make_poller({"A": OSError("down")}, retry_interval=0.01)
+    poller.start()
+    try:
+        assert not poller.wait_warm(0.3)
+        assert poller.warm_sources({"A": {"url": "A"}}) is None
+        poller._fetch.responses["A"] = [entry(1)]
+        assert poller.wait_warm(5)
+        assert poller.warm_sources({"A": {"url": "A"}}) == ["A"]
+    finally:
+        poller.stop()
+
+def test_dropped_entries_are_published():
+    responses = {"A": [entry(1), entry(2)]}
+    poller = make_poller(responses)
+    index = TopicIndex()
+    published = []
+    poller.subscribe(lambda source, new_entries, entries: published.append(len(new_entries)))
+    poller.subscribe(lambda source, new_entries, entries: index.update_feed(source, entries))
+    poller.poll()
+    assert len(index.search("election", max_articles=10)["A"]) == 2
+    poller.poll()
+    # Unchanged feed: nothing to publish
+    assert published == [2]
+    responses["A"] = [entry(2)]
+    poller.poll()
+    assert published == [2, 0]
+    assert [a["title"] for a in index.search("election", max_articles=10)["A"]] == ["election story 2"]
+
+def test_indexed_sources_sweeps_what_the_poller_lacks():
+    server, feeds = start_feed_standin({"A": {"url": "", "country": "X"}, "B": {"url": "", "country": "Y"}})
+    try:
+        index = TopicIndex()
+        poller = SimpleNamespace(warm_sources=lambda feeds: ["A"])
+        assert indexed_sources(feeds, cache=None, index=index, poller=poller, verbose=False) == ["A", "B"]
+        results = index.search("election", max_articles=10, sources={"A", "B"})
+        assert "B" in results and "A" not in results
+    finally:
+        server.shutdown()
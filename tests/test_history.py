@@ -0,0 +1,67 @@
+import pytest
+
+from mcpnews.history import AnalysisStore, parse_duration
+
+def result(outlets, summary="Summary"):
+    return {
+        "prompt": "prompt", "response": "response", "summary": summary,
+        "articles": [{"source": name, "country": country, "title": f"{name} story", "summary": "", "link": ""}
+                     for name, country, _ in outlets],
+        "outlet_analysis": [{"newsoutlet": name, "country_of_origin": country, "bias_level": bias,
+                             "newsanalysis": f"{name} analysis"} for name, country, bias in outlets],
+    }
+
+@pytest.fixture
+def store(tmp_path):
+    store = AnalysisStore(str(tmp_path / "history.sqlite3"))
+    yield store
+    store.close()
+
+def test_parse_duration():
+    assert parse_duration("90") == 90
+    assert parse_duration("45m") == 2700
+    assert parse_duration("1.5h") == 5400
+    assert parse_duration("2w") == 14 * 86400
+    with pytest.raises(ValueError):
+        parse_duration("soon")
+
+def test_latest_round_trips_in_get_mcp_analysis_shape(store):
+    store.record("Election", result([("CNN", "USA", "Neutral")], "old"), model="m", created_at=100)
+    data = result([("BBC", "UK", "Slightly Negative")], "new")
+    store.record("  election ", data, model="m", created_at=200)
+    latest = store.latest("ELECTION")
+    assert latest["summary"] == "new" and latest["created_at"] == 200
+    assert latest["outlet_analysis"] == data["outlet_analysis"]
+    assert latest["articles"] == data["articles"]
+    assert store.latest("election", max_age=60) is None
+    assert store.latest("election", model="other") is None
+
+def test_bias_counts_and_trend(store):
+    store.record("trade", result([("CNN", "USA", "Neutral"), ("Fox", "USA", "Extreme Bias (Distraction)")]),
+                 created_at=86400 * 10)
+    store.record("climate", result([("CNN", "USA", "Slightly Negative")]), created_at=86400 * 11 + 5)
+    by_outlet = {row["outlet"]: row for row in store.bias_counts(by="outlet")}
+    assert by_outlet["CNN"]["total"] == 2 and by_outlet["CNN"]["score"] == 0.5
+    assert by_outlet["Fox"]["Extreme Bias (Distraction)"] == 1
+    assert store.bias_counts(by="country")[0]["total"] == 3
+    assert [row["topic"] for row in store.bias_counts(by="topic", outlet="CNN")] == ["climate", "trade"]
+    trend = store.bias_trend(bucket=86400)
+    assert [(row["start"], row["total"]) for row in trend] == [(86400 * 10, 2), (86400 * 11, 1)]
+    assert [row["total"] for row in store.bias_trend(since=86400 * 11)] == [1]
+
+def test_record_many_skips_failed_and_reused_records(store):
+    records = [dict(result([("CNN", "USA", "Neutral")]), topic="a"),
+               dict(result([("CNN", "USA", "Neutral")]), topic="b", error="boom"),
+               dict(result([("CNN", "USA", "Neutral")]), topic="c", reused=True),
+               {"topic": "d", "response": '{"summary": "s", "articles": [{"newsoutlet": "NHK", '
+                                          '"country_of_origin": "Japan", "bias_level": "Neutral"}]}'}]
+    assert store.record_many(records, model="m") == 2
+    assert store.latest("b") is None and store.latest("c") is None
+    # Records without parsed outlets are parsed from the response
+    assert store.latest("d")["outlet_analysis"][0]["newsoutlet"] == "NHK"
+
+def test_prune_drops_old_analyses_and_their_outlets(store):
+    store.record("old", result([("CNN", "USA", "Neutral")]), created_at=100)
+    store.record("new", result([("BBC", "UK", "Neutral")]), created_at=1000)
+    assert store.prune(500) == 1
+    assert [row["outlet"] for row in store.bias_counts()] == ["BBC"]
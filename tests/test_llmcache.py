@@ -0,0 +1,77 @@
+import pytest
+import requests
+
+from mcpnews.llmcache import ResponseCache
+from mcpnews.ollamaclient import OllamaClient
+from mcpnews.standins import canned_analysis, start_ollama_standin, server_url
+
+PROMPT = "Respond in JSON\nSource: CNN (USA)\n"
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+    yield cache
+    cache.close()
+
+def test_put_get_and_options_are_part_of_the_key(cache):
+    cache.put("m", "p", "answer")
+    assert cache.get("m", "p") == "answer"
+    assert cache.get("m", "p", {"temperature": 0}) is None
+    assert cache.get("other", "p") is None
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = ResponseCache(str(tmp_path / "r.sqlite3"), ttl=-1)
+    cache.put("m", "p", "answer")
+    assert cache.get("m", "p") is None
+    assert cache.stats["expired"] == 1
+    cache.close()
+
+def test_lru_eviction_by_size(tmp_path):
+    cache = ResponseCache(str(tmp_path / "r.sqlite3"), max_bytes=10)
+    cache.put("m", "a", "12345")
+    cache.put("m", "b", "12345")
+    cache.get("m", "a")
+    cache.put("m", "c", "12345")
+    assert cache.get("m", "a") == "12345"
+    assert cache.get("m", "b") is None
+    cache.close()
+
+def test_completed_stream_is_stored(cache):
+    assert "".join(cache.cached_stream("m", "p", lambda: iter(["a", "b"]))) == "ab"
+    assert list(cache.cached_stream("m", "p", lambda: iter(["never"]))) == ["ab"]
+
+def test_abandoned_stream_is_not_stored(cache):
+    stream = cache.cached_stream("m", "p", lambda: iter(["a", "b", "c"]))
+    next(stream)
+    stream.close()
+    assert cache.get("m", "p") is None
+
+def test_broken_stream_is_not_stored(cache):
+    def broken():
+        yield "a"
+        raise requests.ConnectionError("reset")
+
+    with pytest.raises(requests.ConnectionError):
+        list(cache.cached_stream("m", "p", broken))
+    assert cache.get("m", "p") is None
+
+def test_stream_without_done_is_not_stored(cache):
+    server = start_ollama_standin(truncate_after=3)
+    client = OllamaClient(server_url(server))
+    try:
+        with pytest.raises(requests.ConnectionError):
+            list(cache.cached_stream("m", PROMPT, lambda: client.stream(PROMPT, "m")))
+        assert cache.get("m", PROMPT) is None
+    finally:
+        client.close()
+        server.shutdown()
+
+def test_ollama_stream_is_stored_once_done(cache):
+    server = start_ollama_standin()
+    client = OllamaClient(server_url(server))
+    try:
+        assert "".join(cache.cached_stream("m", PROMPT, lambda: client.stream(PROMPT, "m"))) == canned_analysis(PROMPT)
+        assert cache.get("m", PROMPT) == canned_analysis(PROMPT)
+    finally:
+        client.close()
+        server.shutdown()
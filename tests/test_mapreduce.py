@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mcpnews.mapreduce import run_mapreduce
+from mcpnews.ollamaclient import OllamaClient
+from mcpnews.standins import start_ollama_standin, server_url
+
+def articles(count):
+    return [{"source": f"Outlet {i}", "country": "USA", "title": f"Story {i}", "summary": "Text.",
+             "link": f"http://x/{i}"} for i in range(count)]
+
+@pytest.fixture
+def ollama():
+    server = start_ollama_standin(prefill_delay=0.1)
+    yield server
+    server.shutdown()
+
+def test_result_has_single_mode_keys(ollama):
+    client = OllamaClient(server_url(ollama))
+    result = run_mapreduce("trade", articles(3), client=client, cache=None)
+    client.close()
+    assert {"prompt", "response", "articles", "summary", "outlet_analysis", "prompt_stats"} <= set(result)
+    assert [o["newsoutlet"] for o in result["outlet_analysis"]] == ["Outlet 0", "Outlet 1", "Outlet 2"]
+    assert result["summary"].startswith("3 outlets analysed")
+
+def test_concurrency_is_capped_at_the_client_limit(ollama):
+    client = OllamaClient(server_url(ollama), max_concurrency=2)
+    run_mapreduce("trade", articles(8), client=client, cache=None, concurrency=8)
+    client.close()
+    assert ollama.stats["peak_in_flight"] == 2
+
+def test_concurrent_maps_share_the_client_limit(ollama):
+    # Like batch workers running map-reduce topics side by side
+    client = OllamaClient(server_url(ollama), max_concurrency=3)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: run_mapreduce("trade", articles(4), client=client, cache=None), range(4)))
+    client.close()
+    assert ollama.stats["peak_in_flight"] == 3
+
+def test_failed_outlets_are_left_out():
+    server = start_ollama_standin(fail_first=100)
+    try:
+        client = OllamaClient(server_url(server), retries=0)
+        result = run_mapreduce("trade", articles(2), client=client, cache=None)
+        client.close()
+    finally:
+        server.shutdown()
+    assert result["outlet_analysis"] == []
+    assert "2 could not be analysed" in result["summary"]
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from mcpnews.ollamaclient import OllamaClient
+from mcpnews.standins import canned_analysis, start_ollama_standin, server_url
+
+PROMPT = "Respond in JSON\nSource: CNN (USA)\nSource: NDTV (India)\n"
+
+@pytest.fixture
+def standin():
+    servers = []
+
+    def start(**kwargs):
+        server = start_ollama_standin(**kwargs)
+        servers.append(server)
+        return server
+    yield start
+    for server in servers:
+        server.shutdown()
+
+def test_generate_returns_the_full_response(standin):
+    client = OllamaClient(server_url(standin()))
+    assert client.generate(PROMPT, "m") == canned_analysis(PROMPT)
+    client.close()
+
+def test_retries_retryable_statuses(standin):
+    server = standin(fail_first=2)
+    client = OllamaClient(server_url(server), retries=2, backoff=0.01)
+    assert client.generate(PROMPT, "m") == canned_analysis(PROMPT)
+    assert server.stats["requests"] == 3
+    client.close()
+
+def test_gives_up_after_the_last_retry(standin):
+    server = standin(fail_first=3)
+    client = OllamaClient(server_url(server), retries=2, backoff=0.01)
+    with pytest.raises(requests.HTTPError):
+        client.generate(PROMPT, "m")
+    assert server.stats["requests"] == 3
+    client.close()
+
+def test_retries_a_stream_before_it_starts(standin):
+    server = standin(fail_first=1)
+    client = OllamaClient(server_url(server), backoff=0.01)
+    fragments = list(client.stream(PROMPT, "m"))
+    assert len(fragments) > 1
+    assert "".join(fragments) == canned_analysis(PROMPT)
+    assert server.stats["requests"] == 2
+    client.close()
+
+def test_connection_errors_are_raised_after_retries():
+    client = OllamaClient("http://127.0.0.1:9", retries=1, backoff=0.01)
+    with pytest.raises(requests.ConnectionError):
+        client.generate(PROMPT, "m")
+
+def test_concurrency_is_capped(standin):
+    server = standin(prefill_delay=0.1)
+    client = OllamaClient(server_url(server), max_concurrency=2)
+    prompts = [f"Source: Outlet {i} (USA)\n" for i in range(6)]
+    assert client.generate_many(prompts, "m") == [canned_analysis(prompt) for prompt in prompts]
+    assert server.stats["peak_in_flight"] == 2
+    client.close()
+
+def test_abandoned_stream_releases_its_slot(standin):
+    client = OllamaClient(server_url(standin(token_delay=0.01)), max_concurrency=1)
+    stream = client.stream(PROMPT, "m")
+    next(stream)
+    stream.close()
+    assert client.generate(PROMPT, "m") == canned_analysis(PROMPT)
+    client.close()
+
+def test_cancel_during_prefill_ends_the_stream(standin):
+    client = OllamaClient(server_url(standin(prefill_delay=1.0)), max_concurrency=1)
+    cancel = threading.Event()
+    threading.Timer(0.1, cancel.set).start()
+    start = time.perf_counter()
+    with pytest.raises(requests.ConnectionError, match="cancelled"):
+        list(client.stream(PROMPT, "m", cancel=cancel))
+    assert time.perf_counter() - start < 0.5
+    # A stream with an unset cancel event runs to completion
+    assert "".join(client.stream(PROMPT, "m", cancel=threading.Event())) == canned_analysis(PROMPT)
+    client.close()
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from mcpnews.outletparser import OutletStream, parse_analysis, repair_json
+from mcpnews.standins import canned_analysis, split_tokens
+
+ARTICLES = [
+    {"newsoutlet": "BBC News", "newsanalysis": "Measured tone.", "country_of_origin": "UK", "bias_level": "Neutral"},
+    {"newsoutlet": "RT", "newsanalysis": "Loaded framing.", "country_of_origin": "Russia",
+     "bias_level": "Extreme Bias (Distraction)"},
+]
+RESPONSE = json.dumps({"summary": "Coverage differs.", "articles": ARTICLES}, indent=2)
+
+def outlets(result):
+    return [article["newsoutlet"] for article in result["articles"]]
+
+def stream_parse(text, pieces):
+    stream = OutletStream()
+    streamed = []
+    for piece in pieces:
+        streamed += stream.feed(piece)
+    return streamed, stream.close()
+
+def test_plain_json():
+    assert parse_analysis(RESPONSE) == {"summary": "Coverage differs.", "articles": ARTICLES}
+
+def test_code_fence_with_prose():
+    result = parse_analysis("Sure, here is the analysis:\n```json\n" + RESPONSE + "\n```\nHope this helps!")
+    assert result["summary"] == "Coverage differs."
+    assert outlets(result) == ["BBC News", "RT"]
+
+def test_truncated_output_keeps_complete_outlets():
+    cut = RESPONSE[:RESPONSE.index('"Loaded')]
+    result = parse_analysis(cut)
+    assert outlets(result) == ["BBC News", "RT"]
+    assert result["articles"][1]["newsanalysis"] == ""
+    assert parse_analysis(RESPONSE[:RESPONSE.index('"RT"')])["articles"] == ARTICLES[:1]
+
+def test_single_quotes_and_unquoted_keys():
+    text = ("{summary: 'It\\'s mixed', articles: [{newsoutlet: 'Fox News', 'newsanalysis': 'The outlet's angle',"
+            " country: 'USA', bias: 'slightly negative'}]}")
+    result = parse_analysis(text)
+    assert result["summary"] == "It's mixed"
+    assert result["articles"] == [{"newsoutlet": "Fox News", "newsanalysis": "The outlet's angle",
+                                   "country_of_origin": "USA", "bias_level": "Slightly Negative"}]
+
+def test_trailing_commas_and_python_literals():
+    text = '{"summary": "s", "articles": [{"newsoutlet": "CNN", "bias_level": None, "extra": True,},],}'
+    assert json.loads(repair_json(text)) == {
+        "summary": "s", "articles": [{"newsoutlet": "CNN", "bias_level": None, "extra": True}]}
+    assert parse_analysis(text)["articles"][0]["bias_level"] == "None"
+
+@pytest.mark.parametrize("aside", ["[the outlet's view]", "[note: it's brief]", "[outlets' takes, 2]"])
+def test_prose_brackets_before_the_answer(aside):
+    text = f"Below {aside} is my answer.\n```json\n{RESPONSE}\n```"
+    assert parse_analysis(text) == {"summary": "Coverage differs.", "articles": ARTICLES}
+    # Without a fence the whole-response fallback must skip the aside as well
+    assert outlets(parse_analysis(f"Below {aside} is my answer. {RESPONSE}")) == ["BBC News", "RT"]
+
+def test_invalid_elements_are_dropped():
+    text = '{"articles": [{"newsanalysis": "no outlet"}, 42, {"newsoutlet": "NDTV"}]}'
+    assert outlets(parse_analysis(text)) == ["NDTV"]
+
+@pytest.mark.parametrize("text", [
+    RESPONSE,
+    "```json\n" + RESPONSE + "\n```",
+    "Here [the outlet's view] first:\n" + RESPONSE,
+    "{'summary': 'It's fine', 'articles': [{'newsoutlet': 'RT', 'newsanalysis': 'The outlet's framing'},]}",
+    canned_analysis("Respond in JSON\nSource: CNN (USA)\nSource: NDTV (India)\nSource: Japan Times (Japan)\n"),
+    RESPONSE[:len(RESPONSE) * 3 // 4],
+])
+def test_streaming_agrees_with_whole_response(text):
+    whole = parse_analysis(text)
+    for pieces in (split_tokens(text), list(text)):
+        streamed, closed = stream_parse(text, pieces)
+        assert closed == whole
+        # Outlets surfaced while streaming are a prefix of the final list, in order
+        assert streamed == whole["articles"][:len(streamed)]
+
+def test_outlets_arrive_before_the_response_ends():
+    stream = OutletStream()
+    assert stream.feed(RESPONSE[:RESPONSE.index('"RT"')]) == ARTICLES[:1]
+    assert stream.feed(RESPONSE[RESPONSE.index('"RT"'):]) == ARTICLES[1:]
@@ -0,0 +1,45 @@
+import numpy as np
+
+from mcpnews.projection import (StreamingPCA, gather_rope_rows, iter_rope_chunks, iter_row_chunks,
+                                project_rope_embeddings)
+from mcpnews.rope import stacked_rope_embeddings
+
+def embeddings(vocab=300, dim=12):
+    rng = np.random.default_rng(0)
+    return (rng.normal(size=(vocab, dim)) * np.linspace(3, 0.5, dim)).astype(np.float32)
+
+def dense_pca(data, n_components=3):
+    centered = data - data.mean(axis=0)
+    _, _, vt = np.linalg.svd(centered.astype(np.float64), full_matrices=False)
+    components = vt[:n_components]
+    signs = np.sign(components[np.arange(n_components), np.argmax(np.abs(components), axis=1)])
+    return centered @ (components * signs[:, np.newaxis]).T
+
+def test_rope_chunks_cover_the_stack():
+    matrix = embeddings()
+    stacked = stacked_rope_embeddings(matrix, [0, 5, 9])
+    rebuilt = np.empty_like(stacked)
+    for start, chunk in iter_rope_chunks(matrix, [0, 5, 9], chunk_rows=64):
+        rebuilt[start:start + len(chunk)] = chunk
+    np.testing.assert_allclose(rebuilt, stacked, rtol=1e-6, atol=1e-6)
+    rows = [0, 299, 300, 777, 899]
+    np.testing.assert_allclose(gather_rope_rows(matrix, [0, 5, 9], rows), stacked[rows], rtol=1e-6, atol=1e-6)
+
+def test_streaming_pca_matches_dense_pca():
+    matrix = embeddings()
+    positions = [0, 5, 9]
+    coords, pca = project_rope_embeddings(matrix, positions, chunk_rows=64)
+    expected = dense_pca(stacked_rope_embeddings(matrix, positions))
+    np.testing.assert_allclose(coords, expected, rtol=1e-3, atol=1e-3)
+    assert coords.shape == (900, 3)
+    assert np.all(np.diff(pca.explained_variance_ratio_) <= 0)
+
+def test_incremental_method_spans_the_same_subspace():
+    rng = np.random.default_rng(1)
+    data = (rng.normal(size=(2000, 12)) * ([8, 5, 3] + [0.5] * 9)).astype(np.float32)
+    exact = StreamingPCA(method="covariance").fit(iter_row_chunks(data, 256))
+    incremental = StreamingPCA(method="incremental").fit(iter_row_chunks(data, 256))
+    overlap = np.abs(exact.components_ @ incremental.components_.T)
+    np.testing.assert_allclose(np.sort(overlap.max(axis=1)), 1, atol=1e-3)
+    out = incremental.transform(iter_row_chunks(data, 256), len(data))
+    assert out.shape == (2000, 3) and out.dtype == np.float32
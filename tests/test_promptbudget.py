@@ -0,0 +1,39 @@
+from mcpnews.promptbudget import article_tokens, budget_articles, strip_html, truncate_tokens
+
+WIRE = "Officials confirmed on Tuesday that the central bank will raise interest rates by half a point next month"
+
+def article(source, title, summary, country="USA"):
+    return {"source": source, "country": country, "title": title, "summary": summary,
+            "link": f"http://example.com/{source}/{len(title)}"}
+
+def test_strip_html_and_truncate_tokens():
+    assert strip_html("<p>Rates &amp; <b>bonds</b></p>\n rise") == "Rates & bonds rise"
+    assert truncate_tokens("short text", 10) == "short text"
+    truncated = truncate_tokens("one two three four five six seven eight", 4)
+    assert truncated.endswith("…") and len(truncated) <= 16
+    assert " ".join(truncated[:-1].split()) == truncated[:-1]
+
+def test_duplicates_are_dropped_within_an_outlet_and_referenced_across_outlets():
+    articles = [article("CNN", "Rates rise", WIRE), article("CNN", "Rates rise again", WIRE + "."),
+                article("BBC", "Bank raises rates", WIRE, country="UK")]
+    kept, stats = budget_articles(articles)
+    assert [a["source"] for a in kept] == ["CNN", "BBC"]
+    assert kept[1]["title"] == "Bank raises rates"
+    assert kept[1]["summary"] == "(Same story as the CNN article.)"
+    assert stats["duplicates"] == 2
+
+def test_summaries_are_truncated_to_the_outlet_share():
+    articles = [article("CNN", f"Story {i}", f"Distinct story number {i} " + "details " * 200) for i in range(3)]
+    kept, stats = budget_articles(articles, per_source_tokens=150)
+    assert stats["truncated"] == 3
+    assert all(article_tokens(a) <= 50 for a in kept)
+
+def test_total_budget_keeps_every_outlet_represented():
+    articles = [article(source, f"{source} story {i}", f"{source} unique coverage item {i} " * 2)
+                for source in ("CNN", "BBC", "NHK") for i in range(4)]
+    kept, stats = budget_articles(articles, per_source_tokens=1000, total_tokens=150)
+    assert {a["source"] for a in kept} == {"CNN", "BBC", "NHK"}
+    assert stats["article_tokens"] <= 150
+    assert stats["articles"] + stats["dropped"] == 12
+    # The caller's order is kept
+    assert [a["source"] for a in kept] == sorted((a["source"] for a in kept), key=["CNN", "BBC", "NHK"].index)
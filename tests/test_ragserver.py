@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+import pytest
+
+from mcpnews.ragserver import MicroBatchServer, serve_queries
+
+class FakeStore:
+    def __init__(self, release=None):
+        self.release = release
+        self.batches = []
+
+    def search_many(self, queries, k):
+        if self.release is not None:
+            self.release.wait(5)
+        self.batches.append(list(queries))
+        return [[(f"issue for {query}", 1.0)] for query in queries]
+
+def test_queries_are_batched():
+    store = FakeStore()
+    results, metrics = asyncio.run(serve_queries(store, [f"q{i}" for i in range(8)], window=0.05))
+    assert [result["candidates"][0][0] for result in results] == [f"issue for q{i}" for i in range(8)]
+    assert metrics["requests"] == 8
+    assert len(store.batches) < 8
+
+def test_stop_fails_queued_and_in_flight_requests():
+    release = threading.Event()
+
+    async def scenario():
+        server = MicroBatchServer(FakeStore(release), window=0, max_batch=1)
+        await server.start()
+        tasks = [asyncio.create_task(server.submit(f"q{i}")) for i in range(3)]
+        await asyncio.sleep(0.05)
+        # q0 is mid-search, q1 and q2 are still queued
+        await server.stop()
+        release.set()
+        return await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 2)
+
+    results = asyncio.run(scenario())
+    assert [type(result) for result in results] == [RuntimeError] * 3
+
+def test_submit_requires_a_running_server():
+    async def scenario():
+        await MicroBatchServer(FakeStore()).submit("q")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(scenario())
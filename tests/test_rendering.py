@@ -0,0 +1,39 @@
+import os
+
+import numpy as np
+import pytest
+
+from mcpnews.rendering import decimate, export_figures, use_headless
+
+def scatter_figure(n, seed=0):
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(2, 2))
+    fig.add_subplot().scatter(*np.random.default_rng(seed).normal(size=(2, n)))
+    return fig
+
+def test_small_inputs_are_not_decimated():
+    assert decimate(np.zeros((10, 2)), max_points=20).tolist() == list(range(10))
+
+@pytest.mark.parametrize("method", ["grid", "random"])
+def test_decimation_is_bounded_and_keeps_requested_rows(method):
+    points = np.random.default_rng(0).normal(size=(50000, 3))
+    keep = [0, 17, 49999]
+    chosen = decimate(points, max_points=1000, keep=keep, method=method)
+    assert len(chosen) <= 1003 and set(keep) <= set(chosen.tolist())
+    assert len(np.unique(chosen)) == len(chosen)
+
+def test_grid_decimation_keeps_sparse_outliers():
+    rng = np.random.default_rng(1)
+    points = np.vstack([rng.normal(scale=0.01, size=(50000, 2)), [[5.0, 5.0], [-5.0, 5.0]]])
+    chosen = decimate(points, max_points=500, method="grid")
+    assert {50000, 50001} <= set(chosen.tolist())
+
+def test_export_figures_writes_pngs_in_job_order(tmp_path):
+    use_headless(force=True)
+    jobs = [(scatter_figure, {"n": 100, "seed": i}, str(tmp_path / f"plot{i}.png")) for i in range(2)]
+    paths = export_figures(jobs, processes=1)
+    assert paths == [job[2] for job in jobs]
+    for path in paths:
+        with open(path, "rb") as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+        assert os.path.getsize(path) > 0
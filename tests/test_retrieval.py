@@ -0,0 +1,106 @@
+import os
+
+import numpy as np
+
+import mcpnews.training_phi_rag as training_phi_rag
+from mcpnews.retrieval import IssueStore, hash_embed
+
+ISSUES = [f"Issue {i}: checkout fails with error {i * 7} on device {i % 5}" for i in range(40)]
+
+class CountingEmbedder:
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, texts):
+        self.texts.extend(texts)
+        return hash_embed(texts)
+
+def assert_matches_fresh_build(store, issues):
+    fresh = IssueStore.build(issues, hash_embed)
+    np.testing.assert_allclose(store.vectors, fresh.vectors, atol=1e-6)
+    for query in ["error 21 on device 3", "checkout fails on device 1"]:
+        assert store.search(query, k=3) == fresh.search(query, k=3)
+
+def test_update_embeds_only_new_and_edited_issues():
+    embed = CountingEmbedder()
+    store = IssueStore.build(ISSUES, embed)
+    issues = ISSUES[5:] + ["A brand new issue"]
+    issues[3] = "Edited issue text"
+    embed.texts.clear()
+    assert store.update(issues) == (2, 6)
+    assert sorted(embed.texts) == ["A brand new issue", "Edited issue text"]
+    assert_matches_fresh_build(store, issues)
+
+def test_update_keeps_index_ids_and_updates_it_in_place():
+    store = IssueStore.build(ISSUES, hash_embed)
+    index = store.build_index(n_lists=2, nprobe=2)
+    issues = ["Payment declined with Visa card"] + ISSUES[10:]
+    store.update(issues)
+    assert store.index is index
+    assert len(index) == len(issues)
+    assert store.search("Payment declined with Visa card", k=1)[0][0] == "Payment declined with Visa card"
+    # With every list probed the index is exact, so it must agree with the matrix
+    exact_ids, _ = store.search_vectors(hash_embed(ISSUES[12:13]), k=3, exact=True)
+    ann_ids, _ = store.search_vectors(hash_embed(ISSUES[12:13]), k=3)
+    assert exact_ids.tolist() == ann_ids.tolist()
+
+def test_duplicate_issues_keep_one_row_each():
+    store = IssueStore.build(["a b", "c d"], hash_embed)
+    store.update(["c d", "a b", "a b"])
+    assert store.issues == ["c d", "a b", "a b"]
+    assert len(set(store.ids.tolist())) == 3
+    assert_matches_fresh_build(store, ["c d", "a b", "a b"])
+
+def test_load_issue_store_reuses_persisted_embeddings(tmp_path, monkeypatch):
+    monkeypatch.setattr(training_phi_rag, "ANN_MIN_ISSUES", 10)
+    directory = str(tmp_path / "issues")
+    embed = CountingEmbedder()
+    store = training_phi_rag.load_issue_store(ISSUES, embed, directory)
+    assert store.index is not None and len(embed.texts) == len(ISSUES)
+
+    embed.texts.clear()
+    training_phi_rag.load_issue_store(ISSUES, embed, directory)
+    assert embed.texts == []
+
+    issues = ISSUES[1:] + ["Login loops back to the sign-in page"]
+    store = training_phi_rag.load_issue_store(issues, embed, directory)
+    assert embed.texts == ["Login loops back to the sign-in page"]
+    assert len(store.index) == len(issues)
+    store = IssueStore.load(directory, hash_embed)
+    assert store.issues == issues and len(store.index) == len(issues)
+    assert store.search("Login loops back to the sign-in page", k=1)[0][0] == issues[-1]
+
+def test_load_issue_store_rebuilds_for_another_embedder(tmp_path):
+    directory = str(tmp_path / "issues")
+    training_phi_rag.load_issue_store(ISSUES, hash_embed, directory)
+    embed = CountingEmbedder()
+    embed.embedder_id = "counting"
+    training_phi_rag.load_issue_store(ISSUES, embed, directory)
+    assert len(embed.texts) == len(ISSUES)
+    assert IssueStore.load(directory, embed).embedder == "counting"
+    embed.texts.clear()
+    training_phi_rag.load_issue_store(ISSUES + ["One more"], embed, directory)
+    assert embed.texts == ["One more"]
+
+def test_load_issue_store_rebuilds_on_a_dimension_change(tmp_path):
+    directory = str(tmp_path / "issues")
+    small = CountingEmbedder()
+    small.embedder_id = "model"
+    training_phi_rag.load_issue_store(ISSUES, small, directory)
+
+    def wide(texts):
+        return hash_embed(texts, dim=64)
+    wide.embedder_id = "model"
+    store = training_phi_rag.load_issue_store(ISSUES[1:] + ["Changed"], wide, directory)
+    assert store.vectors.shape == (len(ISSUES), 64)
+    assert store.search("Changed", k=1)[0][0] == "Changed"
+
+def test_stores_without_a_recorded_embedder_are_rebuilt(tmp_path):
+    directory = str(tmp_path / "issues")
+    IssueStore.build(ISSUES, hash_embed).save(directory)
+    os.remove(os.path.join(directory, "meta.json"))
+    assert IssueStore.load(directory, hash_embed).embedder == "unknown"
+    embed = CountingEmbedder()
+    embed.embedder_id = hash_embed.embedder_id
+    training_phi_rag.load_issue_store(ISSUES, embed, directory)
+    assert len(embed.texts) == len(ISSUES)
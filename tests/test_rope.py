@@ -0,0 +1,47 @@
+import numpy as np
+
+from mcpnews.rope import apply_rope_positions, embedding_cache_path, load_embedding_matrix, stacked_rope_embeddings
+
+def loop_rope(matrix, positions):
+    # plot_embeddings' original apply_rope, one position at a time
+    half_dim = matrix.shape[1] // 2
+    theta = 10000 ** (-np.arange(0, half_dim, dtype=np.float32) / half_dim)
+    rotated = []
+    for position in positions:
+        cos, sin = np.cos(position * theta), np.sin(position * theta)
+        out = np.empty_like(matrix)
+        out[:, 0::2] = matrix[:, 0::2] * cos - matrix[:, 1::2] * sin
+        out[:, 1::2] = matrix[:, 0::2] * sin + matrix[:, 1::2] * cos
+        rotated.append(out)
+    return np.concatenate(rotated)
+
+def embeddings(vocab=64, dim=16):
+    return np.random.default_rng(0).normal(size=(vocab, dim)).astype(np.float32)
+
+def test_matches_the_per_position_loop():
+    matrix = embeddings()
+    positions = [0, 1, 7, 100]
+    np.testing.assert_allclose(stacked_rope_embeddings(matrix, positions), loop_rope(matrix, positions),
+                               rtol=1e-5, atol=1e-5)
+    np.testing.assert_array_equal(apply_rope_positions(matrix, [0])[0], matrix)
+
+def test_rotation_preserves_pair_norms():
+    matrix = embeddings()
+    rotated = apply_rope_positions(matrix, [3, 42])
+    pair_norms = np.hypot(matrix[:, 0::2], matrix[:, 1::2])
+    for out in rotated:
+        np.testing.assert_allclose(np.hypot(out[:, 0::2], out[:, 1::2]), pair_norms, rtol=1e-5)
+
+def test_stack_written_to_a_memmap(tmp_path):
+    matrix = embeddings()
+    path = str(tmp_path / "stack.npy")
+    stacked = stacked_rope_embeddings(matrix, [1, 2, 3], path=path)
+    assert stacked.shape == (3 * 64, 16)
+    np.testing.assert_array_equal(np.load(path).reshape(-1, 16), stacked)
+
+def test_cached_embedding_matrix_is_memory_mapped(tmp_path):
+    matrix = embeddings()
+    np.save(embedding_cache_path("org/model", str(tmp_path)), matrix)
+    loaded = load_embedding_matrix("org/model", cache_dir=str(tmp_path))
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_array_equal(loaded, matrix)
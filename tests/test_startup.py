@@ -0,0 +1,34 @@
+import ast
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["requests", "feedparser", "matplotlib", "mpl_toolkits.basemap", "numpy"]
+
+def loaded_after(code):
+    # Heavy modules present in a fresh interpreter after running `code`
+    check = f"\nimport json, sys; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(PACKAGE_DIR))
+    done = subprocess.run([sys.executable, "-c", code + check], capture_output=True, text=True, env=env,
+                          check=True)
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+def newsanalyser_imports():
+    # Its module-level imports only; importing the script itself opens the window
+    with open(os.path.join(PACKAGE_DIR, "newsanalyser.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+@pytest.mark.parametrize("code", ["import mcpnews.mcpnews", newsanalyser_imports()], ids=["mcpnews", "newsanalyser"])
+def test_entry_points_defer_heavy_imports(code):
+    assert loaded_after(code) == []
+
+def test_first_fetch_loads_requests():
+    # feedparser follows with the first successful download
+    code = ("from mcpnews.feedfetch import fetch_feeds\n"
+            "fetch_feeds({'x': 'http://127.0.0.1:9/'}, timeout=0.5)")
+    assert loaded_after(code) == ["requests"]
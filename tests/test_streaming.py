@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+
+from mcpnews.history import AnalysisStore
+from mcpnews.llmcache import ResponseCache
+from mcpnews.mcpnews import iter_mcp_analysis
+from mcpnews.ollamaclient import OllamaClient
+from mcpnews.standins import start_feed_standin, start_ollama_standin, server_url
+from mcpnews.topicindex import TopicIndex
+
+FEEDS = {"CNN": {"url": "", "country": "USA"}, "BBC": {"url": "", "country": "UK"},
+         "NHK": {"url": "", "country": "Japan"}}
+
+@pytest.fixture
+def pipeline(tmp_path):
+    # Keyword arguments for iter_mcp_analysis against stand-in feeds and Ollama
+    feed_server, feeds = start_feed_standin(FEEDS, {"NHK": 0.2})
+    ollama_server = start_ollama_standin(token_delay=0.001)
+    client = OllamaClient(server_url(ollama_server))
+    llm_cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+    history = AnalysisStore(str(tmp_path / "history.sqlite3"))
+    yield dict(feeds=feeds, cache=None, index=TopicIndex(), client=client, llm_cache=llm_cache,
+               history=history, poller=None)
+    history.close()
+    llm_cache.close()
+    client.close()
+    feed_server.shutdown()
+    ollama_server.shutdown()
+
+def test_events_arrive_in_pipeline_order(pipeline):
+    events = list(iter_mcp_analysis("election", **pipeline))
+    kinds = [kind for kind, _ in events]
+    assert kinds[:3] == ["articles"] * 3 and kinds[3] == "prompt" and kinds[-1] == "done"
+    # The slow outlet arrives last
+    assert events[2][1][0] == "NHK"
+    result = events[-1][1]
+    assert "".join(payload for kind, payload in events if kind == "token") == result["response"]
+    assert [payload for kind, payload in events if kind == "outlet"] == result["outlet_analysis"]
+    assert len(result["outlet_analysis"]) == 3
+    assert pipeline["history"].latest("election")["outlet_analysis"] == result["outlet_analysis"]
+
+def test_cancel_stops_the_generation_without_storing_it(pipeline):
+    cancel = threading.Event()
+    kinds = []
+    for kind, _ in iter_mcp_analysis("election", cancel=cancel, **pipeline):
+        kinds.append(kind)
+        if kind == "token":
+            cancel.set()
+    assert kinds[-1] == "token" and kinds.count("token") == 1
+    assert pipeline["history"].latest("election") is None
+    assert pipeline["llm_cache"].stats["hits"] == 0
+    # The next run generates again rather than replaying a truncated response
+    assert list(iter_mcp_analysis("election", **pipeline))[-1][0] == "done"
+    assert pipeline["llm_cache"].stats["hits"] == 0
+
+def test_unknown_topic_and_failed_outlets_are_reported(pipeline):
+    pipeline["feeds"]["Gone"] = {"url": pipeline["feeds"]["CNN"]["url"] + "-gone", "country": "UK"}
+    events = list(iter_mcp_analysis("volcano", **pipeline))
+    assert [payload[0] for kind, payload in events if kind == "skipped"] == ["Gone"]
+    assert events[-1] == ("error", "No articles found for topic: volcano")
+
+def consume_until_cancelled(events, cancel, on_kind):
+    # Kinds of the events yielded, with `cancel` set 0.2 s after the first `on_kind` one
+    kinds = []
+    timer = None
+    for kind, _ in events:
+        kinds.append(kind)
+        if kind == on_kind and timer is None:
+            timer = threading.Timer(0.2, cancel.set)
+            timer.start()
+    timer.join()
+    return kinds
+
+def test_cancel_during_a_stalled_prefill_releases_the_client(pipeline):
+    slow_server = start_ollama_standin(prefill_delay=1.0)
+    client = OllamaClient(server_url(slow_server), max_concurrency=1)
+    pipeline.update(client=client, llm_cache=None, history=None)
+    try:
+        cancel = threading.Event()
+        start = time.perf_counter()
+        kinds = consume_until_cancelled(iter_mcp_analysis("election", cancel=cancel, **pipeline), cancel, "prompt")
+        assert kinds[-1] == "prompt"
+        assert time.perf_counter() - start < 0.7
+        # The cancelled generation no longer holds the only slot
+        start = time.perf_counter()
+        assert list(iter_mcp_analysis("election", **pipeline))[-1][0] == "done"
+        assert time.perf_counter() - start < 1.6
+    finally:
+        client.close()
+        slow_server.shutdown()
+
+def test_cancel_during_a_slow_fetch_stops_the_sweep(pipeline):
+    feed_server, feeds = start_feed_standin(FEEDS, {"NHK": 3.0})
+    pipeline["feeds"] = feeds
+    try:
+        cancel = threading.Event()
+        start = time.perf_counter()
+        kinds = consume_until_cancelled(iter_mcp_analysis("election", cancel=cancel, **pipeline), cancel,
+                                           "articles")
+        assert kinds == ["articles", "articles"]
+        assert time.perf_counter() - start < 1.0
+    finally:
+        feed_server.shutdown()
@@ -0,0 +1,65 @@
+import os
+import threading
+import tracemalloc
+
+from mcpnews.telemetry import Tracer, profiled
+
+# Run from the parent directory: python -m pytest mcpnews/tests
+
+def test_spans_nest_and_aggregate():
+    tracer = Tracer()
+    with tracer.span("analysis") as outer:
+        with tracer.span("fetch") as inner:
+            inner.count("bytes", 10)
+    assert inner.parent_id == outer.span_id
+    assert inner.trace_id == outer.trace_id
+    summary = tracer.summary()
+    assert summary["fetch"]["count"] == 1
+    assert summary["fetch"]["counters"] == {"bytes": 10}
+    assert 'mcpnews_stage_items_total{stage="fetch",counter="bytes"} 10' in tracer.prometheus_text()
+
+def test_span_records_error():
+    tracer = Tracer()
+    try:
+        with tracer.span("llm"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert tracer.summary()["llm"]["errors"] == 1
+
+def test_concurrent_profiles(tmp_path):
+    # Overlapping profiles share tracemalloc; none may find it stopped under it.
+    # Only one of them can hold the CPU profiler, the others skip it.
+    errors = []
+    reports = []
+    started = threading.Barrier(4)
+
+    def worker(i):
+        try:
+            with profiled("batch", cpu=True, memory=True, out_dir=str(tmp_path)) as report:
+                started.wait()
+                [0] * (10000 * (i + 1))
+            reports.append(report)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert not tracemalloc.is_tracing()
+    # Same name, same second: every run keeps its own report
+    assert len({report["report"] for report in reports}) == 4
+    profiled_reports = [report for report in reports if "prof" in report]
+    assert len(profiled_reports) == 1 and os.path.exists(profiled_reports[0]["prof"])
+    for report in reports:
+        if report is not profiled_reports[0]:
+            assert report["cpu_skipped"]
+            with open(report["report"], encoding="utf-8") as f:
+                assert "cProfile: skipped" in f.read()
+    # The CPU profiler is free again afterwards
+    with profiled("batch", out_dir=str(tmp_path)) as report:
+        pass
+    assert "prof" in report and "cpu_skipped" not in report
@@ -0,0 +1,41 @@
+import feedparser
+
+from mcpnews.topicindex import TopicIndex
+
+def entry(key, title, summary=""):
+    return feedparser.FeedParserDict(id=key, title=title, summary=summary, link=f"http://example.com/{key}")
+
+def titles(results, source):
+    return [article["title"] for article in results.get(source, [])]
+
+def test_search_matches_whole_words_in_feed_order():
+    index = TopicIndex()
+    index.update_feed("CNN", [entry("1", "Election results are in"), entry("2", "Markets rally"),
+                              entry("3", "Weather", "Storm delays the election count")])
+    results = index.search("election")
+    assert titles(results, "CNN") == ["Election results are in", "Weather"]
+    assert index.search("elect") == {}
+    assert titles(index.search("elect", mode="substring"), "CNN") == ["Election results are in", "Weather"]
+
+def test_multi_word_topics_must_match_the_phrase():
+    index = TopicIndex()
+    index.update_feed("BBC", [entry("1", "Trade war escalates"), entry("2", "War over trade routes")])
+    assert titles(index.search("trade war"), "BBC") == ["Trade war escalates"]
+
+def test_max_articles_and_source_filter():
+    index = TopicIndex()
+    index.update_feed("CNN", [entry(str(i), f"Climate story {i}") for i in range(5)])
+    index.update_feed("BBC", [entry("1", "Climate summit")])
+    assert titles(index.search("climate", max_articles=2), "CNN") == ["Climate story 0", "Climate story 1"]
+    assert list(index.search("climate", sources={"BBC"})) == ["BBC"]
+
+def test_update_feed_keeps_known_entries_and_drops_vanished_ones():
+    index = TopicIndex()
+    index.update_feed("CNN", [entry("1", "Gaza ceasefire talks"), entry("2", "Gaza aid convoy")])
+    # A known entry keeps its indexed text even if the feed now shows an edited title
+    index.update_feed("CNN", [entry("3", "New Gaza report"), entry("1", "Edited title")])
+    assert len(index) == 2
+    assert titles(index.search("gaza"), "CNN") == ["New Gaza report", "Gaza ceasefire talks"]
+    assert index.search("convoy") == {}
+    index.remove_feed("CNN")
+    assert len(index) == 0 and index.search("gaza") == {}
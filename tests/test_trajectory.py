@@ -0,0 +1,41 @@
+import numpy as np
+
+from mcpnews.trajectory import flight_paths, projection_efficiency, trajectory_metrics, velocity_vectors
+
+def loop_path(point_a, point_b, num_points=50):
+    # The per-point loop matrix_projection.py used before it was vectorized
+    t = np.linspace(0, 1, num_points)
+    path = np.zeros((num_points, 3))
+    for i in range(num_points):
+        path[i, 0] = point_a[0] + (point_b[0] - point_a[0]) * t[i]
+        path[i, 1] = point_a[1] + (point_b[1] - point_a[1]) * t[i] + 100 * np.sin(3 * np.pi * t[i])
+        if t[i] < 0.15:
+            path[i, 2] = 10000 * (t[i] / 0.15)
+        elif t[i] > 0.85:
+            path[i, 2] = 10000 * (1 - (t[i] - 0.85) / 0.15)
+        else:
+            path[i, 2] = 10000 + 500 * np.sin(np.pi * (t[i] - 0.15) / 0.7)
+    return path
+
+def test_paths_match_the_original_loop():
+    np.testing.assert_allclose(flight_paths([0, 0, 0], [800, 600, 0])[0], loop_path([0, 0, 0], [800, 600, 0]), atol=1e-6)
+
+def test_fleet_paths_broadcast_a_shared_origin():
+    destinations = np.array([[800, 600, 0], [-300, 50, 0], [10, 10, 0]])
+    paths = flight_paths([0, 0, 0], destinations, num_points=20)
+    assert paths.shape == (3, 20, 3)
+    for path, destination in zip(paths, destinations):
+        np.testing.assert_allclose(path, loop_path([0, 0, 0], destination, 20), atol=1e-6)
+    assert flight_paths([0, 0, 0], destinations, dtype=np.float32).dtype == np.float32
+
+def test_metrics_shapes_and_straight_flight_efficiency():
+    metrics = trajectory_metrics([[0, 0, 0], [5, 5, 0]], [[800, 600, 0], [100, 0, 0]], num_points=30)
+    for key in ("paths", "velocity", "remaining", "projection"):
+        assert metrics[key].shape == (2, 30, 3)
+    assert metrics["efficiency"].shape == (2, 30)
+
+    paths = np.linspace([0, 0, 0], [100, 0, 0], 11)[np.newaxis]
+    velocity = velocity_vectors(paths)
+    np.testing.assert_allclose(velocity[0], [[10, 0, 0]] * 11)
+    efficiency = projection_efficiency(velocity, np.array([[100, 0, 0]]) - paths)
+    np.testing.assert_allclose(efficiency[0, :-1], 100)
@@ -0,0 +1,101 @@
+import re
+import threading
+from collections import defaultdict
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+def entry_key(entry):
+    # Identity of an entry across polls: GUID, else link, else title
+    return entry.get('id') or entry.get('link') or entry.get('title')
+
+def entry_fields(entry):
+    summary = getattr(entry, 'summary', '') or getattr(entry, 'description', '')
+    return {"title": entry.title, "summary": summary, "link": entry.link}
+
+class TopicIndex:
+    # Inverted index of title/summary tokens across every outlet's entries.
+    # update_feed() is incremental: entries already indexed for a source (same
+    # id/link) are kept, new ones are tokenized, vanished ones are dropped.
+    # search() intersects the topic's posting lists instead of scanning entries.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = defaultdict(set)   # token -> doc ids
+        self._docs = {}                     # doc id -> (source, position, article)
+        self._doc_tokens = {}               # doc id -> tokens, for removal
+        self._keys = {}                     # source -> {entry key: doc id}
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def update_feed(self, source, entries):
+        with self._lock:
+            old_keys = self._keys.get(source, {})
+            new_keys = {}
+            for position, entry in enumerate(entries):
+                key = entry_key(entry)
+                if key in new_keys:
+                    continue
+                doc_id = old_keys.get(key)
+                if doc_id is None:
+                    article = entry_fields(entry)
+                    doc_id = self._next_id
+                    self._next_id += 1
+                    tokens = set(tokenize(article['title'])) | set(tokenize(article['summary']))
+                    for token in tokens:
+                        self._postings[token].add(doc_id)
+                    self._doc_tokens[doc_id] = tokens
+                else:
+                    article = self._docs[doc_id][2]
+                self._docs[doc_id] = (source, position, article)
+                new_keys[key] = doc_id
+            for key, doc_id in old_keys.items():
+                if key not in new_keys:
+                    self._remove(doc_id)
+            self._keys[source] = new_keys
+
+    def remove_feed(self, source):
+        with self._lock:
+            for doc_id in self._keys.pop(source, {}).values():
+                self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        for token in self._doc_tokens.pop(doc_id, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[token]
+        self._docs.pop(doc_id, None)
+
+    def search(self, topic, max_articles=3, sources=None, mode="index"):
+        # Returns {source: [article, ...]} in feed order, at most max_articles per source.
+        # mode="index" matches whole words via the posting lists (multi-word topics must
+        # also appear as the exact phrase); mode="substring" is the original
+        # case-insensitive substring scan over every entry.
+        topic_pattern = re.compile(re.escape(topic), re.IGNORECASE)
+        tokens = tokenize(topic)
+        with self._lock:
+            if mode == "substring" or not tokens:
+                candidates = self._docs.keys()
+            else:
+                postings = sorted((self._postings.get(token, set()) for token in set(tokens)), key=len)
+                candidates = set.intersection(*postings) if postings[0] else set()
+            matches = defaultdict(list)
+            for doc_id in candidates:
+                source, position, article = self._docs[doc_id]
+                if sources is not None and source not in sources:
+                    continue
+                if len(tokens) > 1 or mode == "substring" or not tokens:
+                    if not (topic_pattern.search(article['title']) or topic_pattern.search(article['summary'])):
+                        continue
+                matches[source].append((position, article))
+        results = {}
+        for source, found in matches.items():
+            found.sort(key=lambda item: item[0])
+            results[source] = [dict(article) for _, article in found[:max_articles]]
+        return results
@@ -1,7 +1,18 @@
+import os
+
 from ollama import Client
 
+from mcpnews.llmcache import ResponseCache
+from mcpnews.retrieval import IssueStore, embedder_id, ollama_embedder, TOP_K
+
 # Connect to Ollama
 ollama = Client()
+# Re-running the same query against the same issues is answered from the cache
+response_cache = ResponseCache()
+MODEL = "phi1_pavan:latest"
+ISSUE_STORE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mcpnews", "issues")
+# Above this many issues searches go through the approximate IVF index
+ANN_MIN_ISSUES = 50000
 
 # Past issues
 past_issues = [
@@ -12,12 +23,38 @@ past_issues = [
     "Push notifications not received on Android devices."
 ]
 
-# New customer query
-query = "Customer gets 504 error when trying to log in."
+def load_issue_store(issues, embed, directory=ISSUE_STORE_DIR):
+    # Reuse the persisted embeddings if `embed` produced them; when the issue list
+    # changed only new or edited issues are embedded, and an existing index is
+    # updated in place. Vectors from another embedder are rebuilt from scratch.
+    issues = list(issues)
+    try:
+        store = IssueStore.load(directory, embed)
+    except (OSError, ValueError):
+        store = None
+    if store is not None and store.embedder != embedder_id(embed):
+        store = None
+    if store is not None and store.issues == issues:
+        return store
+    try:
+        if store is not None:
+            store.update(issues)
+    except ValueError:
+        # Same embedder id but a different dimension (e.g. a changed model behind it)
+        store = None
+    if store is None:
+        store = IssueStore.build(issues, embed)
+    if len(store) < ANN_MIN_ISSUES:
+        store.index = None
+    elif store.index is None:
+        store.build_index()
+    store.save(directory)
+    return store
 
-# Format prompt with full issue list
-context = "\n".join(f"- {issue}" for issue in past_issues)
-prompt = f"""
+def build_prompt(query, candidates):
+    # Only the retrieved candidates go to the LLM, not the whole issue history
+    context = "\n".join(f"- {issue}" for issue in candidates)
+    return f"""
 You are a support assistant. Here is a list of known customer-reported issues:
 
 {context}
@@ -28,10 +65,25 @@ Now, a new issue has been reported:
 From the list above, identify the 2 or 3 most similar or relevant issues to this new query. Just return the matching issues verbatim.
 """
 
-# Ask phi1_pavan to retrieve
-response = ollama.chat(model="phi1_pavan:latest", messages=[
-    {"role": "user", "content": prompt}
-])
+def ask_llm(prompt, model=MODEL):
+    content = response_cache.get(model, prompt, {"api": "chat"})
+    if content is None:
+        response = ollama.chat(model=model, messages=[
+            {"role": "user", "content": prompt}
+        ])
+        content = response['message']['content']
+        response_cache.put(model, prompt, content, {"api": "chat"})
+    return content
+
+if __name__ == "__main__":
+    # New customer query
+    query = "Customer gets 504 error when trying to log in."
+
+    store = load_issue_store(past_issues, ollama_embedder(ollama))
+    candidates = [issue for issue, score in store.search(query, k=TOP_K)]
+
+    # Ask phi1_pavan to pick from the retrieved candidates
+    content = ask_llm(build_prompt(query, candidates))
 
-print("\nLLM-selected relevant issues:")
-print(response['message']['content'])
+    print("\nLLM-selected relevant issues:")
+    print(content)
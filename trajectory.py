@@ -0,0 +1,75 @@
+import numpy as np
+
+# Vectorized flight trajectories. Every function works on a whole fleet at once:
+# paths are shaped (n_flights, n_points, 3) with x/y in km and altitude in m,
+# following the climb / cruise / descent profile of matrix_projection.py.
+
+CRUISE_ALTITUDE = 10000
+CRUISE_VARIATION = 500
+CLIMB_END = 0.15
+DESCENT_START = 0.85
+DEVIATION = 100
+WEAVE = 3
+
+def flight_paths(points_a, points_b, num_points=50, cruise_altitude=CRUISE_ALTITUDE,
+                 cruise_variation=CRUISE_VARIATION, climb_end=CLIMB_END, descent_start=DESCENT_START,
+                 deviation=DEVIATION, weave=WEAVE, dtype=np.float64):
+    # points_a, points_b: (3,) or (n_flights, 3) -> (n_flights, num_points, 3)
+    points_a = np.atleast_2d(np.asarray(points_a, dtype=dtype))
+    points_b = np.atleast_2d(np.asarray(points_b, dtype=dtype))
+    points_a, points_b = np.broadcast_arrays(points_a, points_b)
+    t = np.linspace(0, 1, num_points, dtype=dtype)
+
+    paths = np.empty((len(points_a), num_points, 3), dtype=dtype)
+    delta = points_b - points_a
+    paths[:, :, 0] = points_a[:, 0:1] + delta[:, 0:1] * t
+    paths[:, :, 1] = points_a[:, 1:2] + delta[:, 1:2] * t + deviation * np.sin(weave * np.pi * t)
+    altitude = np.select(
+        [t < climb_end, t > descent_start],
+        [cruise_altitude * (t / climb_end),
+         cruise_altitude * (1 - (t - descent_start) / (1 - descent_start))],
+        cruise_altitude + cruise_variation * np.sin(np.pi * (t - climb_end) / (descent_start - climb_end)),
+    )
+    paths[:, :, 2] = altitude
+    return paths
+
+def velocity_vectors(paths):
+    # Step to the next point; the last point repeats the final step so shapes match paths
+    velocity = np.empty_like(paths)
+    velocity[:, :-1] = paths[:, 1:] - paths[:, :-1]
+    velocity[:, -1] = velocity[:, -2] if paths.shape[1] > 1 else 0
+    return velocity
+
+def remaining_vectors(paths, points_b):
+    points_b = np.atleast_2d(np.asarray(points_b, dtype=paths.dtype))
+    return points_b[:, np.newaxis, :] - paths
+
+def unit_vectors(vectors):
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(norms > 0, vectors / norms, 0)
+
+def vector_projections(velocity, remaining):
+    # Projection of each velocity vector onto the direction still to fly
+    direction = unit_vectors(remaining)
+    return np.einsum("fpi,fpi->fp", velocity, direction)[..., np.newaxis] * direction
+
+def projection_efficiency(velocity, remaining):
+    # Percentage of each velocity vector pointing straight at the destination;
+    # NaN where the aircraft is not moving or has arrived
+    dots = np.einsum("fpi,fpi->fp", velocity, remaining)
+    norms = np.linalg.norm(velocity, axis=-1) * np.linalg.norm(remaining, axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(norms > 0, dots / norms * 100, np.nan)
+
+def trajectory_metrics(points_a, points_b, num_points=50, **kwargs):
+    paths = flight_paths(points_a, points_b, num_points, **kwargs)
+    velocity = velocity_vectors(paths)
+    remaining = remaining_vectors(paths, points_b)
+    return {
+        "paths": paths,
+        "velocity": velocity,
+        "remaining": remaining,
+        "projection": vector_projections(velocity, remaining),
+        "efficiency": projection_efficiency(velocity, remaining),
+    }